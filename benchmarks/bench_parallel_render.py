@@ -0,0 +1,48 @@
+"""
+Measures how offline rendering scales with the number of worker processes, for
+one long render split into time segments and for a batch of patches.
+
+Usage:
+    python benchmarks/bench_parallel_render.py [max workers]
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from render import Note, render, SAMPLE_RATE
+from parallel import render_parallel, render_batch
+
+SECONDS: float = 120.0
+CHORD: list[str] = ["C4", "E4", "G4", "B4", "D5", "F#5"]
+NOTES: list[Note] = [
+    Note(CHORD[i % len(CHORD)], i * 0.125, 0.5) for i in range(int(SECONDS / 0.125))
+]
+PATCHES: list[dict] = [
+    {"notes": NOTES[: len(NOTES) // 4], "waveform": waveform}
+    for waveform in ["sine", "square", "sawtooth", "triangle"] * 2
+]
+
+
+def timed(function, *args, **kwargs) -> float:
+    start: float = time.perf_counter()
+    function(*args, **kwargs)
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    max_workers: int = int(sys.argv[1]) if len(sys.argv) > 1 else os.cpu_count() or 1
+    serial: float = timed(render, NOTES)
+    batch_serial: float = sum(timed(render, **patch) for patch in PATCHES)
+    print(f"{SECONDS:.0f} s of audio, serial render {serial:.2f}s")
+    print(f"{len(PATCHES)} patches, serial render {batch_serial:.2f}s")
+    print(f"{'workers':>7} {'segments':>9} {'speedup':>8} {'batch':>7} {'speedup':>8}")
+    for workers in range(1, max_workers + 1):
+        segmented: float = timed(render_parallel, NOTES, workers)
+        batch: float = timed(render_batch, PATCHES, workers)
+        print(
+            f"{workers:>7} {segmented:>8.2f}s {serial / segmented:>7.1f}x"
+            f" {batch:>6.2f}s {batch_serial / batch:>7.1f}x"
+        )
@@ -0,0 +1,94 @@
+"""
+Compares the CPU cost and aliasing of the PolyBLEP oscillators against the
+naive oscillators rendered with 4x oversampling and decimated back to
+48 kHz through a windowed-sinc low-pass filter.
+
+Usage:
+    python benchmarks/bench_poly_blep.py
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+import numpy as np
+from oscillator import (
+    SquareOscillator,
+    SawtoothOscillator,
+    PolyBLEPSquareOscillator,
+    PolyBLEPSawtoothOscillator,
+)
+from notefreq import NOTE_FREQS
+
+SAMPLE_RATE: int = 48000
+OVERSAMPLING: int = 4
+FILTER_TAPS: int = 63
+BLOCK_SIZE: int = 512
+BLOCKS: int = 400
+FREQUENCY: float = NOTE_FREQS["B7"]
+
+# low-pass at 20 kHz for the oversampled rate, Hann-windowed sinc
+_taps: np.ndarray = np.arange(FILTER_TAPS) - (FILTER_TAPS - 1) / 2
+LOW_PASS: np.ndarray = np.sinc(2 * 20000 / (SAMPLE_RATE * OVERSAMPLING) * _taps)
+LOW_PASS *= np.hanning(FILTER_TAPS)
+LOW_PASS /= LOW_PASS.sum()
+
+
+def render_band_limited(oscillator_class) -> np.ndarray:
+    oscillator = oscillator_class(FREQUENCY, SAMPLE_RATE, 1.0)
+    out: np.ndarray = np.empty(BLOCK_SIZE)
+    blocks: list[np.ndarray] = []
+    for _ in range(BLOCKS):
+        blocks.append(oscillator.generate_block(BLOCK_SIZE, out=out).copy())
+    return np.concatenate(blocks)
+
+
+def render_oversampled(oscillator_class) -> np.ndarray:
+    oscillator = oscillator_class(FREQUENCY, SAMPLE_RATE * OVERSAMPLING, 1.0)
+    out: np.ndarray = np.empty(BLOCK_SIZE * OVERSAMPLING)
+    history: np.ndarray = np.zeros(FILTER_TAPS - 1)
+    blocks: list[np.ndarray] = []
+    for _ in range(BLOCKS):
+        block = oscillator.generate_block(BLOCK_SIZE * OVERSAMPLING, out=out)
+        filtered = np.convolve(np.concatenate((history, block)), LOW_PASS, "valid")
+        history = block[-(FILTER_TAPS - 1) :].copy()
+        blocks.append(filtered[::OVERSAMPLING])
+    return np.concatenate(blocks)
+
+
+def aliased_energy(samples: np.ndarray) -> float:
+    """fraction of spectral energy that is not near a harmonic of FREQUENCY"""
+    spectrum: np.ndarray = np.abs(np.fft.rfft(samples * np.hanning(samples.size))) ** 2
+    bin_width: float = SAMPLE_RATE / samples.size
+    harmonic: np.ndarray = np.zeros(spectrum.size, dtype=bool)
+    for k in range(1, int(SAMPLE_RATE / 2 / FREQUENCY) + 1):
+        centre: int = int(round(k * FREQUENCY / bin_width))
+        harmonic[max(centre - 3, 0) : centre + 4] = True
+    return spectrum[~harmonic].sum() / spectrum.sum()
+
+
+def measure(render, oscillator_class) -> tuple[float, float]:
+    """returns nanoseconds per output sample and the aliased energy"""
+    start: float = time.perf_counter()
+    samples: np.ndarray = render(oscillator_class)
+    elapsed: float = time.perf_counter() - start
+    return elapsed / samples.size * 1e9, aliased_energy(samples)
+
+
+if __name__ == "__main__":
+    print(f"{FREQUENCY} Hz, {BLOCKS} blocks of {BLOCK_SIZE} samples")
+    for name, naive, band_limited in [
+        ("square", SquareOscillator, PolyBLEPSquareOscillator),
+        ("sawtooth", SawtoothOscillator, PolyBLEPSawtoothOscillator),
+    ]:
+        for label, render, oscillator_class in [
+            ("naive", render_band_limited, naive),
+            ("polyblep", render_band_limited, band_limited),
+            (f"naive {OVERSAMPLING}x oversampled", render_oversampled, naive),
+        ]:
+            cost, alias = measure(render, oscillator_class)
+            print(
+                f"{name:>8} {label:<24} {cost:7.1f} ns/sample   aliased energy {alias:.2e}"
+            )
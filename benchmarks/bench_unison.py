@@ -0,0 +1,61 @@
+"""
+Compares the cost of a UnisonOscillator against running the same number of
+separate oscillators and summing their blocks, for a growing number of voices.
+
+Usage:
+    python benchmarks/bench_unison.py
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+import numpy as np
+from oscillator import SawtoothOscillator, UnisonOscillator
+
+SAMPLE_RATE: int = 48000
+BLOCK_SIZE: int = 512
+BLOCKS: int = 2000
+FREQUENCY: float = 220.0
+SPREAD: float = 25.0
+
+
+def time_unison(voices: int) -> float:
+    unison = UnisonOscillator(
+        SawtoothOscillator, voices, SPREAD, FREQUENCY, SAMPLE_RATE, 0.25
+    )
+    out: np.ndarray = np.empty(BLOCK_SIZE, dtype=np.float32)
+    start: float = time.perf_counter()
+    for _ in range(BLOCKS):
+        unison.generate_block(BLOCK_SIZE, out=out)
+    return time.perf_counter() - start
+
+
+def time_separate(voices: int) -> float:
+    detune: np.ndarray = np.linspace(-SPREAD / 2, SPREAD / 2, voices)
+    if voices == 1:
+        detune = np.zeros(1)
+    oscillators: list[SawtoothOscillator] = [
+        SawtoothOscillator(FREQUENCY * 2 ** (cents / 1200), SAMPLE_RATE, 0.25)
+        for cents in detune
+    ]
+    voice: np.ndarray = np.empty(BLOCK_SIZE)
+    out: np.ndarray = np.empty(BLOCK_SIZE)
+    start: float = time.perf_counter()
+    for _ in range(BLOCKS):
+        out[:] = 0.0
+        for oscillator in oscillators:
+            out += oscillator.generate_block(BLOCK_SIZE, out=voice)
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    print(f"{BLOCKS} blocks of {BLOCK_SIZE} samples")
+    print(f"{'voices':>6} {'unison':>10} {'separate':>10} {'ratio':>7}")
+    for voices in [1, 2, 4, 8, 16, 32]:
+        unison: float = time_unison(voices)
+        separate: float = time_separate(voices)
+        ratio: float = separate / unison
+        print(f"{voices:>6} {unison:>9.3f}s {separate:>9.3f}s {ratio:>6.1f}x")
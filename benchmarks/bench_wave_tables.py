@@ -0,0 +1,127 @@
+"""
+Times the per-note wave table build that form.py used to run at import time,
+comparing the vectorized oscillators against the original per-sample
+generate_wave loops, the same tables built with one OscillatorBank per
+waveform, and the single-cycle wavetables that replaced them in form.py.
+
+Usage:
+    python benchmarks/bench_wave_tables.py
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+import numpy as np
+from oscillator import (
+    SineOscillator as sine,
+    SquareOscillator as square,
+    TriangleOscillator as triangle,
+    SawtoothOscillator as saw,
+    WavetableOscillator,
+    OscillatorBank,
+)
+from notefreq import NOTE_FREQS
+
+# same settings as form.py
+SAMPLE_RATE: int = 48000
+MAX_AMPLITUDE: int = 8192
+DEFAULT_DURATION: float = 0.2
+
+
+class LoopSquare(square):
+    def generate_wave(self) -> np.ndarray:
+        samples: np.ndarray = np.sin(self._step_size * self._time)
+        for x in self._time:
+            if samples[x] >= 0:
+                samples[x] = self._amplitude
+            else:
+                samples[x] = -self._amplitude
+        return self.crop_samples(samples).astype(np.int16)
+
+
+class LoopTriangle(triangle):
+    def generate_wave(self) -> np.ndarray:
+        samples: np.ndarray = np.empty(
+            int(self._sample_rate * self._duration), dtype=float
+        )
+        half_period: float = (1 / self._frequency) / 2
+        double_amplitude: float = self._amplitude * 2
+        for x in self._time:
+            samples[x] = (
+                double_amplitude
+                / half_period
+                * (
+                    half_period
+                    - np.abs(
+                        np.mod(
+                            x / self._sample_rate + half_period / 2,
+                            (2 * half_period),
+                        )
+                        - half_period
+                    )
+                )
+                - self._amplitude
+            )
+        return self.crop_samples(samples).astype(np.int16)
+
+
+class LoopSaw(saw):
+    def generate_wave(self) -> np.ndarray:
+        samples: np.ndarray = np.arange(self._sample_rate * self._duration)
+        for x in self._time:
+            samples[x] = (
+                2
+                * np.fmod(
+                    ((x * self._frequency * self._amplitude) / self._sample_rate)
+                    + self._amplitude / 2,
+                    self._amplitude,
+                )
+                - self._amplitude
+            )
+        return self.crop_samples(samples).astype(np.int16)
+
+
+def build_tables(oscillators: list) -> float:
+    """build one wave per note for each oscillator class, return seconds taken"""
+    start: float = time.perf_counter()
+    for oscillator in oscillators:
+        for key in NOTE_FREQS:
+            oscillator(
+                NOTE_FREQS[key], SAMPLE_RATE, MAX_AMPLITUDE, DEFAULT_DURATION
+            ).generate_wave()
+    return time.perf_counter() - start
+
+
+def build_banks() -> float:
+    """build every note of each waveform with one OscillatorBank, return seconds taken"""
+    start: float = time.perf_counter()
+    for oscillator in [sine, square, saw, triangle]:
+        OscillatorBank(
+            oscillator,
+            list(NOTE_FREQS.values()),
+            SAMPLE_RATE,
+            MAX_AMPLITUDE,
+            DEFAULT_DURATION,
+        ).generate_waves()
+    return time.perf_counter() - start
+
+
+def build_wavetables() -> float:
+    """sample one cycle of each waveform like form.py does, return seconds taken"""
+    start: float = time.perf_counter()
+    for oscillator in [sine, square, saw, triangle]:
+        WavetableOscillator.create_table(oscillator)
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    per_sample: float = build_tables([sine, LoopSquare, LoopSaw, LoopTriangle])
+    vectorized: float = build_tables([sine, square, saw, triangle])
+    print(f"per-sample table build: {per_sample:.3f} s")
+    print(f"vectorized table build: {vectorized:.3f} s")
+    print(f"speedup: {per_sample / vectorized:.1f}x")
+    print(f"oscillator bank table build: {build_banks():.3f} s")
+    print(f"single-cycle wavetables: {build_wavetables() * 1000:.3f} ms")
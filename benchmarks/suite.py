@@ -0,0 +1,321 @@
+"""
+Benchmark suite for the synthesis pipeline. Runs without a sound device or GUI
+and reports throughput for each stage, so runs can be compared over time.
+
+Benchmarks:
+    oscillator.<class>   samples/s streamed by generate_block
+    adsr.process         samples/s through ADSREnvelope.process
+    adsr.process_block   samples/s through ADSREnvelope.process_block
+    adsr.envelope_bank   samples/s through EnvelopeBank.process_block (16 voices)
+    volume.change_gain   samples/s through Volume.change_gain
+    master.process       samples/s through MasterBus.process, limiting every block
+    engine.callback      samples/s through AudioEngine.callback, one note held
+    engine.voices        samples/s through AudioEngine.callback, every voice held
+    engine.metrics       engine.callback with the audio metrics switched on
+    ringbuffer.transfer  samples/s written to and read back from a RingBuffer
+    form.table_build     tables/s for the wavetables form.py builds at import
+
+Usage:
+    python benchmarks/suite.py --output results.json
+    python benchmarks/suite.py --baseline results.json --threshold 0.2
+
+With --baseline, the run fails (exit code 1) if any benchmark is slower than
+the baseline by more than the threshold fraction.
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+from typing import Callable
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+import numpy as np
+from oscillator import (
+    Oscillator,
+    SineOscillator,
+    SquareOscillator,
+    TriangleOscillator,
+    SawtoothOscillator,
+    PolyBLEPSquareOscillator,
+    PolyBLEPSawtoothOscillator,
+    WavetableOscillator,
+)
+from adsr import ADSREnvelope, ADSRParams, EnvelopeBank, State
+from volume import Volume
+from master import MasterBus
+from engine import AudioEngine, DEFAULT_BLOCKSIZE
+from voices import DEFAULT_VOICES
+from ringbuffer import RingBuffer
+from notefreq import NOTE_FREQS
+from defaults import (
+    SAMPLE_RATE,
+    MAX_AMPLITUDE,
+    DEFAULT_DURATION,
+    DEFAULT_ATTACK,
+    DEFAULT_DECAY,
+    DEFAULT_SUSTAIN,
+    DEFAULT_RELEASE,
+    WAVEFORMS,
+)
+
+BLOCK_SIZE: int = 512
+NOTE_SAMPLES: int = int(SAMPLE_RATE * DEFAULT_DURATION)
+
+Benchmark = Callable[[], int]  # runs once, returns the number of items processed
+
+
+def best_rate(benchmark: Benchmark, repeat: int, min_time: float = 0.2) -> float:
+    """items per second of the fastest of repeat runs, each at least min_time long"""
+    best: float = 0.0
+    for _ in range(repeat):
+        items: int = 0
+        start: float = time.perf_counter()
+        elapsed: float = 0.0
+        while elapsed < min_time:
+            items += benchmark()
+            elapsed = time.perf_counter() - start
+        best = max(best, items / elapsed)
+    return best
+
+
+def oscillator_benchmark(oscillator: Oscillator) -> Benchmark:
+    out: np.ndarray = np.empty(BLOCK_SIZE, dtype=np.float32)
+
+    def run() -> int:
+        for _ in range(100):
+            oscillator.generate_block(BLOCK_SIZE, out=out)
+        return 100 * BLOCK_SIZE
+
+    return run
+
+
+def adsr_process_benchmark() -> int:
+    envelope = ADSREnvelope(
+        DEFAULT_ATTACK, DEFAULT_DECAY, DEFAULT_SUSTAIN, DEFAULT_RELEASE
+    )
+    envelope.update_state(State.ATTACK)
+    wave: np.ndarray = np.ones(NOTE_SAMPLES, dtype=np.float32)
+    for sample in wave:
+        envelope.process(sample)
+    return NOTE_SAMPLES
+
+
+def adsr_process_block_benchmark() -> Benchmark:
+    """a full note: attack, decay and sustain, then release to idle, in blocks"""
+    envelope = ADSREnvelope(
+        DEFAULT_ATTACK, DEFAULT_DECAY, DEFAULT_SUSTAIN, DEFAULT_RELEASE
+    )
+    samples: np.ndarray = np.ones(BLOCK_SIZE, dtype=np.float32)
+    out: np.ndarray = np.empty(BLOCK_SIZE, dtype=np.float32)
+    blocks: int = 2 * NOTE_SAMPLES // BLOCK_SIZE
+
+    def run() -> int:
+        envelope.update_state(State.ATTACK)
+        for block in range(blocks):
+            if block == blocks // 2:
+                envelope.update_state(State.RELEASE)
+            envelope.process_block(samples, out=out)
+        return blocks * BLOCK_SIZE
+
+    return run
+
+
+def envelope_bank_benchmark(voices: int = 16) -> Benchmark:
+    """a pool of voices started one block apart, each released halfway through"""
+    params = ADSRParams(
+        DEFAULT_ATTACK, DEFAULT_DECAY, DEFAULT_SUSTAIN, DEFAULT_RELEASE
+    )
+    bank = EnvelopeBank(voices)
+    samples: np.ndarray = np.ones((voices, BLOCK_SIZE), dtype=np.float32)
+    out: np.ndarray = np.empty((voices, BLOCK_SIZE), dtype=np.float32)
+    blocks: int = 2 * NOTE_SAMPLES // BLOCK_SIZE
+
+    def run() -> int:
+        for block in range(blocks):
+            if block < voices:
+                bank.note_on(block)
+            if block >= blocks // 2 and block - blocks // 2 < voices:
+                bank.note_off(block - blocks // 2)
+            bank.process_block(params, samples, out=out)
+        return blocks * BLOCK_SIZE * voices
+
+    return run
+
+
+def volume_benchmark() -> Benchmark:
+    volume = Volume(12)
+    samples: np.ndarray = np.ones(BLOCK_SIZE, dtype=np.float32)
+    out: np.ndarray = np.empty(BLOCK_SIZE, dtype=np.float32)
+
+    def run() -> int:
+        for _ in range(1000):
+            volume.change_gain(samples, out=out)
+        return 1000 * BLOCK_SIZE
+
+    return run
+
+
+def master_benchmark() -> Benchmark:
+    """a block loud enough that the limiter works on every sample"""
+    bus = MasterBus()
+    samples: np.ndarray = np.linspace(-2, 2, BLOCK_SIZE, dtype=np.float32)
+    out: np.ndarray = np.empty(BLOCK_SIZE, dtype=np.float32)
+
+    def run() -> int:
+        for _ in range(1000):
+            bus.process(samples, out=out)
+        return 1000 * BLOCK_SIZE
+
+    return run
+
+
+def ringbuffer_benchmark() -> Benchmark:
+    """one block written and read back at a time, through a wrapping buffer"""
+    ring = RingBuffer(3 * BLOCK_SIZE + 1)
+    samples: np.ndarray = np.ones(BLOCK_SIZE, dtype=np.float32)
+    out: np.ndarray = np.empty(BLOCK_SIZE, dtype=np.float32)
+
+    def run() -> int:
+        for _ in range(1000):
+            ring.write(samples)
+            ring.read(out)
+        return 1000 * BLOCK_SIZE
+
+    return run
+
+
+def engine_benchmark(notes: int = 1, metrics: bool = False) -> Benchmark:
+    """AudioEngine.callback with notes held, in blocks of DEFAULT_BLOCKSIZE"""
+    table: np.ndarray = WavetableOscillator.create_table(SineOscillator)
+    envelope = ADSREnvelope(
+        DEFAULT_ATTACK, DEFAULT_DECAY, DEFAULT_SUSTAIN, DEFAULT_RELEASE
+    )
+    engine = AudioEngine(
+        envelope, Volume(), SAMPLE_RATE, DEFAULT_BLOCKSIZE, metrics=metrics
+    )
+    outdata: np.ndarray = np.empty((DEFAULT_BLOCKSIZE, 1), dtype=np.int16)
+    blocks: int = NOTE_SAMPLES // DEFAULT_BLOCKSIZE
+
+    def run() -> int:
+        for note in list(NOTE_FREQS)[:notes]:
+            engine.note_on(note, table, NOTE_FREQS[note], MAX_AMPLITUDE)
+        for _ in range(blocks):
+            engine.callback(outdata, DEFAULT_BLOCKSIZE, None, None)
+        return blocks * DEFAULT_BLOCKSIZE
+
+    return run
+
+
+def table_build_benchmark() -> int:
+    """the wavetables form.py builds at import, one per waveform"""
+    for oscillator_class in WAVEFORMS.values():
+        WavetableOscillator.create_table(oscillator_class)
+    return len(WAVEFORMS)
+
+
+def benchmarks() -> dict[str, tuple[Benchmark, str]]:
+    suite: dict[str, tuple[Benchmark, str]] = {}
+    for oscillator_class in [
+        SineOscillator,
+        SquareOscillator,
+        TriangleOscillator,
+        SawtoothOscillator,
+        PolyBLEPSquareOscillator,
+        PolyBLEPSawtoothOscillator,
+    ]:
+        oscillator = oscillator_class(NOTE_FREQS["A4"], SAMPLE_RATE, MAX_AMPLITUDE)
+        suite["oscillator." + oscillator_class.__name__] = (
+            oscillator_benchmark(oscillator),
+            "samples/s",
+        )
+    wavetable = WavetableOscillator(
+        WavetableOscillator.create_table(SawtoothOscillator),
+        NOTE_FREQS["A4"],
+        SAMPLE_RATE,
+        MAX_AMPLITUDE,
+    )
+    suite["oscillator.WavetableOscillator"] = (
+        oscillator_benchmark(wavetable),
+        "samples/s",
+    )
+    suite["adsr.process"] = (adsr_process_benchmark, "samples/s")
+    suite["adsr.process_block"] = (adsr_process_block_benchmark(), "samples/s")
+    suite["adsr.envelope_bank"] = (envelope_bank_benchmark(), "samples/s")
+    suite["volume.change_gain"] = (volume_benchmark(), "samples/s")
+    suite["master.process"] = (master_benchmark(), "samples/s")
+    suite["engine.callback"] = (engine_benchmark(), "samples/s")
+    suite["engine.voices"] = (engine_benchmark(DEFAULT_VOICES), "samples/s")
+    suite["engine.metrics"] = (engine_benchmark(metrics=True), "samples/s")
+    suite["ringbuffer.transfer"] = (ringbuffer_benchmark(), "samples/s")
+    suite["form.table_build"] = (table_build_benchmark, "tables/s")
+    return suite
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+    """names of the benchmarks that regressed by more than threshold"""
+    regressions: list[str] = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        old_rate: float = baseline[name]["rate"]
+        change: float = result["rate"] / old_rate - 1.0
+        print(f"{name:<40} {change:+8.1%}")
+        if change < -threshold:
+            regressions.append(name)
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="SnakeSynth benchmark suite")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument(
+        "--baseline", help="compare against an earlier JSON results file"
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="allowed slowdown against the baseline as a fraction (default 0.2)",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=5, help="runs per benchmark, the best is kept"
+    )
+    parser.add_argument(
+        "--filter", default="", help="only run benchmarks whose name contains this"
+    )
+    args = parser.parse_args()
+
+    results: dict[str, dict] = {}
+    for name, (benchmark, unit) in benchmarks().items():
+        if args.filter not in name:
+            continue
+        rate: float = best_rate(benchmark, args.repeat)
+        results[name] = {"rate": rate, "unit": unit}
+        print(f"{name:<40} {rate:>16,.0f} {unit}")
+
+    report: dict = {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "benchmarks": results,
+    }
+    if args.output:
+        with open(args.output, "w") as output_file:
+            json.dump(report, output_file, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as baseline_file:
+            baseline: dict = json.load(baseline_file)["benchmarks"]
+        regressions: list[str] = compare(results, baseline, args.threshold)
+        if regressions:
+            print("Regressed past the threshold:", ", ".join(regressions))
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
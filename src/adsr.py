@@ -12,17 +12,33 @@ attack, decay, sustain, release durations, and sample rate.
 2. Update the envelope state using the update_state() method to set the initial state.
 3. Optionally, dynamically update the attack, decay, sustain, or release parameters using the corresponding 
 update methods (update_attack(), update_decay(), update_sustain(), update_release()).
+These are safe to call from the GUI thread while the audio thread processes blocks.
 4. Process each sample of the audio waveform by passing it to the process() method, which 
 applies the envelope based on the current state and returns the output sample with the envelope applied.
+Or pass a whole block of samples to process_block(), which gives the same output
+much faster and handles state changes that happen in the middle of the block.
+
+For polyphony, the settings and the per-note state are kept apart: ADSRParams is an
+immutable snapshot of the settings, EnvelopeVoice holds the state of one note, and
+EnvelopeBank holds the state of a whole pool of voices as arrays and processes a
+block for all of them at once.
 
 """
 
 import numpy as np
 import numpy.typing as npt
 import enum
-import sounddevice as sd # type: ignore
+from dataclasses import dataclass, replace
+from functools import cached_property, lru_cache
+from smoothing import SmoothedValue, DEFAULT_RAMP_SAMPLES
 
 DEFAULT_MS: float = 0.05
+SEGMENT_CACHE_SIZE: int = 256
+
+# curvature of the named segment shapes, see segment_table
+CURVES: dict[str, float] = {"linear": 0.0, "exponential": 5.0, "logarithmic": -5.0}
+
+Curve = str | float
 
 
 class State(enum.Enum):
@@ -33,7 +49,376 @@ class State(enum.Enum):
     RELEASE = 4
 
 
-import numpy as np
+def curvature(shape: Curve) -> float:
+    """the curvature of a named shape (see CURVES), or the curvature given as a number"""
+    if isinstance(shape, str):
+        if shape not in CURVES:
+            raise ValueError("unknown envelope segment shape: " + shape)
+        return CURVES[shape]
+    return float(shape)
+
+
+@lru_cache(maxsize=SEGMENT_CACHE_SIZE)
+def segment_table(
+    shape: Curve, length: int, start: float, end: float
+) -> npt.NDArray[np.float64]:
+    """
+    Returns the table for one envelope segment going from start to end in length samples.
+    Tables are memoized process-wide (up to SEGMENT_CACHE_SIZE of them) and shared
+    read-only between envelopes, so knob changes and new envelopes with settings
+    seen before allocate nothing.
+
+    Curved segments are evaluated in closed form, (exp(k x) - 1) / (exp(k) - 1)
+    over the progress x through the segment, so they cost the same as linear ones.
+    A positive curvature k bows the segment down: a rise starts slowly and a fall
+    drops quickly and then tails off, like an exponential decay. A negative
+    curvature bows it up.
+
+    Args:
+        shape: "linear", "exponential", "logarithmic", or a curvature (0 is linear)
+        length: number of samples in the segment
+        start: level at the first sample
+        end: level at the last sample
+    """
+    k: float = curvature(shape)
+    if k == 0:
+        table: npt.NDArray[np.float64] = np.linspace(start, end, length)
+    else:
+        progress: npt.NDArray[np.float64] = np.linspace(0.0, 1.0, length)
+        if end < start:
+            progress = 1.0 - progress  # mirror, so falling segments bow the same way
+        np.multiply(progress, k, out=progress)
+        np.expm1(progress, out=progress)
+        progress /= np.expm1(k)
+        low, high = min(start, end), max(start, end)
+        table = low + (high - low) * progress
+    table.setflags(write=False)
+    return table
+
+
+def apply_segments(
+    state: State,
+    pos: int,
+    attack_envelope: npt.NDArray[np.float64],
+    decay_envelope: npt.NDArray[np.float64],
+    sustain: float | npt.NDArray[np.float64],
+    release_envelope: npt.NDArray[np.float64],
+    samples: npt.NDArray[np.floating],
+    out: npt.NDArray[np.float32],
+) -> tuple[State, int]:
+    """
+    Applies the envelope to a block of samples, one NumPy multiply per segment,
+    moving through the states as segments run out within the block.
+    Zero-length segments are skipped. The sustain may be one level, or one
+    level per sample of the block while it glides to a new setting.
+
+    Returns:
+        the state and position within that state after the block
+    """
+    size: int = len(samples)
+    i: int = 0
+    while i < size:
+        if state == State.SUSTAIN:
+            level = sustain if np.isscalar(sustain) else sustain[i:]
+            np.multiply(samples[i:], level, out=out[i:])
+            break
+        if state == State.IDLE:
+            out[i:] = 0
+            break
+
+        if state == State.ATTACK:
+            envelope, next_state = attack_envelope, State.DECAY
+        elif state == State.DECAY:
+            envelope, next_state = decay_envelope, State.SUSTAIN
+        else:
+            envelope, next_state = release_envelope, State.IDLE
+
+        count: int = min(size - i, len(envelope) - pos)
+        if count > 0:
+            np.multiply(
+                samples[i : i + count],
+                envelope[pos : pos + count],
+                out=out[i : i + count],
+            )
+            pos += count
+            i += count
+        if pos >= len(envelope):
+            state, pos = next_state, 0
+
+    return state, pos
+
+
+@dataclass(frozen=True)
+class ADSRParams:
+    """
+    Immutable snapshot of the envelope settings, in the same knob units as
+    ADSREnvelope. Snapshots can be shared by any number of voices; changing a
+    setting means creating a new snapshot with dataclasses.replace().
+
+    Attributes:
+        attack_duration: the time it takes for a sound to reach full volume.
+        decay_duration: the time it takes to reach the sustain level.
+        sustain_level: the level at which a sound is held.
+        release_duration: the time it takes for a sound to gradually fade.
+        sample_rate: speed that samples are loaded in cycles per second (hertz)
+        attack_curve, decay_curve, release_curve: shape of each segment, see segment_table
+    """
+
+    attack_duration: float = 0.5
+    decay_duration: float = 1
+    sustain_level: float = 1
+    release_duration: float = 1
+    sample_rate: int = 48000
+    attack_curve: Curve = "linear"
+    decay_curve: Curve = "linear"
+    release_curve: Curve = "linear"
+
+    @property
+    def attack_samples(self) -> int:
+        return int(self.attack_duration * DEFAULT_MS * self.sample_rate)
+
+    @property
+    def decay_samples(self) -> int:
+        return int(self.decay_duration * DEFAULT_MS * self.sample_rate)
+
+    @property
+    def sustain(self) -> float:
+        return self.sustain_level * DEFAULT_MS
+
+    @property
+    def release_samples(self) -> int:
+        return int(self.release_duration * DEFAULT_MS * self.sample_rate)
+
+    @cached_property
+    def attack_envelope(self) -> npt.NDArray[np.float64]:
+        return segment_table(self.attack_curve, self.attack_samples, 0.0, 1.0)
+
+    @cached_property
+    def decay_envelope(self) -> npt.NDArray[np.float64]:
+        return segment_table(self.decay_curve, self.decay_samples, 1.0, self.sustain)
+
+    @cached_property
+    def release_envelope(self) -> npt.NDArray[np.float64]:
+        return segment_table(
+            self.release_curve, self.release_samples, self.sustain, 0.0
+        )
+
+    @cached_property
+    def gate_table(self) -> npt.NDArray[np.float64]:
+        """attack, decay and one sustain sample: the level at each sample since note on"""
+        table = np.concatenate(
+            (self.attack_envelope, self.decay_envelope, [self.sustain])
+        )
+        table.setflags(write=False)
+        return table
+
+    @cached_property
+    def release_table(self) -> npt.NDArray[np.float64]:
+        """release and one silent sample: the level at each sample since note off"""
+        table = np.concatenate((self.release_envelope, [0.0]))
+        table.setflags(write=False)
+        return table
+
+
+class EnvelopeVoice:
+    """
+    The envelope state of one sounding note. The settings live in a shared
+    ADSRParams snapshot, so each voice only holds three small fields.
+
+    Attributes:
+        state: the current ADSR state
+        pos: position within the current state, in samples
+        level: envelope level at the current position
+    """
+
+    __slots__ = ("state", "pos", "level")
+
+    def __init__(self) -> None:
+        self.state: State = State.IDLE
+        self.pos: int = 0
+        self.level: float = 0.0
+
+    def update_state(self, state: State) -> None:
+        """updates the current ADSR state"""
+        self.pos = 0
+        self.state = state
+
+    def process_block(
+        self,
+        params: ADSRParams,
+        samples: npt.NDArray[np.floating],
+        out: npt.NDArray[np.float32] | None = None,
+    ) -> npt.NDArray[np.float32]:
+        """
+        applies the envelope described by params to a block of samples,
+        like ADSREnvelope.process_block
+        """
+        if out is None:
+            out = np.empty(len(samples), dtype=np.float32)
+        self.state, self.pos = apply_segments(
+            self.state,
+            self.pos,
+            params.attack_envelope,
+            params.decay_envelope,
+            params.sustain,
+            params.release_envelope,
+            samples,
+            out,
+        )
+        self.level = self._current_level(params)
+        return out
+
+    def _current_level(self, params: ADSRParams) -> float:
+        """envelope level at the current position"""
+        if self.state == State.SUSTAIN:
+            return params.sustain
+        if self.state == State.ATTACK:
+            envelope = params.attack_envelope
+        elif self.state == State.DECAY:
+            envelope = params.decay_envelope
+        elif self.state == State.RELEASE:
+            envelope = params.release_envelope
+        else:
+            return 0.0
+        return float(envelope[self.pos]) if self.pos < len(envelope) else 0.0
+
+
+class EnvelopeBank:
+    """
+    The envelope state of a whole pool of voices, stored as arrays so that one
+    block can be processed for every voice with a few NumPy operations.
+
+    Positions count samples since note on for voices in attack, decay or
+    sustain, and samples since note off for voices in release. The level of
+    each voice is then a lookup into ADSRParams.gate_table or release_table.
+
+    Attributes:
+        state: ADSR state value of each voice (State.value)
+        position: samples since note on, or since note off while releasing
+        level: envelope level of each voice at its current position
+    """
+
+    def __init__(self, voices: int) -> None:
+        self.state: npt.NDArray[np.int8] = np.full(voices, State.IDLE.value, np.int8)
+        self.position: npt.NDArray[np.int64] = np.zeros(voices, dtype=np.int64)
+        self.level: npt.NDArray[np.float32] = np.zeros(voices, dtype=np.float32)
+        self._ramp: npt.NDArray[np.int64] = np.arange(0, dtype=np.int64)
+
+    def note_on(self, voice: int) -> None:
+        """starts the attack of a voice"""
+        self.state[voice] = State.ATTACK.value
+        self.position[voice] = 0
+
+    def note_off(self, voice: int) -> None:
+        """starts the release of a voice"""
+        if self.state[voice] != State.IDLE.value:
+            self.state[voice] = State.RELEASE.value
+            self.position[voice] = 0
+
+    def active(self) -> npt.NDArray[np.bool_]:
+        """which voices are sounding"""
+        return self.state != State.IDLE.value
+
+    def gains(
+        self,
+        params: ADSRParams,
+        frames: int,
+        out: npt.NDArray[np.float64] | None = None,
+        sustain: float | npt.NDArray[np.float64] | None = None,
+    ) -> npt.NDArray[np.float64]:
+        """
+        Computes the envelope level of every voice for the next block and
+        advances all voices past it.
+
+        Args:
+            sustain: optional level for voices that reached sustain, one value
+                or one per frame (see ADSREnvelope.sustain_block), instead of
+                the sustain of params
+
+        Returns:
+            a (voices x frames) array of envelope levels
+        """
+        if out is None:
+            out = np.empty((self.state.size, frames))
+        else:
+            out = out[:, :frames]
+        if self._ramp.size < frames:
+            self._ramp = np.arange(frames, dtype=np.int64)
+
+        releasing: npt.NDArray[np.bool_] = self.state == State.RELEASE.value
+        gate: npt.NDArray[np.bool_] = (self.state != State.IDLE.value) & ~releasing
+        out[~(gate | releasing)] = 0.0
+
+        tables = [(gate, params.gate_table), (releasing, params.release_table)]
+        for voices, table in tables:
+            if not voices.any():
+                continue
+            last: int = table.size - 1
+            index = self.position[voices, np.newaxis] + self._ramp[:frames]
+            np.minimum(index, last, out=index)
+            levels = table[index]
+            if sustain is not None and table is params.gate_table:
+                np.copyto(levels, sustain, where=index == last)
+            out[voices] = levels
+
+        self._advance(params, frames, gate, releasing)
+        return out
+
+    def advance(self, params: ADSRParams, frames: int) -> None:
+        """
+        Moves every voice frames samples on without computing its levels, leaving
+        it in the same state as gains() would. The cost does not depend on frames.
+        """
+        releasing: npt.NDArray[np.bool_] = self.state == State.RELEASE.value
+        gate: npt.NDArray[np.bool_] = (self.state != State.IDLE.value) & ~releasing
+        self._advance(params, frames, gate, releasing)
+
+    def _advance(
+        self,
+        params: ADSRParams,
+        frames: int,
+        gate: npt.NDArray[np.bool_],
+        releasing: npt.NDArray[np.bool_],
+    ) -> None:
+        """moves the positions on, then updates the states and levels"""
+        tables = [(gate, params.gate_table), (releasing, params.release_table)]
+        for voices, table in tables:
+            position = self.position[voices] + frames
+            self.position[voices] = np.minimum(position, table.size - 1)
+
+        self._update_states(params, gate, releasing)
+        self.level[gate] = params.gate_table[self.position[gate]]
+        self.level[releasing] = params.release_table[self.position[releasing]]
+        self.level[~(gate | releasing)] = 0.0
+
+    def process_block(
+        self,
+        params: ADSRParams,
+        samples: npt.NDArray[np.floating],
+        out: npt.NDArray[np.float32] | None = None,
+    ) -> npt.NDArray[np.float32]:
+        """
+        Applies each voice's envelope to its row of a (voices x frames) block.
+        """
+        if out is None:
+            out = np.empty(samples.shape, dtype=np.float32)
+        np.multiply(samples, self.gains(params, samples.shape[-1]), out=out)
+        return out
+
+    def _update_states(
+        self,
+        params: ADSRParams,
+        gate: npt.NDArray[np.bool_],
+        releasing: npt.NDArray[np.bool_],
+    ) -> None:
+        """derives each voice's state from its new position"""
+        attack_end: int = params.attack_samples
+        decay_end: int = attack_end + params.decay_samples
+        position = self.position
+        self.state[gate & (position < attack_end)] = State.ATTACK.value
+        self.state[gate & (position >= attack_end)] = State.DECAY.value
+        self.state[gate & (position >= decay_end)] = State.SUSTAIN.value
+        self.state[releasing & (position >= params.release_samples)] = State.IDLE.value
 
 
 class ADSREnvelope:
@@ -41,12 +426,21 @@ class ADSREnvelope:
     The Attack-Decay-Sustain-Release (ADSR) envelope class is responsible for 
     shaping the parameters of the sound.
 
+    The settings are kept in an immutable ADSRParams snapshot. The update methods
+    build a new snapshot and swap it in with a single assignment, and the audio
+    thread reads the snapshot once per block, so knobs can be turned from the GUI
+    thread while a note plays without locks and without a block ever seeing half
+    of an update. Sustain changes glide over ramp_samples instead of jumping.
+
     Attributes:
         attack_duration: the time it takes for a sound to reach full volume.
         decay_duration: the time it takes to reach the sustain level.
         sustain_level: the level at which a sound is held.
         release_duration: the time it takes for a sound to gradually fade.
         sample_rate: speed that samples are loaded in cycles per second (hertz)
+        attack_curve, decay_curve, release_curve: shape of each segment: "linear",
+            "exponential", "logarithmic", or a curvature number (see segment_table)
+        ramp_samples: length of the glide to a new sustain level, in samples
     """
 
     def __init__(
@@ -56,96 +450,219 @@ class ADSREnvelope:
         sustain_level: int = 1,
         release_duration: int = 1,
         sample_rate: int = 48000,
+        attack_curve: Curve = "linear",
+        decay_curve: Curve = "linear",
+        release_curve: Curve = "linear",
+        ramp_samples: int = DEFAULT_RAMP_SAMPLES,
     ) -> None:
-        self._sample_rate = sample_rate
+        self._params: ADSRParams = ADSRParams(
+            attack_duration,
+            decay_duration,
+            sustain_level,
+            release_duration,
+            sample_rate,
+            attack_curve,
+            decay_curve,
+            release_curve,
+        )
+        self._smoothed_sustain = SmoothedValue(self._params.sustain, ramp_samples)
         self._state: State = State.IDLE
         self._pos: int = 0
+        self._envelope_buffer: npt.NDArray[np.float64] | None = None
+
+    @property
+    def params(self) -> ADSRParams:
+        """the current settings snapshot"""
+        return self._params
+
+    @property
+    def _sample_rate(self) -> int:
+        return self._params.sample_rate
+
+    @property
+    def _attack_curve(self) -> Curve:
+        return self._params.attack_curve
+
+    @property
+    def _decay_curve(self) -> Curve:
+        return self._params.decay_curve
+
+    @property
+    def _release_curve(self) -> Curve:
+        return self._params.release_curve
+
+    @property
+    def _attack_samples(self) -> int:
+        return self._params.attack_samples
 
-        self._attack_samples: int = int(attack_duration * DEFAULT_MS * sample_rate)
-        self._decay_samples: int = int(decay_duration * DEFAULT_MS * sample_rate)
-        self._sustain: float = sustain_level * DEFAULT_MS
-        self._release_samples: int = int(release_duration * DEFAULT_MS * sample_rate)
+    @property
+    def _decay_samples(self) -> int:
+        return self._params.decay_samples
 
-        self._envelope: npt.NDArray[np.float64] = np.zeros(sample_rate)  # empty envelope
-        self._attack_envelope: npt.NDArray[np.float64] = self.create_attack_envelope()
-        self._decay_envelope: npt.NDArray[np.float64] = self.create_decay_envelope()
-        self._release_envelope: npt.NDArray[np.float64] = self.create_release_envelope()
+    @property
+    def _sustain(self) -> float:
+        return self._params.sustain
+
+    @property
+    def _release_samples(self) -> int:
+        return self._params.release_samples
+
+    @property
+    def _attack_envelope(self) -> npt.NDArray[np.float64]:
+        return self._params.attack_envelope
+
+    @property
+    def _decay_envelope(self) -> npt.NDArray[np.float64]:
+        return self._params.decay_envelope
+
+    @property
+    def _release_envelope(self) -> npt.NDArray[np.float64]:
+        return self._params.release_envelope
+
+    @property
+    def _envelope(self) -> npt.NDArray[np.float64]:
+        """empty envelope, only allocated the first time it is used"""
+        if self._envelope_buffer is None:
+            self._envelope_buffer = np.zeros(self._sample_rate)
+        return self._envelope_buffer
 
     def update_state(self, state: State) -> None:
         """updates the current ADSR state"""
         self._pos = 0
         self._state = state
 
+    def update_params(self, params: ADSRParams) -> None:
+        """
+        swap in a new settings snapshot, picked up at the start of the next block.
+        Safe to call from any thread while another one is processing blocks.
+        """
+        self._params = params
+        self._smoothed_sustain.set_target(params.sustain)
+
     def update_attack(self, attack_duration: float) -> None:
         """update the attack samples and recreate the attack envelope"""
-        self._attack_samples = int(attack_duration * DEFAULT_MS * self._sample_rate)
-        self._attack_envelope = self.create_attack_envelope()
+        self.update_params(replace(self._params, attack_duration=attack_duration))
 
     def update_decay(self, decay_duration: int) -> None:
         """update the decay samples and recreate the decay envelope"""
-        self._decay_samples = int(decay_duration * DEFAULT_MS * self._sample_rate)
-        self._decay_envelope = self.create_decay_envelope()
+        self.update_params(replace(self._params, decay_duration=decay_duration))
 
     def update_sustain(self, sustain_level: int) -> None:
-        """recalculate and update the sustain"""
-        self._sustain = sustain_level * DEFAULT_MS
+        """
+        recalculate and update the sustain. The held level glides to the new
+        sustain, and the decay and release now start or end at it.
+        """
+        self.update_params(replace(self._params, sustain_level=sustain_level))
 
     def update_release(self, release_duration: int) -> None:
         """update the release samples and recreate the release envelope"""
-        self._release_samples = int(release_duration * DEFAULT_MS * self._sample_rate)
-        self._release_envelope = self.create_release_envelope()
+        self.update_params(replace(self._params, release_duration=release_duration))
+
+    def update_curve(self, segment: str, shape: Curve) -> None:
+        """
+        change the shape of the "attack", "decay" or "release" segment
+        and recreate its envelope
+        """
+        curvature(shape)  # reject unknown shapes before changing anything
+        match segment:
+            case "attack":
+                self.update_params(replace(self._params, attack_curve=shape))
+            case "decay":
+                self.update_params(replace(self._params, decay_curve=shape))
+            case "release":
+                self.update_params(replace(self._params, release_curve=shape))
+            case _:
+                raise ValueError("no curve for envelope segment: " + segment)
+
+    def sustain_block(self, frames: int) -> float | npt.NDArray[np.float64]:
+        """
+        the sustain level for the next block of frames: one value, or one
+        per frame while gliding to a new setting, valid until the next call
+        """
+        return self._smoothed_sustain.next_block(frames)
 
-    def process(self, sample: np.int16) -> float | None:
+    def skip_sustain(self, frames: int) -> None:
+        """moves the sustain glide on by frames samples, like sustain_block()"""
+        self._smoothed_sustain.skip(frames)
+
+    def process(self, sample: np.int16) -> float:
         """takes in a sample, process based on state, return sample with envelope applied"""
-        try:
-            output: float = 0
+        params: ADSRParams = self._params  # one snapshot for the whole sample
+        # advanced on every sample like sustain_block() in process_block()
+        sustain: float = self._smoothed_sustain.next_value()
+        while True:
             if self._state == State.ATTACK:
-                output = sample * self._attack_envelope[self._pos]
-                self._pos += 1
-                if self._pos >= self._attack_samples:
-                    self.update_state(State.DECAY)
-                return output
-
+                envelope, next_state = params.attack_envelope, State.DECAY
             elif self._state == State.DECAY:
-                output = sample * self._decay_envelope[self._pos]
-                self._pos += 1
-                if self._pos >= self._decay_samples:
-                    self.update_state(State.SUSTAIN)
-                return output
-
+                envelope, next_state = params.decay_envelope, State.SUSTAIN
             elif self._state == State.SUSTAIN:
-                return float(sample * self._sustain)
-
+                return float(sample * sustain)
             elif self._state == State.RELEASE:
-                output = sample * self._release_envelope[self._pos]
-                self._pos += 1
-                if self._pos >= self._release_samples:
-                    self.update_state(State.IDLE)
-                return output
+                envelope, next_state = params.release_envelope, State.IDLE
             else:
+                return 0
+
+            if self._pos < len(envelope):
+                output: float = sample * envelope[self._pos]
+                self._pos += 1
+                if self._pos >= len(envelope):
+                    self.update_state(next_state)
                 return output
+            # the knob was turned to 0, or shortened the segment past the
+            # current position: move on instead of indexing past the end
+            self.update_state(next_state)
 
-        except IndexError:  # if knob is turned to 0
-            return None  # return without applying that part of the envelope
+    def process_block(
+        self,
+        samples: npt.NDArray[np.floating],
+        out: npt.NDArray[np.float32] | None = None,
+    ) -> npt.NDArray[np.float32]:
+        """
+        takes in a block of samples, applies the envelope and returns the block.
+        Gives the same output as calling process() on every sample, including
+        attack -> decay -> sustain and release -> idle changes within the block.
+        A segment whose knob is turned to 0 is skipped.
 
+        Args:
+            samples: the block to apply the envelope to
+            out: optional float32 buffer of the same length to write into
+                (may be samples itself)
+
+        Returns:
+            the block with the envelope applied
+        """
+        params: ADSRParams = self._params  # read once, the GUI may swap it meanwhile
+        if out is None:
+            out = np.empty(len(samples), dtype=np.float32)
+        self._state, self._pos = apply_segments(
+            self._state,
+            self._pos,
+            params.attack_envelope,
+            params.decay_envelope,
+            self.sustain_block(len(samples)),
+            params.release_envelope,
+            samples,
+            out,
+        )
+        return out
 
     def create_attack_envelope(self) -> npt.NDArray[np.float64]:
         """
-        Create an array of evenly spaced numbers from 0 to 1 
-        with the attack sample as the step
+        Create an array of attack samples going from 0 to 1,
+        evenly spaced unless the attack curve is not linear
         """
-        return np.linspace(0, 1, self._attack_samples)
+        return self._params.attack_envelope
 
     def create_decay_envelope(self) -> npt.NDArray[np.float64]:
         """
-        Create an array of evenly spaced numbers from 1 to the sustain
-        with the decay sample as the step
+        Create an array of decay samples going from 1 to the sustain,
+        evenly spaced unless the decay curve is not linear
         """
-        return np.linspace(1, self._sustain, self._decay_samples)
+        return self._params.decay_envelope
 
     def create_release_envelope(self) -> npt.NDArray[np.float64]:
         """
-        Create an array of evenly spaced numbers from the sustain to 0
-        with the release sample as the step
+        Create an array of release samples going from the sustain to 0,
+        evenly spaced unless the release curve is not linear
         """
-        return np.linspace(self._sustain, 0, self._release_samples)
+        return self._params.release_envelope
@@ -0,0 +1,237 @@
+"""
+Output backends for the AudioEngine. A backend calls the engine's callback for
+every block of audio and sends the result somewhere:
+
+- SoundDeviceBackend plays it through the sound card with sounddevice
+- NullBackend throws it away, which measures the render cost on machines
+  without sound hardware
+- FileBackend writes it to a WAV file, or a raw int16 file
+
+The null and file backends call the engine from their own thread, paced by the
+clock like a sound card (or as fast as possible with realtime=False). A block
+that is finished after its deadline is reported to the callback as an underflow,
+the same way sounddevice reports one. The engine runs the same way on all three.
+
+To use a backend, create it with the sample rate and block size, or get one by
+name from create_backend(), and pass it to the AudioEngine.
+"""
+
+import threading
+import time
+import wave
+from abc import ABC, abstractmethod
+from typing import Callable
+
+import numpy as np
+import numpy.typing as npt
+
+Callback = Callable[[npt.NDArray[np.int16], int, object, object], None]
+
+
+class Backend(ABC):
+    """
+    Backend is an abstract base class for the places the engine's output goes.
+
+    Attributes:
+        sample_rate: speed that samples are played in cycles per second (hertz)
+        blocksize: frames per callback
+    """
+
+    def __init__(self, sample_rate: int, blocksize: int) -> None:
+        self._sample_rate: int = sample_rate
+        self._blocksize: int = blocksize
+
+    @property
+    @abstractmethod
+    def running(self) -> bool:
+        """whether the callback is being called"""
+
+    @abstractmethod
+    def start(self, callback: Callback) -> None:
+        """start calling callback(outdata, frames, time, status) for every block"""
+
+    @abstractmethod
+    def stop(self) -> None:
+        """stop calling the callback and release the output"""
+
+
+class SoundDeviceBackend(Backend):
+    """Plays the output through the default sound device."""
+
+    def __init__(self, sample_rate: int, blocksize: int) -> None:
+        super().__init__(sample_rate, blocksize)
+        self._stream = None
+
+    @property
+    def running(self) -> bool:
+        return self._stream is not None
+
+    def start(self, callback: Callback) -> None:
+        if self._stream is not None:
+            return
+        # imported here so the other backends work without PortAudio
+        import sounddevice as sd
+
+        self._stream = sd.OutputStream(
+            samplerate=self._sample_rate,
+            blocksize=self._blocksize,
+            channels=1,
+            dtype="int16",
+            latency="low",
+            callback=callback,
+        )
+        self._stream.start()
+
+    def stop(self) -> None:
+        if self._stream is None:
+            return
+        self._stream.stop()
+        self._stream.close()
+        self._stream = None
+
+
+class OutputStatus:
+    """the status flags passed to the callback, like sounddevice.CallbackFlags"""
+
+    __slots__ = ("output_underflow", "output_overflow")
+
+    def __init__(self, output_underflow: bool = False) -> None:
+        self.output_underflow: bool = output_underflow
+        self.output_overflow: bool = False
+
+    def __bool__(self) -> bool:
+        return self.output_underflow or self.output_overflow
+
+
+class ClockedBackend(Backend):
+    """
+    Calls the callback from its own thread, one block per block period, or as
+    fast as possible without realtime. Subclasses decide what happens to each
+    block in write().
+
+    Attributes:
+        realtime: pace the blocks by the clock like a sound card
+    """
+
+    def __init__(self, sample_rate: int, blocksize: int, realtime: bool = True) -> None:
+        super().__init__(sample_rate, blocksize)
+        self.realtime: bool = realtime
+        self._thread: threading.Thread | None = None
+        self._stop = threading.Event()
+        self.blocks: int = 0
+        self.late_blocks: int = 0
+        self.render_seconds: float = 0.0  # time spent inside the callback
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    @property
+    def load(self) -> float:
+        """the average render time of a block as a fraction of its deadline"""
+        if self.blocks == 0:
+            return 0.0
+        return self.render_seconds * self._sample_rate / (self.blocks * self._blocksize)
+
+    def start(self, callback: Callback) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, args=(callback,), daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+        self.close()
+
+    def _run(self, callback: Callback) -> None:
+        """the output thread: calls the callback for each block until stopped"""
+        outdata: npt.NDArray[np.int16] = np.zeros((self._blocksize, 1), dtype=np.int16)
+        period: float = self._blocksize / self._sample_rate
+        status = OutputStatus()
+        started: float = time.perf_counter()
+        while not self._stop.is_set():
+            deadline: float = started + (self.blocks + 1) * period
+            begin: float = time.perf_counter()
+            callback(outdata, self._blocksize, None, status)
+            end: float = time.perf_counter()
+            self.render_seconds += end - begin
+            self.write(outdata[:, 0])
+            self.blocks += 1
+
+            status.output_underflow = end > deadline
+            if status.output_underflow:
+                self.late_blocks += 1
+            if self.realtime:
+                if end > deadline:  # start over from now, like a device after an xrun
+                    started = end - self.blocks * period
+                else:
+                    self._stop.wait(deadline - end)
+
+    def write(self, block: npt.NDArray[np.int16]) -> None:
+        """called with every finished block"""
+
+    def close(self) -> None:
+        """called once the output thread has stopped"""
+
+
+class NullBackend(ClockedBackend):
+    """Discards the output, so only the cost of rendering it remains."""
+
+
+class FileBackend(ClockedBackend):
+    """
+    Writes the output to a file: a mono 16-bit WAV file, or headerless int16
+    samples if the path ends in .raw.
+
+    Attributes:
+        path: the file to write
+    """
+
+    def __init__(
+        self, path: str, sample_rate: int, blocksize: int, realtime: bool = False
+    ) -> None:
+        super().__init__(sample_rate, blocksize, realtime)
+        self._path: str = path
+        self._file = None
+
+    def start(self, callback: Callback) -> None:
+        if self._thread is not None:
+            return
+        if self._path.lower().endswith(".raw"):
+            self._file = open(self._path, "wb")
+        else:
+            self._file = wave.open(self._path, "wb")
+            self._file.setnchannels(1)
+            self._file.setsampwidth(2)
+            self._file.setframerate(self._sample_rate)
+        super().start(callback)
+
+    def write(self, block: npt.NDArray[np.int16]) -> None:
+        data: bytes = block.astype("<i2").tobytes()
+        if isinstance(self._file, wave.Wave_write):
+            self._file.writeframesraw(data)
+        else:
+            self._file.write(data)
+
+    def close(self) -> None:
+        self._file.close()
+        self._file = None
+
+
+def create_backend(name: str, sample_rate: int, blocksize: int) -> Backend:
+    """
+    Returns the backend for a name: "sounddevice", "null", or the path of a
+    .wav or .raw file to write to.
+    """
+    if name == "sounddevice":
+        return SoundDeviceBackend(sample_rate, blocksize)
+    if name == "null":
+        return NullBackend(sample_rate, blocksize)
+    if name.lower().endswith((".wav", ".raw")):
+        return FileBackend(name, sample_rate, blocksize, realtime=True)
+    raise ValueError("unknown audio backend: " + name)
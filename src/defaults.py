@@ -0,0 +1,30 @@
+"""
+The default settings of SnakeSynth, shared by the GUI (form.py), offline
+rendering (render.py) and the benchmarks, so a render sounds the same as
+playing the same notes live.
+"""
+
+from oscillator import (
+    SineOscillator,
+    SquareOscillator,
+    TriangleOscillator,
+    SawtoothOscillator,
+)
+
+SAMPLE_RATE: int = 48000
+MAX_AMPLITUDE: float = 0.25  # float signal path, 1.0 is int16 full scale
+DEFAULT_DURATION: float = 0.2  # seconds of a typical key press
+DEFAULT_VOLUME: int = 9
+DEFAULT_VOLUME_OFFSET: int = 9
+DEFAULT_ATTACK: int = 2
+DEFAULT_DECAY: int = 7
+DEFAULT_SUSTAIN: int = 8
+DEFAULT_RELEASE: int = 3
+
+# the oscillator sampled into the wavetable of each waveform
+WAVEFORMS: dict[str, type] = {
+    "sine": SineOscillator,
+    "square": SquareOscillator,
+    "sawtooth": SawtoothOscillator,
+    "triangle": TriangleOscillator,
+}
@@ -0,0 +1,218 @@
+"""
+The AudioEngine class owns the one output stream of SnakeSynth. The stream is
+opened once and stays open; the output backend (the sound device by default,
+see backends.py) calls the engine for every small block, and the engine renders
+that block from the notes in its VoicePool. Key
+presses and releases are sent to the engine as events, which it picks up at the
+start of the next block, so the GUI thread never touches the audio state.
+
+To use the AudioEngine class, follow these steps:
+
+1. Create an instance, passing the ADSREnvelope that holds the envelope settings,
+the Volume to apply, the sample rate, the block size in frames, and the number of
+voices and stealing policy of the voice pool, and optionally the output backend.
+2. Call start() once to open the output stream.
+3. Call note_on() with the wavetable and frequency of a note when a key is pressed,
+and note_off() when it is released. Both are safe to call from any thread.
+4. Call stop() when the application closes.
+
+render() gives the next float32 block without a sound device, for tests and
+offline rendering. The metrics attribute (see AudioMetrics) measures the callback
+once its enabled flag is set, and the master attribute (see MasterBus) limits the
+mix to full scale and meters its peaks.
+"""
+
+import enum
+import time
+from collections import deque
+from typing import NamedTuple
+
+import numpy as np
+import numpy.typing as npt
+from adsr import ADSREnvelope
+from volume import Volume
+from quantize import to_int16
+from voices import VoicePool, DEFAULT_VOICES
+from metrics import AudioMetrics
+from master import MasterBus
+from backends import Backend, SoundDeviceBackend
+
+DEFAULT_BLOCKSIZE: int = 256  # 5.3 ms at 48 kHz
+
+
+class EventType(enum.Enum):
+    NOTE_ON = 0
+    NOTE_OFF = 1
+
+
+class NoteEvent(NamedTuple):
+    """
+    A key press or release waiting to be picked up by the audio thread.
+
+    Attributes:
+        type: note on or note off
+        note: name of the note, e.g. "A4"
+        table: for note on, the single-cycle wavetable played while the key is held
+        frequency: for note on, the pitch in hertz
+        amplitude: for note on, the peak level
+    """
+
+    type: EventType
+    note: str | None
+    table: npt.NDArray[np.float64] | None = None
+    frequency: float = 0.0
+    amplitude: float = 1.0
+
+
+class AudioEngine:
+    """
+    Renders the synthesizer output block by block inside the sound device callback.
+
+    Attributes:
+        envelope: the ADSR envelope whose settings are applied to every voice
+        volume: the volume control applied to the mix
+        sample_rate: speed that samples are loaded in cycles per second (hertz)
+        blocksize: frames per callback; smaller gives lower latency
+        voices: the most notes that can sound at once
+        steal: voice stealing policy, see VoicePool
+        metrics: measure the callback from the start, see AudioMetrics
+        backend: where the output goes, the sound device if None
+    """
+
+    def __init__(
+        self,
+        envelope: ADSREnvelope,
+        volume: Volume,
+        sample_rate: int = 48000,
+        blocksize: int = DEFAULT_BLOCKSIZE,
+        voices: int = DEFAULT_VOICES,
+        steal: str = "oldest",
+        metrics: bool = False,
+        backend: Backend | None = None,
+    ) -> None:
+        self._envelope: ADSREnvelope = envelope
+        self._volume: Volume = volume
+        self._sample_rate: int = sample_rate
+        self._blocksize: int = blocksize
+        # deque appends and pops are atomic, so the GUI thread can add events
+        # while the audio thread takes them without a lock
+        self._events: deque[NoteEvent] = deque()
+        self.voices: VoicePool = VoicePool(voices, steal, sample_rate, blocksize)
+        self.metrics: AudioMetrics = AudioMetrics(sample_rate, blocksize, metrics)
+        self.master: MasterBus = MasterBus()
+        self._buffer: npt.NDArray[np.float32] = np.zeros(blocksize, dtype=np.float32)
+        self._scaled: npt.NDArray[np.float32] = np.zeros(blocksize, dtype=np.float32)
+        if backend is None:
+            backend = SoundDeviceBackend(sample_rate, blocksize)
+        self.backend: Backend = backend
+
+    @property
+    def sample_rate(self) -> int:
+        return self._sample_rate
+
+    @property
+    def blocksize(self) -> int:
+        return self._blocksize
+
+    @property
+    def latency(self) -> float:
+        """the delay one block adds between a key press and its sound, in seconds"""
+        return self._blocksize / self._sample_rate
+
+    @property
+    def running(self) -> bool:
+        """whether the output stream is open"""
+        return self.backend.running
+
+    def note_on(
+        self,
+        note: str,
+        table: npt.NDArray[np.floating],
+        frequency: float,
+        amplitude: float = 1.0,
+    ) -> None:
+        """
+        start playing a note from the next block. The table is copied here, so
+        the audio thread never reads a memory-mapped or shared array.
+        """
+        if len(table) > self.voices.table_size:
+            raise ValueError(
+                f"wavetables can have at most {self.voices.table_size} samples"
+            )
+        table = np.array(table, dtype=np.float64)
+        self._events.append(
+            NoteEvent(EventType.NOTE_ON, note, table, frequency, amplitude)
+        )
+
+    def note_off(self, note: str | None = None) -> None:
+        """
+        release a note from the next block. Releasing a note that is not
+        playing does nothing; None releases every note.
+        """
+        self._events.append(NoteEvent(EventType.NOTE_OFF, note))
+
+    def start(self) -> None:
+        """open the output stream; the backend starts calling the engine"""
+        self.backend.start(self.callback)
+
+    def stop(self) -> None:
+        """stop and close the output stream"""
+        self.backend.stop()
+
+    def callback(
+        self, outdata: npt.NDArray[np.int16], frames: int, timestamps, status
+    ) -> None:
+        """called by the backend to fill outdata with the next block"""
+        if frames > self._scaled.size:
+            self._scaled = np.zeros(frames, dtype=np.float32)
+        if not self.metrics.enabled:
+            to_int16(self.render(frames), out=outdata[:, 0], scratch=self._scaled)
+            return
+        started: float = time.perf_counter()
+        to_int16(self.render(frames), out=outdata[:, 0], scratch=self._scaled)
+        self.metrics.record_block(
+            time.perf_counter() - started, frames, status, self.voices.active_count
+        )
+
+    def render(self, frames: int) -> npt.NDArray[np.float32]:
+        """
+        Renders the next block of float32 samples.
+
+        Returns:
+            a view of an internal buffer, only valid until the next call
+        """
+        self._process_events()
+        if frames > self._buffer.size:
+            self._buffer = np.zeros(frames, dtype=np.float32)
+        out: npt.NDArray[np.float32] = self._buffer[:frames]
+
+        self.voices.render(
+            self._envelope.params, frames, out, self._envelope.sustain_block(frames)
+        )
+        self._volume.change_gain(out, out=out)
+        self.master.process(out, out=out)
+        return out
+
+    def skip(self, frames: int) -> None:
+        """
+        Moves on by frames samples without rendering them, for starting an offline
+        render part way through. Volume and sustain glides move on too, so the
+        following blocks match a render that started at the beginning.
+        """
+        self._process_events()
+        self.voices.advance(self._envelope.params, frames)
+        self._envelope.skip_sustain(frames)
+        self._volume.skip(frames)
+
+    def _process_events(self) -> None:
+        """applies the note events sent since the last block"""
+        while self._events:
+            event: NoteEvent = self._events.popleft()
+            if event.type == EventType.NOTE_ON:
+                self.voices.note_on(
+                    event.note, event.table, event.frequency, event.amplitude
+                )
+            elif event.note is None:
+                self.voices.release_all()
+            else:
+                self.voices.note_off(event.note)
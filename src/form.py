@@ -5,8 +5,10 @@ The synthesizer UI supports multiple waveforms including sine, square, sawtooth,
 with adjustable parameters attack, decay, sustain, and release (ADSR envelope), volume, pitch, and tone. 
 
 Wave Generation
-After defining the constants, the code generates waveforms for each key using different oscillators 
-(sine, square, sawtooth, and triangle). These waveforms are stored in dictionaries for easy access.
+After importing the default settings shared with render.py (defaults.py), the code samples a
+single cycle of each waveform (sine, square, sawtooth, and triangle) into a wavetable. When a key
+is pressed, its note is sent to the AudioEngine with the selected wavetable, and the engine plays
+it through the one output stream it keeps open.
 
 MainWidget Class
 The MainWidget class represents the main widget of the synthesizer application. It inherits from 
@@ -21,37 +23,43 @@ from pathlib import Path
 from PySide6.QtWidgets import (
     QWidget,
     QPushButton,
+    QDial,
+    QLabel,
 )
-from PySide6.QtCore import QFile, QThreadPool
+from PySide6.QtCore import QFile, QThreadPool, Qt, QTimer
 from PySide6.QtUiTools import QUiLoader
-from oscillator import (
-    SineOscillator as sine,
-    SquareOscillator as square,
-    TriangleOscillator as triangle,
-    SawtoothOscillator as saw,
+from oscillator import WavetableOscillator, WAVETABLE_SIZE
+from defaults import (
+    SAMPLE_RATE,
+    MAX_AMPLITUDE,
+    DEFAULT_VOLUME,
+    DEFAULT_VOLUME_OFFSET,
+    DEFAULT_ATTACK,
+    DEFAULT_DECAY,
+    DEFAULT_SUSTAIN,
+    DEFAULT_RELEASE,
+    WAVEFORMS,
 )
-from adsr import ADSREnvelope, State
+from adsr import ADSREnvelope
+from engine import AudioEngine
+from backends import create_backend
 from notefreq import NOTE_FREQS
 from volume import Volume
+from wavecache import DiskCache, code_version, DEFAULT_CACHE_DIR
 from midi_detect import identify_device
-from threads import Worker, MidiInputWorker, MidiWorker
+from threads import MidiInputWorker, MidiWorker
 import pygame
-import sounddevice as sd
-import numpy as np
 from numpy import ndarray
 
-sd.default.latency = "low"
-
-SAMPLE_RATE: int = 48000
-MAX_AMPLITUDE: int = 8192
-DEFAULT_DURATION: float = 0.2
-DEFAULT_VOLUME: int = 9
-DEFAULT_VOLUME_OFFSET: int = 9
-DEFAULT_ATTACK: int = 2
-DEFAULT_DECAY: int = 7
-DEFAULT_SUSTAIN: int = 8
-DEFAULT_RELEASE: int = 3
+BLOCKSIZE: int = 256  # frames per audio callback, 5.3 ms at 48 kHz
+VOICES: int = 8  # notes that can sound at once
+# audio callback measurements in the status area, SNAKESYNTH_METRICS=0 turns them off
+METRICS_ENABLED: bool = os.environ.get("SNAKESYNTH_METRICS", "1") != "0"
+METRICS_INTERVAL_MS: int = 500
+# "sounddevice", "null", or a .wav/.raw file to write the output to
+AUDIO_BACKEND: str = os.environ.get("SNAKESYNTH_BACKEND", "sounddevice")
 DEFAULT_PITCH: int = 3
+CURVE_KNOB_RANGE: int = 10  # segment curvature from -10 to 10, 0 is linear
 
 """
 turned linting formatting off for this python list.
@@ -72,28 +80,20 @@ GUI_KEYS: list[str] = [
 # fmt: on
 
 """
-generate an oscillator for each key inside a dictionary
-Note: due to saw wave and square wave implementation, 
-generating them takes a lot longer, might need rework in the future.
+sample a single cycle of each waveform into a wavetable. Every note is played
+from the selected table by the audio engine, so nothing is rendered per note.
+The tables are also kept in a disk cache, so a restarted SnakeSynth maps them
+from disk instead of sampling them again.
 """
-sine_waves: ndarray[np.int16] = {}
-square_waves: ndarray[np.int16] = {}
-saw_waves: ndarray[np.int16] = {}
-triangle_waves: ndarray[np.int16] = {}
-
-for key in NOTE_FREQS:
-    sine_waves[key] = sine(
-        NOTE_FREQS[key], SAMPLE_RATE, MAX_AMPLITUDE, DEFAULT_DURATION
-    ).generate_wave()
-    square_waves[key] = square(
-        NOTE_FREQS[key], SAMPLE_RATE, MAX_AMPLITUDE, DEFAULT_DURATION
-    ).generate_wave()
-    saw_waves[key] = saw(
-        NOTE_FREQS[key], SAMPLE_RATE, MAX_AMPLITUDE, DEFAULT_DURATION
-    ).generate_wave()
-    triangle_waves[key] = triangle(
-        NOTE_FREQS[key], SAMPLE_RATE, MAX_AMPLITUDE, DEFAULT_DURATION
-    ).generate_wave()
+disk_cache: DiskCache = DiskCache(DEFAULT_CACHE_DIR, code_version(WavetableOscillator))
+wavetables: dict[str, ndarray] = {
+    name: disk_cache.load_or_build(
+        "wavetable-" + name,
+        (oscillator.__name__, WAVETABLE_SIZE),
+        lambda oscillator=oscillator: WavetableOscillator.create_table(oscillator),
+    )
+    for name, oscillator in WAVEFORMS.items()
+}
 
 
 class MainWidget(QWidget):
@@ -104,10 +104,14 @@ class MainWidget(QWidget):
         Attributes:
         - vol_ctrl (Volume): Manages volume control using a Volume instance.
         - adsr_envelope (ADSREnvelope): Handles ADSR (Attack, Decay, Sustain, Release) envelope parameters.
+        - audio_engine (AudioEngine): Owns the output stream and plays the notes sent to it.
+        - status_timer (QTimer): Refreshes the audio metrics in the status area.
+        - midi_worker (MidiInputWorker | None): Reads the MIDI input device, if one was found.
         - win (QWidget): Loads the UI and assigns it to the MainWidget window.
         - threadpool (QThreadPool): Manages threads for concurrent operations.
         - pitch_previous_value (int): Holds the default pitch value.
         - pitch_shifted_keys (list[str]): Stores default key mappings for the GUI.
+        - held_keys (dict[str, str]): The note each GUI key being held is playing.
         - octave_count (int): Defines the number of octaves for key mappings.
         """
         super(MainWidget, self).__init__()
@@ -115,12 +119,24 @@ class MainWidget(QWidget):
         self.adsr_envelope: ADSREnvelope = ADSREnvelope(
             DEFAULT_ATTACK, DEFAULT_DECAY, DEFAULT_SUSTAIN, DEFAULT_RELEASE
         )
+        self.audio_engine: AudioEngine = AudioEngine(
+            self.adsr_envelope,
+            self.vol_ctrl,
+            SAMPLE_RATE,
+            BLOCKSIZE,
+            VOICES,
+            metrics=METRICS_ENABLED,
+            backend=create_backend(AUDIO_BACKEND, SAMPLE_RATE, BLOCKSIZE),
+        )
+        self.audio_engine.start()
+        self.midi_worker: MidiInputWorker | None = None  # set by MIDI_init()
         MainWidget.win: QWidget = self.load_ui()
         self.threadpool: QThreadPool = QThreadPool()
         self.pitch_previous_value: int = DEFAULT_PITCH
 
         # default key mapping (matches the key names in the GUI)
         self.pitch_shifted_keys: list[str] = []
+        self.held_keys: dict[str, str] = {}
         octave_count: int = 8
 
         for octave in range(octave_count):
@@ -155,7 +171,7 @@ class MainWidget(QWidget):
             identify_device()
         )  # return value is either None or the MIDI device
         if input_device is not None:
-            self.midi_worker: MidiInputWorker = MidiInputWorker(input_device, self)
+            self.midi_worker = MidiInputWorker(input_device, self)
             self.threadpool.start(self.midi_worker)
             self.midi_thread: MidiWorker = MidiWorker(None)
             self.midi_thread.start()
@@ -180,6 +196,8 @@ class MainWidget(QWidget):
         ui_file.close()
         self.set_default_values(win)
         self.connect_knob_and_spinbox_values(win)
+        self.add_curve_knobs(win)
+        self.add_status_area(win)
         self.wave_selection(win)
         self.assign_key_handler(win)
         return win
@@ -253,6 +271,64 @@ class MainWidget(QWidget):
             lambda: self.handle_spin_box_value_changed("volume")
         )
 
+    def add_curve_knobs(self, win) -> None:
+        """
+        Adds a small curve knob under the attack, decay and release knobs.
+        The middle position is a linear segment. Turning right bends the segment
+        like an exponential (slow rise, fast fall), turning left like a logarithm.
+        The knobs are created here rather than in form.ui.
+        Args:
+        win: The UI window object whose attack, decay and release frames get a curve knob.
+        """
+        for segment in ["attack", "decay", "release"]:
+            knob: QDial = QDial()
+            knob.setObjectName(segment + "_curve_knob")
+            knob.setRange(-CURVE_KNOB_RANGE, CURVE_KNOB_RANGE)
+            knob.setValue(0)
+            knob.setNotchesVisible(True)
+            knob.setMaximumSize(40, 40)
+            knob.setToolTip(segment.capitalize() + " curve")
+            knob.valueChanged.connect(
+                lambda v, segment=segment: self.handle_curve_knob_changed(segment, v)
+            )
+            frame: QWidget = getattr(win, segment + "_frame")
+            frame.layout().addWidget(knob, alignment=Qt.AlignHCenter)
+            setattr(win, segment + "_curve_knob", knob)
+
+    def add_status_area(self, win) -> None:
+        """
+        Adds a status line under the keys showing the audio metrics: voices
+        sounding, render time of the audio blocks against their deadline, and
+        underruns reported by the sound device, followed by the output peak and
+        limiting of the master bus. It is refreshed by a timer and created here
+        rather than in form.ui.
+        Args:
+        win: The UI window object the status line is added to.
+        """
+        status_label: QLabel = QLabel(self.status_text())
+        status_label.setObjectName("status_label")
+        win.layout().addWidget(status_label)
+        win.status_label = status_label
+        self.status_timer: QTimer = QTimer(self)
+        self.status_timer.timeout.connect(self.update_status)
+        self.status_timer.start(METRICS_INTERVAL_MS)
+
+    def status_text(self) -> str:
+        """
+        This function returns the audio metrics and master bus meters as one line.
+        """
+        engine: AudioEngine = self.audio_engine
+        text: str = engine.metrics.summary() + " | " + engine.master.summary()
+        if self.midi_worker is not None:
+            text += " | " + self.midi_worker.reader.summary()
+        return text
+
+    def update_status(self) -> None:
+        """
+        This function shows the latest audio metrics in the status area.
+        """
+        self.win.status_label.setText(self.status_text())
+
     def wave_selection(self, win) -> None:
         """
         This function sets up connections between the different waveform selection buttons
@@ -278,17 +354,18 @@ class MainWidget(QWidget):
         for key in keys:
             note = key.objectName()
             key.pressed.connect(lambda note=note: self.key_pressed_handler(note))
-            key.released.connect(self.key_released_handler)
+            key.released.connect(lambda note=note: self.key_released_handler(note))
 
     def key_pressed_handler(self, key) -> None:
         """
         This function handles when a key is pressed.
         First it maps the named keys in the GUI to the
         correct notes defined by the shift in pitch.
-        Once the keys are mapped it updates the ADSR state
-        and plays the continous wave on one thread.
+        Once the keys are mapped it plays the note and
+        remembers it, so releasing the key releases the same
+        note even if the pitch was changed in between.
         Args:
-        win: The UI window object containing the keys for which event handlers are being assigned.
+        key: The name of the GUI key that was pressed.
         """
         key_mapping = list(zip(GUI_KEYS, self.pitch_shifted_keys))
         mapped_key = (
@@ -300,42 +377,51 @@ class MainWidget(QWidget):
                 break  # exit loop once match is found
 
         if mapped_key is not None:  # Check if a valid mapped_key value was found
-            self.adsr_envelope.update_state(State.ATTACK)
-            worker = Worker(self.play_loop, selected_waves[mapped_key])
-            self.threadpool.start(worker)
+            self.held_keys[key] = mapped_key
+            self.play_note(mapped_key)
 
-    def key_released_handler(self) -> None:
+    def key_released_handler(self, key) -> None:
         """
-        This function updates the ADSR state when a key is released
-        to move into the next portion of envelope.
+        This function handles when a key is released by
+        releasing only the note that key started.
+        Args:
+        key: The name of the GUI key that was released.
         """
-        self.adsr_envelope.update_state(State.RELEASE)
+        note: str | None = self.held_keys.pop(key, None)
+        if note is not None:
+            self.release_note(note)
 
-    def play_loop(self, wav) -> None:
+    def play_note(self, note) -> None:
         """
-        This function sets up continuous play of the note.
-        When a key is pressed, the ADSR envelope is continuously
-        applied to the wave passed in. Then volume is appled and
-        the wave is output continously so there is no break in
-        the output wave.
+        This function sends a note to the audio engine, which
+        plays it from the wavetable of the selected waveform on a
+        free voice (or steals the oldest one) until the note is
+        released. It is also called from the MIDI input thread.
         Args:
-        wav: the wave sent in to be looped
-        """
-        # Set up and start the stream.
-        stream = sd.RawOutputStream(
-            samplerate=SAMPLE_RATE,
-            blocksize=len(wav),
-            channels=1,
-            dtype="int16",
+        note: The name of the note to play, e.g. "A4".
+        """
+        self.audio_engine.note_on(
+            note, wavetables[current_waveform], NOTE_FREQS[note], MAX_AMPLITUDE
         )
-        # Write the samples.
-        stream.start()
-        # Continuously apply adsr envelope to samples
-        while self.adsr_envelope._state != State.IDLE:
-            out_buffer: ndarray[np.int16] = np.empty(len(wav))
-            for i in range(len(wav)):
-                out_buffer[i] = self.adsr_envelope.process(wav[i])
-            stream.write(self.vol_ctrl.change_gain(out_buffer.astype(np.int16)))
+
+    def release_note(self, note) -> None:
+        """
+        This function tells the audio engine to move the voice
+        playing a note into the release portion of its envelope.
+        Other notes keep sounding.
+        Args:
+        note: The name of the note to release, e.g. "A4".
+        """
+        self.audio_engine.note_off(note)
+
+    def closeEvent(self, event) -> None:
+        """
+        Stops the MIDI input and closes the output stream when the window is closed.
+        """
+        if self.midi_worker is not None:
+            self.midi_worker.stop()
+        self.audio_engine.stop()
+        super().closeEvent(event)
 
     def handle_waveform_selected(self, selected_waveform) -> None:
         """
@@ -344,15 +430,9 @@ class MainWidget(QWidget):
         Args:
         selected_waveform: this is the user selected waveform
         """
-        global selected_waves
-        if selected_waveform == "sine":
-            selected_waves = sine_waves
-        elif selected_waveform == "square":
-            selected_waves = square_waves
-        elif selected_waveform == "sawtooth":
-            selected_waves = saw_waves
-        elif selected_waveform == "triangle":
-            selected_waves = triangle_waves
+        global current_waveform
+        if selected_waveform in wavetables:
+            current_waveform = selected_waveform
 
     def handle_pitch_knob_changed(self) -> None:
         """
@@ -423,6 +503,13 @@ class MainWidget(QWidget):
             case _:
                 raise "spin box not found for: " + spin_box
 
+    def handle_curve_knob_changed(self, segment: str, value: int) -> None:
+        """
+        This function handles when a curve knob value is changed
+        and reshapes the matching envelope segment.
+        """
+        self.adsr_envelope.update_curve(segment, float(value))
+
     def handle_spin_box_value_changed(self, knob: str) -> None:
         """
         This function handles synchronizing the values between a spin box
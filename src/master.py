@@ -0,0 +1,128 @@
+"""
+The MasterBus class is the last stage of the signal path, after the volume.
+Loud settings and many voices played together can add up to more than full
+scale. Instead of being cut off hard when converted to int16, peaks above a
+threshold are bent smoothly towards the ceiling by a soft limiter, so the output
+never leaves the int16 range and saturates gently instead of distorting harshly.
+
+The limiter works sample by sample without look-ahead or state, so each block
+costs the same handful of NumPy operations and any block gives the same output
+however the signal is split into blocks. Below the threshold the signal passes
+unchanged.
+
+To use the MasterBus class, create an instance, pass every float32 block to
+process(), and read the meters (peak, input_peak, gain_reduction) from any thread.
+"""
+
+import math
+
+import numpy as np
+import numpy.typing as npt
+
+DEFAULT_THRESHOLD: float = 0.8  # where the limiter starts bending, 1.0 is full scale
+DEFAULT_CEILING: float = 1.0  # the level the output never goes beyond
+
+
+def decibels(level: float) -> float:
+    """a level relative to full scale in dB, -inf for silence"""
+    return 20.0 * math.log10(level) if level > 0 else -math.inf
+
+
+class MasterBus:
+    """
+    Soft limiter with meters for the final mix.
+
+    Attributes:
+        threshold: level above which peaks are reduced
+        ceiling: level the output approaches but never exceeds
+    """
+
+    def __init__(
+        self, threshold: float = DEFAULT_THRESHOLD, ceiling: float = DEFAULT_CEILING
+    ) -> None:
+        if not 0 < threshold < ceiling:
+            raise ValueError("the limiter threshold must be between 0 and the ceiling")
+        self._threshold: float = threshold
+        self._ceiling: float = ceiling
+        self._knee: float = ceiling - threshold
+        self._scratch: npt.NDArray[np.float32] = np.empty(0, dtype=np.float32)
+        self._excess: npt.NDArray[np.float32] = np.empty(0, dtype=np.float32)
+        self.input_peak: float = 0.0  # highest level into the last block
+        self.peak: float = 0.0  # highest level out of the last block
+        self.gain_reduction: float = 0.0  # dB taken off the peak of the last block
+        self.max_gain_reduction: float = 0.0  # the most taken off since reset_meters()
+
+    def process(
+        self,
+        samples: npt.NDArray[np.float32],
+        out: npt.NDArray[np.float32] | None = None,
+    ) -> npt.NDArray[np.float32]:
+        """
+        Limits a block. Levels up to the threshold pass unchanged; above it, the
+        excess e is reduced to knee * tanh(e / knee), where the knee is the room
+        between threshold and ceiling, so the output never passes the ceiling and
+        the curve has no corner at the threshold.
+
+        Args:
+            samples: the block to limit
+            out: optional float32 buffer of the same length (may be samples itself)
+
+        Returns:
+            the limited block
+        """
+        if out is None:
+            out = np.empty(len(samples), dtype=np.float32)
+        if self._scratch.size < len(samples):
+            self._scratch = np.empty(len(samples), dtype=np.float32)
+            self._excess = np.empty(len(samples), dtype=np.float32)
+        level = self._scratch[: len(samples)]
+        excess = self._excess[: len(samples)]
+
+        np.abs(samples, out=level)
+        input_peak: float = float(level.max(initial=0.0))
+        if input_peak <= self._threshold:
+            if out is not samples:
+                out[:] = samples
+            self._update_meters(input_peak, input_peak)
+            return out
+
+        # the limited level t + knee * tanh(excess / knee) is t below the threshold
+        # (tanh(0) == 0) and below the level above it, so the smaller of the two
+        # is the output level everywhere
+        np.subtract(level, self._threshold, out=excess)
+        np.maximum(excess, 0.0, out=excess)
+        np.multiply(excess, 1.0 / self._knee, out=excess)
+        np.tanh(excess, out=excess)
+        np.multiply(excess, self._knee, out=excess)
+        np.add(excess, self._threshold, out=excess)
+        np.minimum(level, excess, out=level)
+        np.minimum(level, self._ceiling, out=level)  # float32 rounding
+        np.copysign(level, samples, out=out)
+
+        peak: float = min(
+            self._threshold
+            + self._knee * math.tanh((input_peak - self._threshold) / self._knee),
+            self._ceiling,
+        )
+        self._update_meters(input_peak, peak)
+        return out
+
+    def _update_meters(self, input_peak: float, peak: float) -> None:
+        self.input_peak = input_peak
+        self.peak = peak
+        reduction: float = decibels(input_peak) - decibels(peak) if peak > 0 else 0.0
+        self.gain_reduction = reduction
+        if reduction > self.max_gain_reduction:
+            self.max_gain_reduction = reduction
+
+    def reset_meters(self) -> None:
+        """clears the held gain reduction"""
+        self.max_gain_reduction = 0.0
+
+    def summary(self) -> str:
+        """a one-line meter report for a status bar"""
+        return (
+            f"peak {decibels(self.peak):.1f} dBFS"
+            f" | limiting {self.gain_reduction:.1f} dB"
+            f" (max {self.max_gain_reduction:.1f})"
+        )
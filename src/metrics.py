@@ -0,0 +1,111 @@
+"""
+The AudioMetrics class measures the audio path from inside the sound device
+callback: how often the device reported an underrun or overrun, how long each
+block took to render compared to the time it plays for (its deadline), and how
+many voices were sounding.
+
+The audio thread only increments counters, so any other thread can read them
+at any time, for example to show them in the GUI. When metrics are switched off
+the callback skips all measuring, so the only cost left is one flag check per block.
+
+To use the AudioMetrics class, follow these steps:
+
+1. Create an instance with the sample rate and block size, enabled or not.
+2. Call record_block() from the audio callback with the time the block took to
+render, the callback status flags and the number of sounding voices.
+3. Read the counters, histogram() or summary() from any thread; reset() starts over.
+"""
+
+import numpy as np
+import numpy.typing as npt
+
+HISTOGRAM_BINS: int = 20
+BIN_WIDTH: float = 0.1  # fraction of the block deadline per histogram bin
+
+
+class AudioMetrics:
+    """
+    Counters and a render time histogram for the audio callback.
+
+    Attributes:
+        sample_rate: speed that samples are played in cycles per second (hertz)
+        blocksize: frames per callback, which sets the deadline of a block
+        enabled: whether record_block() is called by the engine
+    """
+
+    def __init__(self, sample_rate: int, blocksize: int, enabled: bool = False) -> None:
+        self._sample_rate: int = sample_rate
+        self._blocksize: int = blocksize
+        self.enabled: bool = enabled
+        self.reset()
+
+    @property
+    def deadline(self) -> float:
+        """the time one block plays for, in seconds"""
+        return self._blocksize / self._sample_rate
+
+    def reset(self) -> None:
+        """clears every counter"""
+        self.blocks: int = 0
+        self.underruns: int = 0  # the device ran out of samples to play
+        self.overruns: int = 0  # the device had to drop samples
+        self.late_blocks: int = 0  # blocks that took longer than their deadline
+        self.max_load: float = 0.0  # the slowest block as a fraction of its deadline
+        self.voices: int = 0
+        self.peak_voices: int = 0
+        # blocks by render time, in BIN_WIDTH fractions of the deadline;
+        # the last bin counts everything slower
+        self._histogram: list[int] = [0] * HISTOGRAM_BINS
+
+    def record_block(self, seconds: float, frames: int, status, voices: int) -> None:
+        """
+        Records one callback.
+
+        Args:
+            seconds: how long the block took to render
+            frames: frames in the block
+            status: the sounddevice callback status flags
+            voices: the number of sounding voices
+        """
+        load: float = seconds * self._sample_rate / frames
+        self.blocks += 1
+        if status:
+            if status.output_underflow:
+                self.underruns += 1
+            if status.output_overflow:
+                self.overruns += 1
+        if load > 1.0:
+            self.late_blocks += 1
+        if load > self.max_load:
+            self.max_load = load
+        self._histogram[min(int(load / BIN_WIDTH), HISTOGRAM_BINS - 1)] += 1
+        self.voices = voices
+        if voices > self.peak_voices:
+            self.peak_voices = voices
+
+    def histogram(self) -> npt.NDArray[np.int64]:
+        """block counts by render time, see BIN_WIDTH"""
+        return np.array(self._histogram, dtype=np.int64)
+
+    def load_percentile(self, percentile: float) -> float:
+        """
+        the render time, as a fraction of the deadline, that the given percentage
+        of blocks stayed under (to the resolution of the histogram)
+        """
+        counts: npt.NDArray[np.int64] = self.histogram()
+        if counts.sum() == 0:
+            return 0.0
+        cumulative = np.cumsum(counts) / counts.sum()
+        index: int = int(np.searchsorted(cumulative, percentile / 100))
+        return min(index + 1, HISTOGRAM_BINS) * BIN_WIDTH
+
+    def summary(self) -> str:
+        """a one-line report for a status bar"""
+        if not self.enabled:
+            return "audio metrics off"
+        return (
+            f"voices {self.voices} (peak {self.peak_voices})"
+            f" | load p99 {self.load_percentile(99):.0%} max {self.max_load:.0%}"
+            f" | late {self.late_blocks} | underruns {self.underruns}"
+            f" | overruns {self.overruns}"
+        )
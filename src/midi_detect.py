@@ -1,4 +1,5 @@
 import pygame.midi
+from midi_input import MidiReader, MIN_POLL_INTERVAL, MAX_POLL_INTERVAL
 
 def identify_device() -> pygame.midi.Input | None:
     """
@@ -70,15 +71,19 @@ def select_device(device_count) -> pygame.midi.Input | None:
         pygame.midi.quit()
         return None
 
-def receive_input(midi_input_device):
+def receive_input(midi_input_device, min_interval: float = MIN_POLL_INTERVAL,
+                  max_interval: float = MAX_POLL_INTERVAL) -> MidiReader:
     """
-    This function continuously receives and processes MIDI input from a specified MIDI input device.
+    This function returns a reader that receives and processes MIDI input from a specified MIDI input device.
 
     Args:
         midi_input_device (pygame.midi.Input): The MIDI input device to receive input from.
+        min_interval (float): Seconds between polls of the device right after a message.
+        max_interval (float): Most seconds between polls when no messages arrive, which bounds the
+                              delay before a message is read.
 
-    Yields:
-        dict: A dictionary containing the extracted MIDI data for each received MIDI event.
+    Returns:
+        MidiReader: Iterating over it yields a dictionary for each received MIDI event.
               Each dictionary includes the following keys:
               - 'status': The status byte of the MIDI event.
               - 'note': The note value associated with the MIDI event.
@@ -88,25 +93,14 @@ def receive_input(midi_input_device):
         RuntimeError: If `pygame.midi` is not initialized, indicating that the MIDI subsystem
                       has not been properly set up.
 
-    The function continuously listens for MIDI input from the specified `midi_input_device`.
-    It extracts and processes MIDI messages as they arrive, yielding dictionaries
-    containing the individual components of each MIDI event.
-
-    The function is designed to be used in a loop, and it will keep running until
-    stopped externally, making it suitable for real-time MIDI input processing.
+    The reader listens for MIDI input from the specified `midi_input_device`, sleeping between polls
+    instead of spinning, and measures its CPU use and the latency of each message against
+    pygame's MIDI clock. It keeps running until its stop() method is called from any thread,
+    making it suitable for real-time MIDI input processing.
 
     Note: Make sure to initialize the `pygame.midi` subsystem before calling this function.
     """
     if pygame.midi.get_init() == False:
         raise RuntimeError("pygame.midi not initialised.")
 
-    running: bool = True
-    while running:
-        if midi_input_device.poll():
-            midi_events = midi_input_device.read(10)  # Read up to 10 MIDI events
-            for event in midi_events:
-                data = event[0]  # The MIDI data is stored in the first element of the event tuple
-                status = data[0]  # The first byte of the MIDI data represents the status byte
-                note = data[1]  # The second byte of the MIDI data represents the note value
-                velocity = data[2]  # The third byte of the MIDI data represents the velocity or intensity of the MIDI event
-                yield {"status": status, "note": note, "velocity": velocity}
\ No newline at end of file
+    return MidiReader(midi_input_device, min_interval, max_interval, clock=pygame.midi.time)
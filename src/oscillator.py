@@ -12,7 +12,8 @@ To use the oscillators in your project, follow these steps:
 1. Import the desired oscillator class(es) from the oscillators module.
 2. Create an instance of the desired oscillator class, optionally specifying custom parameters 
 such as frequency, sample rate, amplitude, and duration.
-3. Call the generate_wave() method to generate the audio wave.
+3. Call the generate_wave() method to generate the audio wave, or call generate_block()
+repeatedly to stream a phase-continuous wave one block at a time.
 4. Optionally, you can call the play() method to play the generated wave using the default audio output device.
 5. To stop the audio playback, call the stop() method.
 
@@ -20,6 +21,7 @@ such as frequency, sample rate, amplitude, and duration.
 
 from abc import ABC
 import numpy as np
+import numpy.typing as npt
 
 
 class Oscillator(ABC):
@@ -31,6 +33,9 @@ class Oscillator(ABC):
         __init__: constructor
         generate_wave: abstract method for generating wave
         crop_samples: method for cropping wave
+        waveshape: abstract method for mapping phases onto the wave shape
+        generate_block: method for streaming the wave one block at a time
+        reset_phase: method for restarting the stream at a given phase
     """
 
     def __init__(
@@ -58,10 +63,22 @@ class Oscillator(ABC):
         self._step_size: float = 2.0 * np.pi * self._frequency / sample_rate
         self._time: np.ndarray = np.arange(int(self._sample_rate * self._duration))
 
-    def generate_wave(self) -> np.ndarray:
+        # streaming state used by generate_block
+        self._phase: float = 0.0
+        self._phase_increment: float = self._frequency / self._sample_rate
+        self._ramp: np.ndarray = np.arange(0, dtype=np.float64)
+        self._scratch: np.ndarray = np.empty(0)
+
+    def generate_wave(self, dtype: npt.DTypeLike = np.int16) -> np.ndarray:
         """
         override to generate a wave from the settings established
         upon construction.
+
+        Args:
+            dtype: type of the returned samples. The default int16 suits samples
+                scaled to the int16 range; pass np.float32 with an amplitude of
+                at most 1 for the float signal path, which is only converted to
+                int16 once at the output (see quantize.to_int16).
         """
 
         pass
@@ -84,6 +101,82 @@ class Oscillator(ABC):
 
         return samples[0 : self._time.size - remainder]
 
+    def _generate_from_waveshape(
+        self, dtype: npt.DTypeLike = np.int16
+    ) -> np.ndarray:
+        """
+        generate_wave for oscillators that are defined by their waveshape:
+        renders the full duration from the phase and crops it like the others.
+        """
+
+        samples: np.ndarray = self._time * self._phase_increment
+        self._wrap_phase(samples)
+        self.waveshape(samples)
+        samples *= self._amplitude
+        return self.crop_samples(samples).astype(dtype)
+
+    def waveshape(self, phase: np.ndarray) -> None:
+        """
+        override to map an array of phases (in cycles, 0 <= phase < 1)
+        onto the wave shape in place, with values between -1 and 1.
+        """
+
+        raise NotImplementedError
+
+    def generate_block(self, frames: int, out: np.ndarray | None = None) -> np.ndarray:
+        """
+        Generates the next block of a continuous wave. The phase is carried
+        over between calls, so consecutive blocks of any size join seamlessly
+        and no cropping to a zero crossing is needed.
+
+        Args:
+            frames: number of samples to generate
+            out: optional float buffer with room for at least frames samples.
+                When given, the block is written into it and nothing is allocated.
+
+        Returns:
+            the block of samples scaled by the amplitude
+        """
+
+        if out is None:
+            out = np.empty(frames)
+        else:
+            out = out[..., :frames]
+
+        # the ramp only grows, so steady state streaming reuses it every block
+        if self._ramp.size < frames:
+            self._ramp = np.arange(frames, dtype=np.float64)
+            self._scratch = np.empty(frames)
+
+        np.multiply(self._ramp[:frames], self._phase_increment, out=out)
+        np.add(out, self._phase, out=out)
+        self._wrap_phase(out)
+        self.waveshape(out)
+        np.multiply(out, self._amplitude, out=out)
+
+        self._phase = (self._phase + frames * self._phase_increment) % 1.0
+        return out
+
+    def _wrap_phase(self, phase: np.ndarray) -> None:
+        """
+        Wraps non-negative phases into 0 <= phase < 1 in place. Gives the same
+        result as np.mod(phase, 1.0), which is several times slower.
+        Blocks that fit the scratch buffer of generate_block allocate nothing.
+        """
+
+        if phase.ndim == 1 and phase.size <= self._scratch.size:
+            whole: np.ndarray = np.floor(phase, out=self._scratch[: phase.size])
+        else:
+            whole = np.floor(phase)
+        np.subtract(phase, whole, out=phase)
+
+    def reset_phase(self, phase: float = 0.0) -> None:
+        """
+        Restarts the stream produced by generate_block at the given phase (in cycles).
+        """
+
+        self._phase = phase % 1.0
+
 
 # SINE OSCILLATOR
 class SineOscillator(Oscillator):
@@ -103,11 +196,17 @@ class SineOscillator(Oscillator):
             duration=duration,
         )
 
-    def generate_wave(self) -> np.ndarray:
+    def generate_wave(self, dtype: npt.DTypeLike = np.int16) -> np.ndarray:
         """Generates a sine wave"""
 
         samples: np.ndarray = self._amplitude * np.sin(self._step_size * self._time)
-        return self.crop_samples(samples).astype(np.int16)
+        return self.crop_samples(samples).astype(dtype)
+
+    def waveshape(self, phase: np.ndarray) -> None:
+        """Maps phases onto a sine wave"""
+
+        np.multiply(phase, 2.0 * np.pi, out=phase)
+        np.sin(phase, out=phase)
 
 
 class SquareOscillator(SineOscillator):
@@ -127,17 +226,23 @@ class SquareOscillator(SineOscillator):
             duration=duration,
         )
 
-    def generate_wave(self) -> np.ndarray:
+    def generate_wave(self, dtype: npt.DTypeLike = np.int16) -> np.ndarray:
         """Generates a square wave"""
 
-        samples: np.ndarray = np.sin(self._step_size * self._time)
-        for x in self._time:
-            if samples[x] >= 0:
-                samples[x] = self._amplitude
-            else:
-                samples[x] = -self._amplitude
+        samples: np.ndarray = np.where(
+            np.sin(self._step_size * self._time) >= 0,
+            self._amplitude,
+            -self._amplitude,
+        )
+
+        return self.crop_samples(samples).astype(dtype)
+
+    def waveshape(self, phase: np.ndarray) -> None:
+        """Maps phases onto a square wave, high for the first half of each cycle"""
 
-        return self.crop_samples(samples).astype(np.int16)
+        np.subtract(phase, 0.5, out=phase)
+        np.copysign(1.0, phase, out=phase)
+        np.negative(phase, out=phase)
 
 
 # TRIANGLE OSCILLATOR
@@ -159,26 +264,40 @@ class TriangleOscillator(Oscillator):
             duration=duration,
         )
 
-    def generate_wave(self) -> np.ndarray:
+    def generate_wave(self, dtype: npt.DTypeLike = np.int16) -> np.ndarray:
         """Generates a triangle wave"""
-        
-        samples: np.ndarray = np.empty(
-            int(self._sample_rate * self._duration), dtype=float
-        )
 
         half_period: float = (1 / self._frequency) / 2
 
         double_amplitude: float = self._amplitude * 2
 
-        for x in self._time:
-            samples[x] = (
-                double_amplitude
-                / half_period
-                * (half_period - np.abs(np.mod(x / self._sample_rate + half_period / 2, (2 * half_period)) - half_period))
-                - self._amplitude
+        samples: np.ndarray = (
+            double_amplitude
+            / half_period
+            * (
+                half_period
+                - np.abs(
+                    np.mod(
+                        self._time / self._sample_rate + half_period / 2,
+                        (2 * half_period),
+                    )
+                    - half_period
+                )
             )
+            - self._amplitude
+        )
 
-        return self.crop_samples(samples).astype(np.int16)
+        return self.crop_samples(samples).astype(dtype)
+
+    def waveshape(self, phase: np.ndarray) -> None:
+        """Maps phases onto a triangle wave, rising from zero like generate_wave"""
+
+        np.add(phase, 0.25, out=phase)
+        self._wrap_phase(phase)
+        np.subtract(phase, 0.5, out=phase)
+        np.abs(phase, out=phase)
+        np.multiply(phase, -4.0, out=phase)
+        np.add(phase, 1.0, out=phase)
 
 
 # SAW TOOTH OSCILLATOR
@@ -199,20 +318,398 @@ class SawtoothOscillator(Oscillator):
             duration=duration,
         )
 
-    def generate_wave(self) -> np.ndarray:
+    def generate_wave(self, dtype: npt.DTypeLike = np.int16) -> np.ndarray:
         """Generates a sawtooth wave"""
 
-        samples: np.ndarray = np.arange(self._sample_rate * self._duration)
-
-        for x in self._time:
-            samples[x] = (
-                2
-                * np.fmod(
-                    ((x * self._frequency * self._amplitude) / self._sample_rate)
-                    + self._amplitude / 2,
-                    self._amplitude,
-                )
-                - self._amplitude
+        samples: np.ndarray = (
+            2
+            * np.fmod(
+                ((self._time * self._frequency * self._amplitude) / self._sample_rate)
+                + self._amplitude / 2,
+                self._amplitude,
             )
+            - self._amplitude
+        )
+
+        return self.crop_samples(samples).astype(dtype)
+
+    def waveshape(self, phase: np.ndarray) -> None:
+        """Maps phases onto a sawtooth wave, rising from zero like generate_wave"""
+
+        np.add(phase, 0.5, out=phase)
+        self._wrap_phase(phase)
+        np.multiply(phase, 2.0, out=phase)
+        np.subtract(phase, 1.0, out=phase)
+
+
+# BAND-LIMITED (POLYBLEP) OSCILLATORS
+# Source: Valimaki & Huovilainen, "Antialiasing Oscillators in Subtractive Synthesis"
+def poly_blep(phase: np.ndarray, phase_increment: float) -> np.ndarray:
+    """
+    Computes the polynomial band-limited step (PolyBLEP) residual for a unit
+    step at phase 0, for every sample of a block. Branch-free: every sample
+    costs the same, and only the samples within one step of the
+    discontinuity get a non-zero correction.
+
+    Args:
+        phase: phases in cycles (0 <= phase < 1)
+        phase_increment: phase advance per sample (frequency / sample rate)
+
+    Returns:
+        the residual to add at a rising step of height 2, or to subtract
+        at a falling one
+    """
+
+    after: np.ndarray = np.minimum(phase / phase_increment, 1.0)
+    before: np.ndarray = np.maximum((phase - 1.0) / phase_increment, -1.0)
+    after = 1.0 - after
+    before += 1.0
+    return np.square(before, out=before) - np.square(after, out=after)
+
+
+class PolyBLEPSawtoothOscillator(SawtoothOscillator):
+    """
+    Sawtooth with PolyBLEP smoothing at the reset, which removes most of the
+    aliasing of the naive sawtooth in the upper octaves without oversampling.
+    """
+
+    def generate_wave(self, dtype: npt.DTypeLike = np.int16) -> np.ndarray:
+        """Generates a band-limited sawtooth wave"""
+
+        return self._generate_from_waveshape(dtype)
+
+    def waveshape(self, phase: np.ndarray) -> None:
+        """Maps phases onto a band-limited sawtooth wave"""
+
+        np.add(phase, 0.5, out=phase)
+        self._wrap_phase(phase)
+        residual: np.ndarray = poly_blep(phase, self._phase_increment)
+        np.multiply(phase, 2.0, out=phase)
+        np.subtract(phase, 1.0, out=phase)
+        np.subtract(phase, residual, out=phase)
+
+
+class PolyBLEPSquareOscillator(SquareOscillator):
+    """
+    Square with PolyBLEP smoothing at both edges, which removes most of the
+    aliasing of the naive square in the upper octaves without oversampling.
+    """
+
+    def generate_wave(self, dtype: npt.DTypeLike = np.int16) -> np.ndarray:
+        """Generates a band-limited square wave"""
+
+        return self._generate_from_waveshape(dtype)
+
+    def waveshape(self, phase: np.ndarray) -> None:
+        """Maps phases onto a band-limited square wave"""
+
+        rising: np.ndarray = poly_blep(phase, self._phase_increment)
+        falling: np.ndarray = np.add(phase, 0.5)
+        self._wrap_phase(falling)
+        falling = poly_blep(falling, self._phase_increment)
+        super().waveshape(phase)
+        np.add(phase, rising, out=phase)
+        np.subtract(phase, falling, out=phase)
+
+
+# WAVETABLE OSCILLATOR
+WAVETABLE_SIZE: int = 2048
+
+
+class WavetableOscillator(Oscillator):
+    """
+    Plays back a single cycle of any wave shape at any frequency by reading
+    the table with linear interpolation between neighbouring entries.
+    One small table per waveform replaces a precomputed wave for every note.
+    """
+
+    def __init__(
+        self,
+        table: np.ndarray,
+        frequency: float = 440.0,
+        sample_rate: int = 48000,
+        amplitude: float = np.iinfo(np.int16).max / 4,
+        duration: float = 1.0,
+    ) -> None:
+        """
+        Extends Oscillator.__init__
+
+        Args:
+            table: a single cycle of the wave, with values between -1 and 1
+        """
+
+        super().__init__(
+            frequency=frequency,
+            sample_rate=sample_rate,
+            amplitude=amplitude,
+            duration=duration,
+        )
+        table = np.asarray(table, dtype=np.float64)
+        if table.ndim != 1 or table.size < 2:
+            raise ValueError("a wavetable must be a 1-D array of at least 2 samples")
+
+        self._table_size: int = table.size
+        # repeat the first sample at the end so interpolation never wraps the index
+        self._table: np.ndarray = np.append(table, table[0])
+
+    @staticmethod
+    def create_table(
+        oscillator_class: type[Oscillator], size: int = WAVETABLE_SIZE
+    ) -> np.ndarray:
+        """
+        Samples a single cycle from the waveshape of an oscillator class.
+
+        Args:
+            oscillator_class: e.g. SineOscillator or SawtoothOscillator
+            size: number of samples in the cycle
+
+        Returns:
+            the single-cycle table
+        """
+
+        table: np.ndarray = np.arange(size) / size
+        oscillator_class().waveshape(table)
+        return table
+
+    @staticmethod
+    def load_table(path: str) -> np.ndarray:
+        """
+        Loads a custom single-cycle table saved with numpy.save and
+        normalizes it so the loudest sample reaches 1.
+
+        Args:
+            path: path of the .npy file
+
+        Returns:
+            the single-cycle table
+        """
+
+        table: np.ndarray = np.load(path).astype(np.float64)
+        if table.ndim != 1 or table.size < 2:
+            raise ValueError(f"{path} does not hold a single-cycle 1-D table")
+
+        peak: float = np.max(np.abs(table))
+        if peak > 0:
+            table /= peak
+        return table
+
+    def generate_wave(self, dtype: npt.DTypeLike = np.int16) -> np.ndarray:
+        """Generates a wave by reading the table"""
+
+        return self._generate_from_waveshape(dtype)
+
+    def waveshape(self, phase: np.ndarray) -> None:
+        """Maps phases onto the table, interpolating between entries"""
+
+        position: np.ndarray = phase * self._table_size
+        index: np.ndarray = position.astype(np.intp)
+        np.subtract(position, index, out=position)
+        lower: np.ndarray = self._table[index]
+        upper: np.ndarray = self._table[index + 1]
+        np.subtract(upper, lower, out=upper)
+        np.multiply(upper, position, out=upper)
+        np.add(lower, upper, out=phase)
+
+
+# OSCILLATOR BANK
+class OscillatorBank:
+    """
+    Renders the same oscillator at many frequencies at once. The phase of every
+    note is computed in one broadcast (notes x samples) expression and passed
+    through the oscillator's waveshape, instead of building one oscillator and
+    one time vector per note.
+
+    Usage:
+        bank = OscillatorBank(SawtoothOscillator, [220.0, 277.18, 329.63])
+        waves = bank.generate_waves()      # one row per note
+        lengths = bank.crop_lengths        # zero-crossing crop of each row
+        chord = bank.generate_chord()      # all notes mixed together
+    """
+
+    def __init__(
+        self,
+        oscillator_class: type[Oscillator] = SineOscillator,
+        frequencies: np.ndarray | list[float] | tuple[float, ...] = (440.0,),
+        sample_rate: int = 48000,
+        amplitude: float = np.iinfo(np.int16).max / 4,
+        duration: float = 1.0,
+        **kwargs,
+    ) -> None:
+        """
+        Args:
+            oscillator_class: the oscillator to render, e.g. SquareOscillator
+            frequencies: the frequency of each note
+            sample_rate: the sample rate
+            amplitude: the amplitude of each note
+            duration: the duration of each note, before cropping
+            kwargs: extra arguments for the oscillator, e.g. table for WavetableOscillator
+        """
+
+        self._frequencies: np.ndarray = np.asarray(frequencies, dtype=np.float64)
+        # a column of frequencies makes every per-note setting of the oscillator
+        # (phase increment, step size) broadcast across the samples of its row
+        self._oscillator: Oscillator = oscillator_class(
+            frequency=self._frequencies[:, np.newaxis],
+            sample_rate=sample_rate,
+            amplitude=amplitude,
+            duration=duration,
+            **kwargs,
+        )
+
+        samples: int = self._oscillator._time.size
+        samples_per_period: np.ndarray = sample_rate / self._frequencies
+        self.crop_lengths: np.ndarray = samples - np.round(
+            samples % samples_per_period
+        ).astype(np.intp)
+
+    def generate_waves(self, dtype: npt.DTypeLike = np.int16) -> np.ndarray:
+        """
+        Generates every note in one pass.
+
+        Args:
+            dtype: type of the returned samples, see Oscillator.generate_wave
+
+        Returns:
+            a (notes x samples) array. Row i is only valid up to crop_lengths[i].
+        """
+
+        return self._render().astype(dtype)
+
+    def cropped_waves(self, dtype: npt.DTypeLike = np.int16) -> list[np.ndarray]:
+        """Generates every note and returns each row cropped like generate_wave"""
+
+        waves: np.ndarray = self.generate_waves(dtype)
+        return [wave[:length] for wave, length in zip(waves, self.crop_lengths)]
+
+    def generate_chord(self, dtype: npt.DTypeLike = np.int16) -> np.ndarray:
+        """
+        Generates all notes mixed into one wave. Integer waves are clipped
+        to the range of their type, float waves are left for the output
+        stage to limit.
+        """
+
+        chord: np.ndarray = self._render().sum(axis=0)
+        if np.issubdtype(dtype, np.integer):
+            limit: int = np.iinfo(dtype).max
+            np.clip(chord, -limit, limit, out=chord)
+        return chord.astype(dtype)
+
+    def _render(self) -> np.ndarray:
+        """the float (notes x samples) waves, scaled by the amplitude"""
+
+        oscillator: Oscillator = self._oscillator
+        samples: np.ndarray = oscillator._time * oscillator._phase_increment
+        oscillator._wrap_phase(samples)
+        oscillator.waveshape(samples)
+        samples *= oscillator._amplitude
+        return samples
+
+
+# UNISON OSCILLATOR
+class UnisonOscillator(Oscillator):
+    """
+    Stacks several detuned copies of another oscillator into one thick sound
+    (a "supersaw" when used with a sawtooth). All voices are rendered by a
+    single inner oscillator built with a column of frequencies, so they are
+    computed and summed in one vectorized float pass per block instead of
+    running a separate oscillator for each voice.
+    """
+
+    def __init__(
+        self,
+        oscillator_class: type[Oscillator] = SawtoothOscillator,
+        voices: int = 7,
+        spread: float = 25.0,
+        frequency: float = 440.0,
+        sample_rate: int = 48000,
+        amplitude: float = np.iinfo(np.int16).max / 4,
+        duration: float = 1.0,
+        random_phase: bool = True,
+        seed: int | None = None,
+        **kwargs,
+    ) -> None:
+        """
+        Extends Oscillator.__init__
+
+        Args:
+            oscillator_class: the oscillator used for every voice
+            voices: number of voices
+            spread: total detune in cents, spread evenly from the lowest to the highest voice
+            random_phase: start every voice at a random phase, which avoids the
+                loud, phasey attack of voices that all start together
+            seed: seed for the random start phases
+            kwargs: extra arguments for the oscillator, e.g. table for WavetableOscillator
+        """
+
+        super().__init__(
+            frequency=frequency,
+            sample_rate=sample_rate,
+            amplitude=amplitude,
+            duration=duration,
+        )
+        self._voice_count: int = voices
+        detune: np.ndarray = np.linspace(-spread / 2, spread / 2, voices)
+        if voices == 1:
+            detune = np.zeros(1)
+        voice_frequencies: np.ndarray = frequency * np.power(2.0, detune / 1200.0)
+
+        self._voices: Oscillator = oscillator_class(
+            frequency=voice_frequencies[:, np.newaxis],
+            sample_rate=sample_rate,
+            amplitude=1.0,
+            duration=duration,
+            **kwargs,
+        )
+        if random_phase:
+            rng: np.random.Generator = np.random.default_rng(seed)
+            self._voices._phase = rng.random((voices, 1))
+        else:
+            self._voices._phase = np.zeros((voices, 1))
+        self._start_phase: np.ndarray = self._voices._phase.copy()
+
+        # uncorrelated voices add up in power, so scale by 1/sqrt(voices)
+        # to keep the loudness steady as voices are added
+        self._gain: float = self._amplitude / np.sqrt(voices)
+        self._voice_buffer: np.ndarray = np.empty((voices, 0))
+
+    def generate_block(self, frames: int, out: np.ndarray | None = None) -> np.ndarray:
+        """
+        Generates the next block of all voices mixed together, see
+        Oscillator.generate_block.
+        """
+
+        if self._voice_buffer.shape[1] < frames:
+            self._voice_buffer = np.empty((self._voice_count, frames))
+        voices: np.ndarray = self._voices.generate_block(
+            frames, out=self._voice_buffer[:, :frames]
+        )
+
+        if out is None:
+            out = np.empty(frames)
+        else:
+            out = out[:frames]
+        np.sum(voices, axis=0, out=out)
+        np.multiply(out, self._gain, out=out)
+        return out
+
+    def generate_wave(self, dtype: npt.DTypeLike = np.int16) -> np.ndarray:
+        """
+        Generates the mixed voices, cropped to the zero crossings of the center
+        frequency. Voices in phase can add up to sqrt(voices) times the amplitude,
+        so integer waves are clipped to the range of their type like
+        OscillatorBank.generate_chord.
+        """
+
+        phase: np.ndarray = self._voices._phase
+        self._voices._phase = self._start_phase.copy()
+        samples: np.ndarray = self.generate_block(self._time.size)
+        self._voices._phase = phase
+        if np.issubdtype(dtype, np.integer):
+            limit: int = np.iinfo(dtype).max
+            np.clip(samples, -limit, limit, out=samples)
+        return self.crop_samples(samples).astype(dtype)
+
+    def reset_phase(self, phase: float = 0.0) -> None:
+        """Restarts every voice at its start phase, offset by phase (in cycles)"""
 
-        return self.crop_samples(samples).astype(np.int16)
+        self._voices._phase = (self._start_phase + phase) % 1.0
@@ -0,0 +1,114 @@
+"""
+Offline rendering on several CPU cores. The work is split into parts that a
+pool of worker processes renders at the same time:
+
+- render_parallel() splits one render into time segments. Each worker moves the
+  voices on to the start of its segment without rendering what comes before
+  (see render.render), so the segments join into exactly the serial result.
+- render_batch() renders many independent jobs, such as one per patch or per
+  track. Tracks can then be mixed by adding their results.
+
+Every worker writes its part straight into one shared memory buffer, so only
+the notes and settings are sent to the workers and no audio is pickled on the
+way back.
+
+To use it, pass the same arguments as render.render() to render_parallel(), or a
+list of such argument dicts to render_batch(), with the number of workers.
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+import numpy.typing as npt
+from render import render, render_length, SAMPLE_RATE
+
+
+def _render_part(buffer_name: str, offset: int, size: int, job: dict) -> None:
+    """runs in a worker: renders one part into its place in the shared buffer"""
+    buffer = shared_memory.SharedMemory(name=buffer_name)
+    out = np.ndarray(size, np.float32, buffer=buffer.buf, offset=offset * 4)
+    try:
+        render(out=out, **job)
+    finally:
+        del out  # the buffer cannot be closed while a view of it exists
+        buffer.close()
+
+
+def _render_parts(
+    parts: list[tuple[int, int, dict]], total: int, workers: int | None
+) -> npt.NDArray[np.float32]:
+    """
+    Renders (offset, size, render arguments) parts into one shared buffer of
+    total samples using a pool of worker processes, and returns a copy of it.
+    """
+    buffer = shared_memory.SharedMemory(create=True, size=max(total, 1) * 4)
+    try:
+        with ProcessPoolExecutor(workers) as pool:
+            futures = [
+                pool.submit(_render_part, buffer.name, offset, size, job)
+                for offset, size, job in parts
+            ]
+            for future in futures:
+                future.result()  # raises any error from the worker
+        shared = np.ndarray(total, np.float32, buffer=buffer.buf)
+        result: npt.NDArray[np.float32] = shared.copy()
+        del shared
+    finally:
+        buffer.close()
+        buffer.unlink()
+    return result
+
+
+def render_parallel(
+    notes: list, workers: int | None = None, segments: int | None = None, **settings
+) -> npt.NDArray[np.float32]:
+    """
+    Renders notes like render.render(), split into time segments rendered by
+    separate processes. The result is the same as the serial render.
+
+    Args:
+        notes: the notes to play
+        workers: number of worker processes, the number of CPUs if None
+        segments: number of time segments, the number of workers if None
+        settings: the other arguments of render.render()
+
+    Returns:
+        the rendered samples
+    """
+    workers = workers or os.cpu_count() or 1
+    segments = segments or workers
+    total: int = render_length(
+        notes, settings.get("sample_rate", SAMPLE_RATE), settings.get("envelope")
+    )
+    bounds: list[int] = [round(total * i / segments) for i in range(segments + 1)]
+    parts: list[tuple[int, int, dict]] = [
+        (first, last - first, dict(settings, notes=notes, first=first, last=last))
+        for first, last in zip(bounds[:-1], bounds[1:])
+        if last > first
+    ]
+    return _render_parts(parts, total, workers)
+
+
+def render_batch(
+    jobs: list[dict], workers: int | None = None
+) -> list[npt.NDArray[np.float32]]:
+    """
+    Renders many independent jobs, each one a dict of render.render() arguments,
+    in separate processes.
+
+    Returns:
+        the rendered samples of each job, in order
+    """
+    sizes: list[int] = [
+        render_length(
+            job["notes"], job.get("sample_rate", SAMPLE_RATE), job.get("envelope")
+        )
+        for job in jobs
+    ]
+    offsets: list[int] = [0]
+    for size in sizes:
+        offsets.append(offsets[-1] + size)
+    result = _render_parts(list(zip(offsets, sizes, jobs)), offsets[-1], workers)
+    return [result[offset : offset + size] for offset, size in zip(offsets, sizes)]
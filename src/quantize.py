@@ -0,0 +1,61 @@
+"""
+The signal path works on float32 samples between -1 and 1. The to_int16 function
+is the single point where those samples are converted for the int16 output
+stream: it clips, optionally adds dither, and rounds to the nearest step.
+
+To use it, pass the final float block (after the envelope and volume) to to_int16(),
+optionally with a preallocated int16 out buffer and float32 scratch buffers, and
+write the result to the stream.
+"""
+
+import numpy as np
+import numpy.typing as npt
+
+INT16_SCALE: float = float(np.iinfo(np.int16).max)
+
+_rng: np.random.Generator = np.random.default_rng()
+
+
+def to_int16(
+    samples: npt.NDArray[np.floating],
+    dither: bool = False,
+    out: npt.NDArray[np.int16] | None = None,
+    scratch: npt.NDArray[np.float32] | None = None,
+    noise: npt.NDArray[np.float32] | None = None,
+) -> npt.NDArray[np.int16]:
+    """
+    Converts float samples between -1 and 1 to int16. With out, scratch and (when
+    dithering) noise all given, nothing is allocated, so it can run in the audio
+    callback.
+
+    Args:
+        samples: the float block to convert, left unchanged
+        dither: add triangular (TPDF) dither of +-1 step before rounding,
+            which turns quantization distortion of quiet signals into noise
+        out: optional int16 buffer of the same length to write into
+        scratch: optional float32 buffer, at least as long as samples, for the
+            scaled samples
+        noise: optional float32 buffer, at least as long as samples, for the dither
+
+    Returns:
+        the int16 block
+    """
+    frames: int = len(samples)
+    if scratch is None:
+        scaled: np.ndarray = np.multiply(samples, INT16_SCALE, dtype=np.float32)
+    else:
+        scaled = scratch[:frames]
+        np.multiply(samples, INT16_SCALE, out=scaled, dtype=np.float32)
+    if dither:
+        noise = np.empty(frames, dtype=np.float32) if noise is None else noise[:frames]
+        _rng.random(dtype=np.float32, out=noise)
+        scaled += noise
+        _rng.random(dtype=np.float32, out=noise)
+        scaled -= noise
+    np.clip(scaled, -INT16_SCALE, INT16_SCALE, out=scaled)
+    np.rint(scaled, out=scaled)
+
+    if out is None:
+        return scaled.astype(np.int16)
+    np.copyto(out, scaled, casting="unsafe")
+    return out
@@ -0,0 +1,375 @@
+"""
+Headless rendering of a list of notes or a MIDI file to a WAV file, without a
+GUI or a sound device. The notes go through the same wavetable oscillators,
+voice pool, ADSR envelope and volume as when playing live, but in large blocks
+and as fast as the CPU allows.
+
+To render from Python, follow these steps:
+
+1. Make a list of Note objects, or read one with read_midi() or read_notes().
+2. Pass it to render(), optionally with the waveform, an ADSREnvelope and a Volume
+holding the settings to use. It returns the float32 samples.
+3. Save the samples with write_wav().
+
+To render from the command line, run within src/:
+
+    python render.py song.mid -o song.wav
+    python render.py notes.json -o notes.wav --waveform sawtooth
+
+where notes.json is a list like [{"note": "A4", "start": 0.0, "duration": 0.5}].
+The realtime factor (seconds of audio per second of rendering) is printed.
+"""
+
+import argparse
+import json
+import struct
+import sys
+import time
+import wave
+from dataclasses import dataclass
+
+import numpy as np
+import numpy.typing as npt
+from oscillator import WavetableOscillator
+from adsr import ADSREnvelope
+from volume import Volume
+from engine import AudioEngine
+from notefreq import NOTE_FREQS
+from quantize import to_int16
+from voices import DEFAULT_VOICES
+from defaults import (
+    SAMPLE_RATE,
+    MAX_AMPLITUDE,
+    DEFAULT_VOLUME,
+    DEFAULT_VOLUME_OFFSET,
+    DEFAULT_ATTACK,
+    DEFAULT_DECAY,
+    DEFAULT_SUSTAIN,
+    DEFAULT_RELEASE,
+    WAVEFORMS,
+)
+
+RENDER_BLOCKSIZE: int = 4096
+
+# fmt: off
+NOTE_NAMES: list[str] = ["C", "C#", "D", "D#", "E", "F", "F#", "G", "G#", "A", "A#", "B"]
+# fmt: on
+
+
+@dataclass(frozen=True)
+class Note:
+    """
+    One note to render.
+
+    Attributes:
+        note: name of the note, e.g. "A4" (see notefreq.py)
+        start: when the key is pressed, in seconds
+        duration: how long the key is held, in seconds
+    """
+
+    note: str
+    start: float
+    duration: float
+
+
+def note_name(number: int) -> str:
+    """the name of a MIDI note number, where 60 is "C4" """
+    return NOTE_NAMES[number % 12] + str(number // 12 - 1)
+
+
+def read_notes(path: str) -> list[Note]:
+    """reads a JSON list of {"note", "start", "duration"} objects"""
+    with open(path) as file:
+        return [
+            Note(item["note"], item["start"], item["duration"])
+            for item in json.load(file)
+        ]
+
+
+def _read_variable_length(data: bytes, pos: int) -> tuple[int, int]:
+    """reads a MIDI variable-length quantity, returns it and the position after it"""
+    value: int = 0
+    while True:
+        byte: int = data[pos]
+        pos += 1
+        value = (value << 7) | (byte & 0x7F)
+        if byte < 0x80:
+            return value, pos
+
+
+def _read_track(
+    data: bytes,
+) -> tuple[list[tuple[int, bool, int]], list[tuple[int, int]], int]:
+    """
+    Reads the events of one MIDI track.
+
+    Returns:
+        note events as (tick, is note on, note number), tempo changes as
+        (tick, microseconds per quarter note), and the tick the track ends on
+    """
+    notes: list[tuple[int, bool, int]] = []
+    tempos: list[tuple[int, int]] = []
+    pos: int = 0
+    tick: int = 0
+    status: int = 0
+    while pos < len(data):
+        delta, pos = _read_variable_length(data, pos)
+        tick += delta
+        if data[pos] & 0x80:
+            status = data[pos]
+            pos += 1
+        # otherwise running status: the data bytes follow the previous status
+
+        if status == 0xFF:  # meta event
+            kind: int = data[pos]
+            length, pos = _read_variable_length(data, pos + 1)
+            if kind == 0x51:
+                tempos.append((tick, int.from_bytes(data[pos : pos + 3], "big")))
+            elif kind == 0x2F:
+                break
+            pos += length
+        elif status in (0xF0, 0xF7):  # system exclusive
+            length, pos = _read_variable_length(data, pos)
+            pos += length
+        elif status & 0xF0 in (0x80, 0x90):
+            number, velocity = data[pos], data[pos + 1]
+            notes.append((tick, status & 0xF0 == 0x90 and velocity > 0, number))
+            pos += 2
+        elif status & 0xF0 in (0xC0, 0xD0):
+            pos += 1
+        else:
+            pos += 2
+    return notes, tempos, tick
+
+
+def read_midi(path: str) -> list[Note]:
+    """
+    Reads the notes of a standard MIDI file (format 0 or 1), on all tracks and
+    channels, with tempo changes applied. Notes outside the range of notefreq.py
+    are left out.
+    """
+    with open(path, "rb") as file:
+        data: bytes = file.read()
+    if data[:4] != b"MThd":
+        raise ValueError("not a MIDI file: " + path)
+    header_length, _, track_count, division = struct.unpack(">IHHH", data[4:14])
+
+    events: list[tuple[int, bool, int]] = []
+    tempos: list[tuple[int, int]] = []
+    last_tick: int = 0
+    pos: int = 8 + header_length
+    for _ in range(track_count):
+        chunk, length = struct.unpack(">4sI", data[pos : pos + 8])
+        if chunk == b"MTrk":
+            track = _read_track(data[pos + 8 : pos + 8 + length])
+            events += track[0]
+            tempos += track[1]
+            last_tick = max(last_tick, track[2])
+        pos += 8 + length
+
+    if division & 0x8000:  # SMPTE: frames per second and ticks per frame
+        frames_per_second: int = -struct.unpack(">b", bytes([division >> 8]))[0]
+        ticks_per_second: float = frames_per_second * (division & 0xFF)
+
+        def seconds(tick: int) -> float:
+            return tick / ticks_per_second
+
+    else:
+        # seconds at each tempo change, so any tick converts with one lookup
+        changes: list[tuple[int, float, float]] = [(0, 0.0, 0.5 / division)]
+        for tick, tempo in sorted(tempos):
+            previous_tick, previous_seconds, per_tick = changes[-1]
+            elapsed: float = previous_seconds + (tick - previous_tick) * per_tick
+            changes.append((tick, elapsed, tempo / 1e6 / division))
+
+        def seconds(tick: int) -> float:
+            for change_tick, change_seconds, per_tick in reversed(changes):
+                if tick >= change_tick:
+                    return change_seconds + (tick - change_tick) * per_tick
+            return 0.0
+
+    notes: list[Note] = []
+    held: dict[int, list[int]] = {}
+    # sorted by tick, keeping the file order on the same tick: a note on and off
+    # on one tick make a short note, and an off before an on ends the held note
+    for tick, note_on, number in sorted(events, key=lambda event: event[0]):
+        if note_on:
+            held.setdefault(number, []).append(tick)
+        elif held.get(number):
+            start: int = held[number].pop(0)
+            begin: float = seconds(start)
+            notes.append(Note(note_name(number), begin, seconds(tick) - begin))
+    for number, starts in held.items():  # never released: hold to the last tick
+        for start in starts:
+            begin = seconds(start)
+            notes.append(Note(note_name(number), begin, seconds(last_tick) - begin))
+
+    notes = [note for note in notes if note.note in NOTE_FREQS]
+    notes.sort(key=lambda note: note.start)
+    return notes
+
+
+def default_envelope(sample_rate: int = SAMPLE_RATE) -> ADSREnvelope:
+    """an envelope with the GUI's default settings"""
+    return ADSREnvelope(
+        DEFAULT_ATTACK, DEFAULT_DECAY, DEFAULT_SUSTAIN, DEFAULT_RELEASE, sample_rate
+    )
+
+
+def note_events(notes: list[Note], sample_rate: int) -> list[tuple[int, int, str]]:
+    """
+    The key presses and releases of notes as (frame, 0 for release or 1 for
+    press, note), in order, with releases first on the same frame. Every note
+    is held for at least one frame, so it is never released before it is pressed.
+    """
+    events: list[tuple[int, int, str]] = []
+    for note in notes:
+        start: int = round(note.start * sample_rate)
+        stop: int = max(start + 1, round((note.start + note.duration) * sample_rate))
+        events.append((start, 1, note.note))
+        events.append((stop, 0, note.note))
+    events.sort()
+    return events
+
+
+def render_length(
+    notes: list[Note],
+    sample_rate: int = SAMPLE_RATE,
+    envelope: ADSREnvelope | None = None,
+) -> int:
+    """the number of samples render() returns: up to the end of the last release"""
+    if envelope is None:
+        envelope = default_envelope(sample_rate)
+    events: list[tuple[int, int, str]] = note_events(notes, sample_rate)
+    end: int = events[-1][0] if events else 0
+    return end + envelope.params.release_samples
+
+
+def render(
+    notes: list[Note],
+    waveform: str = "sine",
+    sample_rate: int = SAMPLE_RATE,
+    blocksize: int = RENDER_BLOCKSIZE,
+    voices: int = DEFAULT_VOICES,
+    envelope: ADSREnvelope | None = None,
+    volume: Volume | None = None,
+    first: int = 0,
+    last: int | None = None,
+    out: npt.NDArray[np.float32] | None = None,
+) -> npt.NDArray[np.float32]:
+    """
+    Renders notes to float32 samples. Key presses and releases land on the exact
+    sample; the output ends when the last release has faded out (render_length).
+
+    A part of the output can be rendered on its own with first and last. The
+    voices are moved on to first without rendering what comes before, so the
+    part has the same samples as the same range of the whole render.
+
+    Args:
+        notes: the notes to play
+        waveform: "sine", "square", "sawtooth" or "triangle"
+        sample_rate: speed that samples are rendered in cycles per second (hertz)
+        blocksize: the most frames rendered at once
+        voices: the most notes that can sound at once
+        envelope: ADSR settings to use, the GUI defaults if None
+        volume: volume to use, the GUI default if None
+        first: the first sample to render
+        last: the sample to stop before, the end of the render if None
+        out: optional float32 buffer with room for last - first samples
+
+    Returns:
+        the rendered samples
+    """
+    if waveform not in WAVEFORMS:
+        raise ValueError("unknown waveform: " + waveform)
+    if envelope is None:
+        envelope = default_envelope(sample_rate)
+    if volume is None:
+        volume = Volume(DEFAULT_VOLUME, DEFAULT_VOLUME_OFFSET)
+    engine = AudioEngine(envelope, volume, sample_rate, blocksize, voices)
+
+    table = WavetableOscillator.create_table(WAVEFORMS[waveform])
+
+    length: int = render_length(notes, sample_rate, envelope)
+    last = length if last is None else min(last, length)
+    first = min(first, last)
+    if out is None:
+        out = np.zeros(last - first, dtype=np.float32)
+    else:
+        out = out[: last - first]
+        out[:] = 0
+
+    def render_to(stop: int) -> None:
+        """renders from pos to stop, skipping what comes before first"""
+        nonlocal pos
+        if pos < first:
+            engine.skip(min(stop, first) - pos)
+            pos = min(stop, first)
+        while pos < stop:
+            frames: int = min(blocksize, stop - pos)
+            out[pos - first : pos - first + frames] = engine.render(frames)
+            pos += frames
+
+    pos: int = 0
+    for frame, press, name in note_events(notes, sample_rate):
+        if frame >= last:
+            break
+        render_to(frame)
+        if press:
+            engine.note_on(name, table, NOTE_FREQS[name], MAX_AMPLITUDE)
+        else:
+            engine.note_off(name)
+
+    # the release tail, until every voice is idle; the rest of out stays silent
+    while pos < last:
+        render_to(min(pos + blocksize, last) if pos >= first else first)
+        if engine.voices.active_count == 0:
+            break
+    return out
+
+
+def write_wav(
+    path: str, samples: npt.NDArray[np.floating], sample_rate: int = SAMPLE_RATE
+) -> None:
+    """writes float samples between -1 and 1 to a mono 16-bit WAV file"""
+    with wave.open(path, "wb") as file:
+        file.setnchannels(1)
+        file.setsampwidth(2)
+        file.setframerate(sample_rate)
+        file.writeframes(to_int16(samples).astype("<i2").tobytes())
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Render notes to a WAV file without a GUI"
+    )
+    parser.add_argument("input", help="a MIDI file (.mid) or a JSON list of notes")
+    parser.add_argument("-o", "--output", required=True, help="WAV file to write")
+    parser.add_argument("--waveform", default="sine", choices=list(WAVEFORMS))
+    parser.add_argument("--sample-rate", type=int, default=SAMPLE_RATE)
+    parser.add_argument("--blocksize", type=int, default=RENDER_BLOCKSIZE)
+    parser.add_argument("--voices", type=int, default=DEFAULT_VOICES)
+    args = parser.parse_args(argv)
+
+    if args.input.lower().endswith((".mid", ".midi")):
+        notes: list[Note] = read_midi(args.input)
+    else:
+        notes = read_notes(args.input)
+
+    started: float = time.perf_counter()
+    samples = render(
+        notes, args.waveform, args.sample_rate, args.blocksize, args.voices
+    )
+    elapsed: float = time.perf_counter() - started
+    write_wav(args.output, samples, args.sample_rate)
+
+    seconds: float = len(samples) / args.sample_rate
+    print(
+        f"rendered {seconds:.2f} s of audio in {elapsed:.3f} s "
+        f"({seconds / max(elapsed, 1e-9):.1f}x realtime) to {args.output}"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,137 @@
+"""
+The RingBuffer class hands audio from one thread to another without locks, so
+rendering can run ahead in its own thread while the sound device callback only
+copies out finished blocks and never waits or allocates.
+
+It is a single-producer, single-consumer queue over a preallocated NumPy array.
+The write index is only changed by the producer and the read index only by the
+consumer. Each side copies its samples first and then publishes them with one
+assignment to its index, so the other side never sees a half-written block.
+Indices count samples since the start and only grow; the position in the array
+is the index modulo the capacity.
+
+To use the RingBuffer class, follow these steps:
+
+1. Create an instance with a capacity of a few blocks.
+2. In the producer thread, call write() with each rendered block, or fill the
+views from writable_views() and call advance_write(). Both return or take how
+many samples fit, so the producer can wait and retry when the buffer is full.
+3. In the consumer thread, call read() with the output block; missing samples are
+filled with silence and counted as an underrun. readable_views() and advance_read()
+give the same zero-copy access as on the producer side.
+"""
+
+import numpy as np
+import numpy.typing as npt
+
+
+class RingBuffer:
+    """
+    Lock-free single-producer, single-consumer buffer of samples.
+
+    Attributes:
+        capacity: the most samples the buffer can hold
+        dtype: type of the samples
+    """
+
+    def __init__(self, capacity: int, dtype: npt.DTypeLike = np.float32) -> None:
+        if capacity <= 0:
+            raise ValueError("ring buffer capacity must be positive")
+        self._buffer: np.ndarray = np.zeros(capacity, dtype=dtype)
+        self._capacity: int = capacity
+        self._write_index: int = 0  # only changed by the producer
+        self._read_index: int = 0  # only changed by the consumer
+        self.underruns: int = 0  # reads that found fewer samples than asked for
+        self.overruns: int = 0  # writes that found less room than needed
+        self.peak_occupancy: int = 0  # most samples buffered seen by the producer
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    @property
+    def occupancy(self) -> int:
+        """samples written and not yet read"""
+        return self._write_index - self._read_index
+
+    @property
+    def free(self) -> int:
+        """room left for writing, in samples"""
+        return self._capacity - self.occupancy
+
+    def _views(self, index: int, count: int) -> tuple[np.ndarray, np.ndarray]:
+        """the one or two slices of the array holding count samples from index"""
+        start: int = index % self._capacity
+        end: int = start + count
+        if end <= self._capacity:
+            return self._buffer[start:end], self._buffer[:0]
+        return self._buffer[start:], self._buffer[: end - self._capacity]
+
+    def writable_views(self, frames: int) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Views of the room for the next frames samples, or less if the buffer is
+        fuller than that. The second view is empty unless the room wraps around.
+        Fill them and then call advance_write() with the number of samples written.
+        """
+        return self._views(self._write_index, min(frames, self.free))
+
+    def advance_write(self, count: int) -> None:
+        """publishes count samples written into the views from writable_views()"""
+        write_index: int = self._write_index + count
+        self._write_index = write_index
+        occupancy: int = write_index - self._read_index
+        if occupancy > self.peak_occupancy:
+            self.peak_occupancy = occupancy
+
+    def readable_views(self, frames: int) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Views of the next frames buffered samples, or fewer if fewer are buffered.
+        The second view is empty unless the samples wrap around. Call advance_read()
+        once they have been used.
+        """
+        return self._views(self._read_index, min(frames, self.occupancy))
+
+    def advance_read(self, count: int) -> None:
+        """frees count samples read from the views from readable_views()"""
+        self._read_index += count
+
+    def write(self, samples: np.ndarray) -> int:
+        """
+        Copies as many samples as fit into the buffer.
+
+        Returns:
+            the number of samples written, less than len(samples) if the buffer
+            was too full, which is counted as an overrun
+        """
+        first, second = self.writable_views(len(samples))
+        count: int = len(first) + len(second)
+        first[:] = samples[: len(first)]
+        second[:] = samples[len(first) : count]
+        if count < len(samples):
+            self.overruns += 1
+        self.advance_write(count)
+        return count
+
+    def read(self, out: np.ndarray) -> int:
+        """
+        Fills out with the next samples. If fewer are buffered, the rest of out
+        is filled with silence and an underrun is counted.
+
+        Returns:
+            the number of buffered samples copied into out
+        """
+        first, second = self.readable_views(len(out))
+        count: int = len(first) + len(second)
+        out[: len(first)] = first
+        out[len(first) : count] = second
+        if count < len(out):
+            out[count:] = 0
+            self.underruns += 1
+        self.advance_read(count)
+        return count
+
+    def reset_counters(self) -> None:
+        """clears the underrun, overrun and peak occupancy counters"""
+        self.underruns = 0
+        self.overruns = 0
+        self.peak_occupancy = 0
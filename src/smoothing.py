@@ -0,0 +1,137 @@
+"""
+The SmoothedValue class moves a parameter to a new value over a short ramp
+instead of in one step, which avoids the zipper noise and clicks of sudden
+gain or level changes.
+
+It is written for one thread setting the target (the GUI) and one thread
+reading blocks (audio) without any locks: set_target() only replaces a single
+float reference, and next_block() reads it once at the start of each block.
+
+To use it, create an instance with the starting value and the ramp length in
+samples, call set_target() when the knob moves, and multiply each audio block
+by the result of next_block().
+"""
+
+import numpy as np
+import numpy.typing as npt
+
+DEFAULT_RAMP_SAMPLES: int = 480  # 10 ms at 48 kHz
+
+
+class SmoothedValue:
+    """
+    A parameter that glides linearly to each new target over ramp_samples samples.
+
+    Attributes:
+        value: the starting value
+        ramp_samples: length of the glide to a new target, 0 to jump immediately
+    """
+
+    def __init__(self, value: float, ramp_samples: int = DEFAULT_RAMP_SAMPLES) -> None:
+        self._target: float = value  # written by the setting thread
+        self._current: float = value  # only used by the reading thread
+        self._ramp_target: float = value
+        self._ramp_samples: int = ramp_samples
+        # the glide in progress: value = start + step * elapsed, computed from
+        # the start of the glide so it does not depend on the block sizes
+        self._start: float = value
+        self._elapsed: int = 0
+        self._remaining: int = 0
+        self._step: float = 0.0
+        self._ramp: npt.NDArray[np.float64] = np.arange(1, 1, dtype=np.float64)
+        self._buffer: npt.NDArray[np.float64] = np.empty(0)  # blocks without out
+
+    @property
+    def target(self) -> float:
+        """the value being moved to"""
+        return self._target
+
+    @property
+    def current(self) -> float:
+        """the value reached at the end of the last block"""
+        return self._current
+
+    def set_target(self, value: float) -> None:
+        """start moving to a new value at the next block, safe from any thread"""
+        self._target = value
+
+    def next_block(
+        self, frames: int, out: npt.NDArray[np.float64] | None = None
+    ) -> float | npt.NDArray[np.float64]:
+        """
+        Advances the value by one block.
+
+        Returns:
+            the value as a float when it is steady for the whole block, which
+            lets callers keep their scalar fast path, or an array of frames
+            values while ramping. Without out, the array is a view of an
+            internal buffer, only valid until the next call.
+        """
+        target: float = self._target  # read once, the setter may change it meanwhile
+        if target != self._ramp_target:
+            self._start_ramp(target)
+
+        if self._remaining == 0:
+            return self._current
+
+        # sized to the largest block seen, so a glide allocates nothing once
+        # the first block of that size has gone by
+        if self._ramp.size < frames:
+            self._ramp = np.arange(1, frames + 1, dtype=np.float64)
+            self._buffer = np.empty(frames)
+        if out is None:
+            out = self._buffer
+        out = out[:frames]
+
+        count: int = min(frames, self._remaining)
+        np.add(self._ramp[:count], self._elapsed, out=out[:count])
+        np.multiply(out[:count], self._step, out=out[:count])
+        out[:count] += self._start
+        out[count:] = target
+        self._move(target, count)
+        return out
+
+    def next_value(self) -> float:
+        """
+        Advances the value by one sample, for per-sample processing. A run of
+        calls follows the same glide as next_block() over the same samples.
+        """
+        target: float = self._target
+        if target != self._ramp_target:
+            self._start_ramp(target)
+
+        if self._remaining > 0:
+            self._move(target, 1)
+        return self._current
+
+    def skip(self, frames: int) -> None:
+        """
+        Advances the value by frames samples without computing them, leaving it
+        where next_block() would.
+        """
+        target: float = self._target
+        if target != self._ramp_target:
+            self._start_ramp(target)
+        if self._remaining > 0:
+            self._move(target, min(frames, self._remaining))
+
+    def _start_ramp(self, target: float) -> None:
+        """begins the glide from the current value to a new target"""
+        self._ramp_target = target
+        if self._ramp_samples > 0:
+            self._start = self._current
+            self._elapsed = 0
+            self._remaining = self._ramp_samples
+            self._step = (target - self._current) / self._ramp_samples
+        else:
+            self._remaining = 0
+            self._current = target
+
+    def _move(self, target: float, count: int) -> None:
+        """moves count samples along the glide, count at most what remains"""
+        self._elapsed += count
+        self._remaining -= count
+        if self._remaining == 0:
+            self._current = target
+        else:
+            self._current = self._start + self._step * self._elapsed
@@ -1,44 +1,12 @@
 from PySide6.QtCore import QObject, QRunnable, Slot, Signal
 import pygame
 from midi_detect import receive_input
+from midi_input import MidiReader
 
-#Thread Worker
-class Worker(QRunnable):
-    """
-    The Worker class is a helper class used to execute audio processing tasks in a separate thread, preventing GUI
-    blocking while running these tasks.
-
-    This class extends the QRunnable class, making it suitable for use with Qt's concurrent framework for concurrent
-    execution.
-
-    Args:
-        fn (callable): The function to be executed in the separate thread.
-        *args: Positional arguments to be passed to the function.
-        **kwargs: Keyword arguments to be passed to the function.
-    """
-    def __init__(self, fn, *args, **kwargs) -> None:
-        """
-        Initialize a Worker instance.
+NOTE_OFF: int = 0x80
+NOTE_ON: int = 0x90
 
-        Args:
-            fn (callable): The function to be executed in the separate thread.
-            *args: Positional arguments to be passed to the function.
-            **kwargs: Keyword arguments to be passed to the function.
-        """
-        super(Worker, self).__init__()
-        self.fn = fn
-        self.args = args
-        self.kwargs = kwargs
 
-    @Slot()  # QtCore.Slot
-    def run(self) -> None:
-        """
-        Execute the specified function in a separate thread.
-
-        This method is automatically called when the Worker is started within a QThreadPool.
-        It runs the specified function with the provided arguments.
-        """
-        self.fn(self.args[0])
 class MidiWorker(QObject):
     """
     The MidiWorker class manages MIDI input functionality in a separate thread.
@@ -99,26 +67,41 @@ class MidiInputWorker(QRunnable):
 
         self.input_device = input_device
         self.main_widget = main_widget
+        self.reader: MidiReader = receive_input(input_device)
+
+    def stop(self) -> None:
+        """
+        Stop the MIDI input processing loop. run() returns within one poll interval, so the thread pool
+        can finish when the application closes.
+        """
+        self.reader.stop()
 
     @Slot()
     def run(self) -> None:
         """
         Run the MIDI input processing loop.
 
-        This method continuously processes incoming MIDI messages, specifically note-on and note-off messages.
-        When a note-on message is received, it triggers the generation of a tone in the synthesizer based on the
-        note value. When a note-off message is received, it releases the previously played tone.
+        This method processes incoming MIDI messages until stop() is called, specifically note-on and note-off
+        messages.
+        When a note-on message is received, it plays the note mapped to its note number in the synthesizer and
+        remembers which note that was. When a note-off message (or a note-on with velocity 0) is received, it
+        releases only the note that note number started, so other held notes keep sounding.
         """
-        for msg in receive_input(self.input_device):
-            if msg["status"] == 144:  # This is the note on message
-                note_value = msg["note"]
-                if note_value >= 12 and note_value < 122:
-                    try:
-                        note_name: str = self.main_widget.pitch_shifted_keys[note_value - 24]
-                        print("MIDI KEY NOTE PLAYED:", note_name)
-                        self.main_widget.button_pressed_handler(note_name)
-                    except IndexError:
-                        print("Note value is out of range. Ignoring MIDI message.")
-
-            elif msg["status"] == 128:  # note off message
-                self.main_widget.button_released_handler()
+        held_notes: dict[int, str] = {}  # note name played for every held MIDI note number
+        for msg in self.reader:
+            status: int = msg["status"] & 0xF0  # ignore the channel
+            note_value: int = msg["note"]
+            if status == NOTE_ON and msg["velocity"] > 0:
+                index: int = note_value - 24
+                if 0 <= index < len(self.main_widget.pitch_shifted_keys):
+                    note_name: str = self.main_widget.pitch_shifted_keys[index]
+                    print("MIDI KEY NOTE PLAYED:", note_name)
+                    held_notes[note_value] = note_name
+                    self.main_widget.play_note(note_name)
+                else:
+                    print("Note value is out of range. Ignoring MIDI message.")
+
+            elif status in (NOTE_ON, NOTE_OFF):  # note off message
+                released: str | None = held_notes.pop(note_value, None)
+                if released is not None:
+                    self.main_widget.release_note(released)
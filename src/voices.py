@@ -0,0 +1,248 @@
+"""
+The VoicePool class lets several notes sound at once. It has a fixed number of
+voices; each one plays a single-cycle wavetable at the frequency of its note
+through its own envelope, and every block all voices are generated and mixed
+together with a few NumPy operations, so the cost of a block depends on the
+number of voices and not on how fast keys are played.
+
+Like Oscillator.generate_block, every voice keeps its phase from one block to the
+next, so a held note is one continuous wave with no loop point to click at. The
+tables are copied into rows allocated when the pool is built, so starting a note
+in the audio thread allocates nothing.
+
+When a note is played:
+- if the same note is already sounding, its voice is retriggered
+- otherwise a free voice is used
+- if every voice is busy, one is stolen: the one started first ("oldest")
+  or the one with the lowest envelope level ("quietest")
+
+Held notes are indexed by name, so releasing a note finds its voice in constant
+time and never touches the other voices. A stolen voice drops out of the index,
+so releasing the note it used to play does not cut the note that took it over.
+
+To use the VoicePool class, follow these steps:
+
+1. Create an instance with the number of voices, the stealing policy, the sample
+rate and the usual block size.
+2. Call note_on() with the note name, its wavetable, frequency and amplitude, and
+note_off() with the note name when it is released.
+3. Call render() for every block with the ADSRParams to apply; it returns the mix.
+
+The pool is not thread-safe: it belongs to the audio thread, see AudioEngine.
+"""
+
+import numpy as np
+import numpy.typing as npt
+from adsr import ADSRParams, EnvelopeBank
+from oscillator import WAVETABLE_SIZE
+
+DEFAULT_VOICES: int = 8
+STEAL_POLICIES: tuple[str, ...] = ("oldest", "quietest")
+
+
+class VoicePool:
+    """
+    A fixed set of voices that notes are allocated to.
+
+    Attributes:
+        voices: the most notes that can sound at once
+        steal: which voice a new note takes when all are busy, "oldest" or "quietest"
+        sample_rate: speed that samples are rendered in cycles per second (hertz)
+        blocksize: frames per block that the buffers are allocated for; longer
+            blocks still work, but allocate the first time
+        table_size: the largest wavetable a note can use
+    """
+
+    def __init__(
+        self,
+        voices: int = DEFAULT_VOICES,
+        steal: str = "oldest",
+        sample_rate: int = 48000,
+        blocksize: int = 256,
+        table_size: int = WAVETABLE_SIZE,
+    ) -> None:
+        if steal not in STEAL_POLICIES:
+            raise ValueError("unknown voice stealing policy: " + steal)
+        self._steal: str = steal
+        self._sample_rate: int = sample_rate
+        self.envelopes: EnvelopeBank = EnvelopeBank(voices)
+        self.notes: list[str | None] = [None] * voices
+        self._held: dict[str, int] = {}  # voice of every note not yet released
+
+        # one table per voice, with its first sample repeated after its end so
+        # interpolation never wraps, read through flat indices in a single gather
+        self._table_size: int = table_size
+        self._tables: npt.NDArray[np.float64] = np.zeros((voices, table_size + 1))
+        self._row_starts: npt.NDArray[np.intp] = (
+            np.arange(voices, dtype=np.intp)[:, np.newaxis] * (table_size + 1)
+        )
+        self._sizes: npt.NDArray[np.float64] = np.ones(voices)  # entries per table
+        self._increments: npt.NDArray[np.float64] = np.zeros(voices)  # cycles/sample
+        # samples played since each note started: the phase is computed from
+        # it, so it does not depend on the block sizes (see SmoothedValue)
+        self._elapsed: npt.NDArray[np.float64] = np.zeros(voices)
+        self._amplitudes: npt.NDArray[np.float64] = np.zeros(voices)
+        self._started: npt.NDArray[np.int64] = np.zeros(voices, dtype=np.int64)
+        self._note_count: int = 0
+        self._allocate_blocks(blocksize)
+
+    def _allocate_blocks(self, frames: int) -> None:
+        """the (voices x frames) buffers a block is computed in"""
+        voices: int = self.voice_count
+        self._ramp: npt.NDArray[np.float64] = np.arange(frames, dtype=np.float64)
+        self._position: npt.NDArray[np.float64] = np.empty((voices, frames))
+        self._index: npt.NDArray[np.intp] = np.empty((voices, frames), dtype=np.intp)
+        self._samples: npt.NDArray[np.float64] = np.empty((voices, frames))
+        self._upper: npt.NDArray[np.float64] = np.empty((voices, frames))
+        self._gains: npt.NDArray[np.float64] = np.empty((voices, frames))
+
+    @property
+    def voice_count(self) -> int:
+        return len(self.notes)
+
+    @property
+    def table_size(self) -> int:
+        return self._table_size
+
+    @property
+    def active_count(self) -> int:
+        """how many voices are sounding"""
+        return int(np.count_nonzero(self.envelopes.active()))
+
+    def allocate(self, note: str) -> int:
+        """picks the voice for a new note, see the module docstring"""
+        active: npt.NDArray[np.bool_] = self.envelopes.active()
+        for voice, playing in enumerate(self.notes):
+            if playing == note and active[voice]:
+                return voice
+        if not active.all():
+            return int(np.argmin(active))
+        if self._steal == "quietest":
+            return int(np.argmin(self.envelopes.level))
+        return int(np.argmin(self._started))
+
+    def note_on(
+        self,
+        note: str,
+        table: npt.NDArray[np.floating],
+        frequency: float,
+        amplitude: float = 1.0,
+    ) -> int:
+        """
+        starts a note on the voice picked by allocate(), from the start of its cycle
+
+        Args:
+            note: name of the note, e.g. "A4"
+            table: a single cycle of the wave, at most table_size samples
+            frequency: the pitch of the note in hertz
+            amplitude: the peak level of the note
+
+        Returns:
+            the voice playing the note
+        """
+        if len(table) > self._table_size:
+            raise ValueError(f"wavetables can have at most {self._table_size} samples")
+        voice: int = self.allocate(note)
+        row: npt.NDArray[np.float64] = self._tables[voice]
+        row[: len(table)] = table
+        row[len(table)] = table[0]
+        self._sizes[voice] = len(table)
+        self._elapsed[voice] = 0.0
+        self._increments[voice] = frequency / self._sample_rate
+        self._amplitudes[voice] = amplitude
+        self._started[voice] = self._note_count
+        self._note_count += 1
+        stolen: str | None = self.notes[voice]
+        if stolen is not None and self._held.get(stolen) == voice:
+            del self._held[stolen]
+        self.notes[voice] = note
+        self._held[note] = voice
+        self.envelopes.note_on(voice)
+        return voice
+
+    def voice_of(self, note: str) -> int | None:
+        """the voice playing a held note, None once it is released"""
+        return self._held.get(note)
+
+    def note_off(self, note: str) -> None:
+        """releases the voice playing a note, if it is still held"""
+        voice: int | None = self._held.pop(note, None)
+        if voice is not None:
+            self.envelopes.note_off(voice)
+
+    def release_all(self) -> None:
+        """releases every sounding voice"""
+        self._held.clear()
+        for voice in range(self.voice_count):
+            self.envelopes.note_off(voice)
+
+    def advance(self, params: ADSRParams, frames: int) -> None:
+        """
+        Moves every voice frames samples on without rendering, leaving the pool
+        in the same state as render() would.
+        """
+        self.envelopes.advance(params, frames)
+        self._elapsed += frames
+
+    def render(
+        self,
+        params: ADSRParams,
+        frames: int,
+        out: npt.NDArray[np.float32] | None = None,
+        sustain: float | npt.NDArray[np.float64] | None = None,
+    ) -> npt.NDArray[np.float32]:
+        """
+        Renders the next block of every voice with its envelope and mixes them.
+
+        Args:
+            params: the envelope settings for this block
+            frames: number of samples to render
+            out: optional float32 buffer to write the mix into
+            sustain: optional sustain level, see EnvelopeBank.gains
+
+        Returns:
+            the mix of all voices
+        """
+        if out is None:
+            out = np.empty(frames, dtype=np.float32)
+        else:
+            out = out[:frames]
+        # only the sounding voices are generated, in the first rows of the
+        # block buffers, so one held note costs one row and not the whole pool
+        active: npt.NDArray[np.intp] = np.flatnonzero(self.envelopes.active())
+        if active.size == 0:
+            out[:] = 0
+            return out
+
+        if self._ramp.size < frames:
+            self._allocate_blocks(frames)
+        count: int = active.size
+        position = self._position[:count, :frames]
+        index = self._index[:count, :frames]
+        samples = self._samples[:count, :frames]
+        upper = self._upper[:count, :frames]
+
+        # the phase of every frame, counted from the start of the note, then
+        # its place in the voice's table, read with linear interpolation
+        np.add(self._ramp[:frames], self._elapsed[active, np.newaxis], out=position)
+        position *= self._increments[active, np.newaxis]
+        np.remainder(position, 1.0, out=position)
+        position *= self._sizes[active, np.newaxis]
+        np.copyto(index, position, casting="unsafe")  # truncates, positions are >= 0
+        position -= index
+        index += self._row_starts[active]
+        np.take(self._tables, index, out=samples)
+        index += 1
+        np.take(self._tables, index, out=upper)
+        upper -= samples
+        upper *= position
+        samples += upper
+        samples *= self._amplitudes[active, np.newaxis]
+
+        gains = self.envelopes.gains(params, frames, self._gains, sustain)
+        np.take(gains, active, axis=0, out=upper)
+        samples *= upper
+        np.sum(samples, axis=0, out=out)
+
+        self._elapsed += frames
+        return out
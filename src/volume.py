@@ -1,16 +1,19 @@
 # This class handles volume processing for the GUI in form.py
 # It contains a default value, and current value, from which the gain coefficient
 # can be computed.
-# The change_gain method will take a signal and returned an amplified version.
+# The change_gain method will take a float32 signal and returned an amplified version.
 
 """
 The Volume class allows for changing the volume level and applying gain coefficients to audio signals. 
 To use it, import the class, create an instance, use the config() method to configure the volume parameter
 given a knob value, use the calculate_gain() method to calculate the gain coefficients, 
 and the change_gain() method to dynamically adjust the gain.
+Gain changes glide over a short ramp, so config() can be called from the GUI thread
+while the audio thread is calling change_gain() without clicks or locks.
 """
 import numpy as np
 import numpy.typing as npt
+from smoothing import SmoothedValue, DEFAULT_RAMP_SAMPLES
 
 
 class Volume:
@@ -20,19 +23,30 @@ class Volume:
     Attributes:
         volume_level: level of the audio signal
         offset: reference point for the volume control
+        ramp_samples: length of the glide to a new gain, in samples
     """
 
-    def __init__(self, volume_level: int = 9, offset: int = 9) -> None:
+    def __init__(
+        self,
+        volume_level: int = 9,
+        offset: int = 9,
+        ramp_samples: int = DEFAULT_RAMP_SAMPLES,
+    ) -> None:
         self._volume_level = volume_level
         self._offset = offset
-        self._gain: float = self.calculate_gain()
+        self._smoothed_gain = SmoothedValue(self.calculate_gain(), ramp_samples)
+
+    @property
+    def _gain(self) -> float:
+        """the gain coefficient for the current knob setting"""
+        return self._smoothed_gain.target
 
     def config(self, volume_level: int) -> None:
         """
         configure all volume parameter given a knob value.
         """
         self._volume_level = volume_level
-        self._gain = self.calculate_gain()
+        self._smoothed_gain.set_target(self.calculate_gain())
 
     def calculate_gain(self) -> float:
         """
@@ -44,8 +58,19 @@ class Volume:
         decibels: float = 3.0 * (self._volume_level - self._offset)
         return pow(10.0, decibels / 20.0)
 
-    def change_gain(self, samples: npt.NDArray[np.int16]) -> npt.NDArray[np.int16]:
+    def change_gain(
+        self,
+        samples: npt.NDArray[np.float32],
+        out: npt.NDArray[np.float32] | None = None,
+    ) -> npt.NDArray[np.float32]:
         """
-        change the gain of a given sound wave.
+        change the gain of a given float32 sound wave. Pass out (which may be
+        samples itself) to write the result into an existing buffer.
+        Conversion to int16 is left to the output stage.
         """
-        return (samples * self._gain).astype(np.int16)
+        gain = self._smoothed_gain.next_block(len(samples))
+        return np.multiply(samples, gain, out=out, dtype=np.float32)
+
+    def skip(self, frames: int) -> None:
+        """moves the gain glide on by frames samples without applying it"""
+        self._smoothed_gain.skip(frames)
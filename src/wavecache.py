@@ -0,0 +1,148 @@
+"""
+The DiskCache class keeps computed tables in .npy files between runs. The files
+of each code version are kept in a directory of their own, named after a hash of
+the table parameters, and are opened memory-mapped and read-only, so warm starts
+do no synthesis work and several SnakeSynth processes share the same pages. Opening
+a cache never removes anything, since other checkouts or installed versions may be
+using the same directory; prune() removes the oldest versions when asked to.
+
+To use the DiskCache class, follow these steps:
+
+1. Create an instance with a cache directory and a version string, e.g. from code_version().
+2. Call load_or_build() with a name, the parameters and a function that builds the table.
+3. Optionally call prune() to remove the tables of old code versions.
+"""
+
+from pathlib import Path
+from typing import Any, Callable
+import hashlib
+import inspect
+import os
+import shutil
+import tempfile
+import time
+import numpy as np
+
+VERSION_PREFIX: str = "version-"  # name of the directory of each code version
+DEFAULT_KEEP_VERSIONS: int = 2  # older versions prune() leaves in place
+DEFAULT_CACHE_DIR: Path = Path(
+    os.environ.get("SNAKESYNTH_CACHE_DIR", Path.home() / ".cache" / "snakesynth")
+)
+
+
+def code_version(*objects: Any) -> str:
+    """
+    Hashes the source files that define the given modules, classes or functions,
+    so cached tables are rebuilt whenever the code that produced them changes.
+    """
+    digest = hashlib.sha256()
+    for obj in objects:
+        digest.update(Path(inspect.getsourcefile(obj)).read_bytes())
+    return digest.hexdigest()[:16]
+
+
+class DiskCache:
+    """
+    Persistent cache of precomputed tables stored as memory-mapped .npy files.
+    Meant for a small, fixed set of tables such as the wavetables: every table
+    built stays on disk until the code version changes.
+
+    Attributes:
+        directory: where the .npy files are kept, one subdirectory per version
+        version: code version the tables were built with
+        hits: number of tables loaded from disk
+        misses: number of tables that had to be built
+    """
+
+    def __init__(self, directory: str | Path = DEFAULT_CACHE_DIR, version: str = "") -> None:
+        self._root: Path = Path(directory)
+        self._directory: Path = self._root
+        if version:
+            self._directory = self._root / (VERSION_PREFIX + version)
+        self._version: str = version
+        self._writable: bool = True
+
+        self.hits: int = 0
+        self.misses: int = 0
+
+    def prune(self, keep: int = DEFAULT_KEEP_VERSIONS) -> list[Path]:
+        """
+        Removes the tables of old code versions, keeping the keep most recently
+        modified ones. The current version and any version modified after it
+        are never removed, so processes running newer code keep their tables.
+        Only version directories are touched, the cache directory may be shared.
+
+        Returns:
+            the version directories that were removed
+        """
+        if not self._version or not self._root.is_dir():
+            return []
+        try:
+            current: float = self._directory.stat().st_mtime
+        except OSError:  # nothing written for this version yet
+            current = time.time()
+
+        older: list[tuple[float, Path]] = []
+        for entry in self._root.iterdir():
+            if not entry.name.startswith(VERSION_PREFIX) or entry == self._directory:
+                continue
+            try:
+                modified: float = entry.stat().st_mtime
+            except OSError:  # removed by another process meanwhile
+                continue
+            if entry.is_dir() and modified < current:
+                older.append((modified, entry))
+
+        older.sort(reverse=True)
+        removed: list[Path] = [entry for _, entry in older[keep:]]
+        for entry in removed:
+            shutil.rmtree(entry, ignore_errors=True)
+        return removed
+
+    def path(self, name: str, params: tuple) -> Path:
+        """file that holds the table for the given name and parameters"""
+        key: str = repr((name, params))
+        digest: str = hashlib.sha256(key.encode("utf-8")).hexdigest()[:24]
+        return self._directory / f"{name}-{digest}.npy"
+
+    def load_or_build(
+        self, name: str, params: tuple, build: Callable[[], np.ndarray]
+    ) -> np.ndarray:
+        """
+        Returns the cached table for name and params as a read-only memory map.
+        On a miss the table is built, written to disk and then mapped.
+        If the cache directory cannot be written, the built table is returned as is.
+        """
+        path: Path = self.path(name, params)
+        try:
+            table: np.ndarray = np.load(path, mmap_mode="r")
+            self.hits += 1
+            return table
+        except (OSError, ValueError):  # missing or unreadable, build it again
+            pass
+
+        self.misses += 1
+        table = np.ascontiguousarray(build())
+        if not self._writable:
+            return table
+
+        temp_path: str | None = None
+        try:
+            self._directory.mkdir(parents=True, exist_ok=True)
+            # write to a temporary file first so other processes never map a partial file
+            fd, temp_path = tempfile.mkstemp(dir=self._directory, suffix=".tmp")
+            with os.fdopen(fd, "wb") as temp_file:
+                np.save(temp_file, table)
+            os.replace(temp_path, path)
+            temp_path = None
+            return np.load(path, mmap_mode="r")
+        except OSError as e:
+            print("Wave cache directory is not writable, caching in memory only:", e)
+            self._writable = False
+            return table
+        finally:
+            if temp_path is not None:  # the write or rename failed part way
+                try:
+                    os.unlink(temp_path)
+                except OSError:
+                    pass
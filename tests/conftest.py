@@ -0,0 +1,8 @@
+import os
+import sys
+
+# modules in src/ import each other by bare name (as form.py does when run
+# from src/), so src/ itself has to be importable as well as the repo root.
+# Tests that pass objects between such modules import them by bare name too,
+# otherwise src.adsr.State and adsr.State would be two different enums.
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
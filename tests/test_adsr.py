@@ -3,7 +3,16 @@ import sys
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
-from src.adsr import ADSREnvelope
+from src.adsr import (
+    ADSREnvelope,
+    ADSRParams,
+    EnvelopeBank,
+    EnvelopeVoice,
+    State,
+    segment_table,
+    SEGMENT_CACHE_SIZE,
+)
+import dataclasses
 import numpy as np
 import pytest
 
@@ -66,3 +75,296 @@ def test_default_sample_rate():
 
     # Check if the sample rate is set to the default value of 48000
     assert envelope._sample_rate == 48000
+
+
+def process_per_sample(envelope, samples):
+    out = np.empty(len(samples), dtype=np.float32)
+    for i in range(len(samples)):
+        out[i] = envelope.process(samples[i])
+    return out
+
+
+@pytest.mark.parametrize("block_size", [1, 7, 256, 1000, 9600])
+def test_process_block_matches_process(block_size):
+    samples = np.sin(np.arange(30000) * 0.01).astype(np.float32) * 0.25
+    release_at = 20000  # key released in the middle of a block
+    bounds = sorted(set(range(0, len(samples), block_size)) | {release_at})
+    bounds.append(len(samples))
+
+    per_sample = ADSREnvelope(
+        DEFAULT_ATTACK, DEFAULT_DECAY, DEFAULT_SUSTAIN, DEFAULT_RELEASE
+    )
+    block = ADSREnvelope(
+        DEFAULT_ATTACK, DEFAULT_DECAY, DEFAULT_SUSTAIN, DEFAULT_RELEASE
+    )
+    per_sample.update_state(State.ATTACK)
+    block.update_state(State.ATTACK)
+    expected = np.empty(len(samples), dtype=np.float32)
+    actual = np.empty(len(samples), dtype=np.float32)
+
+    for begin, end in zip(bounds[:-1], bounds[1:]):
+        if begin == release_at:
+            per_sample.update_state(State.RELEASE)
+            block.update_state(State.RELEASE)
+        expected[begin:end] = process_per_sample(per_sample, samples[begin:end])
+        block.process_block(samples[begin:end], out=actual[begin:end])
+
+    assert np.array_equal(actual, expected)
+    assert block._state == per_sample._state == State.IDLE
+
+
+def test_process_block_crosses_states_within_one_block():
+    envelope = ADSREnvelope(1, 1, 10, 1, sample_rate=1000)  # 50 samples per segment
+    envelope.update_state(State.ATTACK)
+    out = envelope.process_block(np.ones(200, dtype=np.float32))
+
+    assert envelope._state == State.SUSTAIN
+    assert np.allclose(out[:50], np.linspace(0, 1, 50))
+    assert np.allclose(out[50:100], np.linspace(1, 0.5, 50))
+    assert np.allclose(out[100:], 0.5)
+
+    envelope.update_state(State.RELEASE)
+    out = envelope.process_block(np.ones(80, dtype=np.float32))
+    assert envelope._state == State.IDLE
+    assert np.allclose(out[:50], np.linspace(0.5, 0, 50))
+    assert np.all(out[50:] == 0)
+
+
+def test_process_block_skips_segments_turned_to_zero():
+    envelope = ADSREnvelope(0, 0, 10, 0, sample_rate=1000)
+    envelope.update_state(State.ATTACK)
+    out = envelope.process_block(np.ones(10, dtype=np.float32))
+
+    assert np.allclose(out, 0.5)
+    envelope.update_state(State.RELEASE)
+    assert np.all(envelope.process_block(np.ones(10, dtype=np.float32)) == 0)
+
+
+def test_envelopes_share_segment_tables():
+    first = ADSREnvelope(
+        DEFAULT_ATTACK, DEFAULT_DECAY, DEFAULT_SUSTAIN, DEFAULT_RELEASE
+    )
+    second = ADSREnvelope(
+        DEFAULT_ATTACK, DEFAULT_DECAY, DEFAULT_SUSTAIN, DEFAULT_RELEASE
+    )
+
+    assert first._attack_envelope is second._attack_envelope
+    assert first._decay_envelope is second._decay_envelope
+    assert first._release_envelope is second._release_envelope
+    assert not first._attack_envelope.flags.writeable
+
+    # turning a knob back to an earlier value reuses the earlier table
+    first.update_attack(5)
+    first.update_attack(DEFAULT_ATTACK)
+    assert first._attack_envelope is second._attack_envelope
+
+
+def test_segment_table_cache_is_bounded():
+    segment_table.cache_clear()
+    for length in range(SEGMENT_CACHE_SIZE + 10):
+        segment_table("linear", length, 0.0, 1.0)
+
+    assert segment_table.cache_info().currsize == SEGMENT_CACHE_SIZE
+    with pytest.raises(ValueError):
+        segment_table("square", 10, 0.0, 1.0)
+
+
+def test_envelope_buffer_is_allocated_on_first_use():
+    envelope = ADSREnvelope()
+
+    assert envelope._envelope_buffer is None
+    assert envelope._envelope.shape == (48000,)
+    assert envelope._envelope is envelope._envelope_buffer
+
+
+def test_adsr_params_is_immutable_and_matches_envelope():
+    params = ADSRParams(
+        DEFAULT_ATTACK, DEFAULT_DECAY, DEFAULT_SUSTAIN, DEFAULT_RELEASE
+    )
+    envelope = ADSREnvelope(
+        DEFAULT_ATTACK, DEFAULT_DECAY, DEFAULT_SUSTAIN, DEFAULT_RELEASE
+    )
+
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        params.sustain_level = 3
+    assert params.attack_samples == envelope._attack_samples
+    assert params.sustain == envelope._sustain
+    assert params.attack_envelope is envelope._attack_envelope
+    assert params.release_envelope is envelope._release_envelope
+    assert dataclasses.replace(params, sustain_level=4).sustain == 4 * DEFAULT_MS
+
+
+def test_envelope_voice_matches_envelope():
+    params = ADSRParams(1, 1, 10, 1, sample_rate=1000)
+    envelope = ADSREnvelope(1, 1, 10, 1, sample_rate=1000)
+    voice = EnvelopeVoice()
+    samples = np.linspace(-1, 1, 64, dtype=np.float32)
+
+    assert not hasattr(voice, "__dict__")
+    envelope.update_state(State.ATTACK)
+    voice.update_state(State.ATTACK)
+    for block in range(8):
+        if block == 5:
+            envelope.update_state(State.RELEASE)
+            voice.update_state(State.RELEASE)
+        expected = envelope.process_block(samples)
+        actual = voice.process_block(params, samples)
+        assert np.array_equal(actual, expected)
+        assert (voice.state, voice.pos) == (envelope._state, envelope._pos)
+
+    assert voice.state == State.IDLE
+    assert voice.level == 0.0
+
+
+def test_envelope_bank_advances_voices_independently():
+    params = ADSRParams(1, 1, 10, 1, sample_rate=1000)  # 50 samples per segment
+    bank = EnvelopeBank(4)
+    voices = [EnvelopeVoice() for _ in range(4)]
+    samples = np.ones((4, 32), dtype=np.float32)
+
+    # voice 0 starts now, voice 1 one block later, voice 2 is released
+    # after four blocks, voice 3 never plays
+    schedule = {0: [(0, State.ATTACK)], 1: [(1, State.ATTACK)], 4: [(0, State.RELEASE)]}
+    for block in range(10):
+        for voice, state in schedule.get(block, []):
+            if state == State.ATTACK:
+                bank.note_on(voice)
+            else:
+                bank.note_off(voice)
+            voices[voice].update_state(state)
+        out = bank.process_block(params, samples)
+
+        for i, voice in enumerate(voices):
+            assert np.allclose(out[i], voice.process_block(params, samples[i]))
+            assert bank.state[i] == voice.state.value
+            assert bank.level[i] == pytest.approx(voice.level)
+
+    assert list(bank.active()) == [False, True, False, False]
+
+
+@pytest.mark.parametrize("shape", ["exponential", "logarithmic", 2.5, -0.5])
+def test_curved_segments_keep_their_end_points(shape):
+    for start, end in [(0.0, 1.0), (1.0, 0.4), (0.4, 0.0)]:
+        table = segment_table(shape, 100, start, end)
+
+        assert table[0] == pytest.approx(start)
+        assert table[-1] == pytest.approx(end)
+        assert np.all(np.diff(table) * (end - start) >= 0)  # monotonic
+
+
+def test_curvature_bends_segments():
+    linear = segment_table("linear", 101, 0.0, 1.0)
+    rise = segment_table("exponential", 101, 0.0, 1.0)
+    fall = segment_table("exponential", 101, 1.0, 0.0)
+    log_rise = segment_table("logarithmic", 101, 0.0, 1.0)
+
+    # exponential rises start slowly, exponential falls drop quickly
+    assert rise[50] < linear[50] < log_rise[50]
+    assert fall[50] < linear[50]
+    assert np.allclose(fall, rise[::-1])
+    assert np.allclose(rise, np.expm1(5.0 * np.linspace(0, 1, 101)) / np.expm1(5.0))
+    assert np.array_equal(segment_table(0.0, 101, 0.0, 1.0), linear)
+    with pytest.raises(ValueError):
+        segment_table("cubic", 10, 0.0, 1.0)
+
+
+def test_envelope_curves():
+    envelope = ADSREnvelope(1, 1, 10, 1, sample_rate=1000, decay_curve="exponential")
+    params = ADSRParams(1, 1, 10, 1, sample_rate=1000, decay_curve="exponential")
+
+    assert envelope._decay_envelope is params.decay_envelope
+    assert np.array_equal(envelope._attack_envelope, np.linspace(0, 1, 50))
+
+    envelope.update_curve("release", -3.0)
+    assert envelope._release_envelope is segment_table(-3.0, 50, 0.5, 0.0)
+    with pytest.raises(ValueError):
+        envelope.update_curve("sustain", "linear")
+    with pytest.raises(ValueError):
+        envelope.update_curve("attack", "cubic")
+    assert envelope._attack_curve == "linear"
+
+
+def test_sustain_change_glides_while_held():
+    envelope = ADSREnvelope(0, 0, 10, 1, sample_rate=1000, ramp_samples=100)
+    envelope.update_state(State.ATTACK)
+    envelope.process_block(np.ones(10, dtype=np.float32))
+    envelope.update_sustain(2)
+    out = envelope.process_block(np.ones(200, dtype=np.float32))
+
+    assert np.all(np.diff(out[:100]) < 0)
+    assert abs(out[0] - 0.5) < 0.01
+    assert np.allclose(out[100:], 0.1)
+    # the release now starts from the new sustain level
+    assert envelope._release_envelope[0] == pytest.approx(0.1)
+
+
+def test_process_matches_process_block_through_sustain_glide():
+    by_sample = ADSREnvelope(1, 1, 10, 1, sample_rate=1000, ramp_samples=100)
+    by_block = ADSREnvelope(1, 1, 10, 1, sample_rate=1000, ramp_samples=100)
+    for envelope in (by_sample, by_block):
+        envelope.update_state(State.ATTACK)
+
+    samples = np.ones(64, dtype=np.float32)
+    for block in range(8):
+        if block == 2:  # held in sustain: change it in the middle of the note
+            by_sample.update_sustain(2)
+            by_block.update_sustain(2)
+        expected = by_block.process_block(samples)
+        actual = np.array([by_sample.process(sample) for sample in samples])
+        assert np.allclose(actual, expected)
+    assert by_sample.process(1.0) == pytest.approx(0.1)
+
+
+def test_process_moves_on_when_segment_shrinks():
+    envelope = ADSREnvelope(2, 2, 10, 2, sample_rate=1000)
+    envelope.update_state(State.ATTACK)
+    for _ in range(50):
+        envelope.process(1.0)
+    envelope.update_decay(0.5)  # 25 samples, shorter than the position after this
+    for _ in range(60):
+        assert envelope.process(1.0) is not None
+    envelope.update_state(State.RELEASE)
+    envelope.update_release(0)
+    assert envelope.process(1.0) == 0
+    assert envelope._state == State.IDLE
+
+
+def test_knob_changes_from_another_thread():
+    import threading
+
+    envelope = ADSREnvelope(1, 1, 10, 1, sample_rate=1000)
+    stop = threading.Event()
+
+    def turn_knobs():
+        rng = np.random.default_rng(0)
+        while not stop.is_set():
+            envelope.update_attack(float(rng.integers(0, 4)))
+            envelope.update_decay(float(rng.integers(0, 4)))
+            envelope.update_sustain(float(rng.integers(0, 20)))
+            envelope.update_release(float(rng.integers(0, 4)))
+
+    thread = threading.Thread(target=turn_knobs)
+    thread.start()
+    try:
+        block = np.ones(64, dtype=np.float32)
+        for i in range(3000):
+            if i % 50 == 0:
+                envelope.update_state(State.ATTACK if i % 100 == 0 else State.RELEASE)
+            out = envelope.process_block(block)
+            assert np.all(np.isfinite(out))
+            assert np.all((out > -1e-9) & (out <= 1))
+    finally:
+        stop.set()
+        thread.join()
+
+
+def test_envelope_bank_gains_use_given_sustain():
+    params = ADSRParams(1, 1, 10, 1, sample_rate=1000)
+    bank = EnvelopeBank(2)
+    bank.note_on(0)
+    bank.gains(params, 100)
+    ramp = np.linspace(0.5, 0.25, 20)
+    gains = bank.gains(params, 20, sustain=ramp)
+
+    assert np.allclose(gains[0], ramp)
+    assert np.all(gains[1] == 0)
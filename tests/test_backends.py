@@ -0,0 +1,106 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from backends import NullBackend, FileBackend, SoundDeviceBackend, create_backend
+from engine import AudioEngine
+from adsr import ADSREnvelope
+from volume import Volume
+import time
+import wave
+import numpy as np
+import pytest
+
+SAMPLE_RATE = 8000
+BLOCKSIZE = 80  # 10 ms
+
+
+def make_engine(backend):
+    envelope = ADSREnvelope(1, 1, 10, 1, sample_rate=SAMPLE_RATE)
+    return AudioEngine(
+        envelope, Volume(), SAMPLE_RATE, BLOCKSIZE, metrics=True, backend=backend
+    )
+
+
+def test_null_backend_keeps_realtime_pace():
+    backend = NullBackend(SAMPLE_RATE, BLOCKSIZE)
+    engine = make_engine(backend)
+    engine.note_on("A4", np.ones(10), 440.0)
+    engine.start()
+    assert engine.running
+    time.sleep(0.3)
+    engine.stop()
+
+    assert not engine.running
+    assert 20 <= backend.blocks <= 35  # about 30 blocks of 10 ms
+    assert engine.metrics.blocks == backend.blocks
+    assert 0 < backend.load < 1
+    assert engine.metrics.voices == 1
+
+
+def test_null_backend_measures_throughput_without_pacing():
+    backend = NullBackend(SAMPLE_RATE, BLOCKSIZE, realtime=False)
+    engine = make_engine(backend)
+    engine.start()
+    time.sleep(0.1)
+    engine.stop()
+
+    assert backend.blocks > 100  # faster than the 10 blocks of realtime
+
+
+def test_late_blocks_are_reported_as_underflows():
+    backend = NullBackend(SAMPLE_RATE, BLOCKSIZE)
+    engine = make_engine(backend)
+    render = engine.render
+
+    def slow_render(frames):
+        if backend.blocks == 3:
+            time.sleep(0.03)
+        return render(frames)
+
+    engine.render = slow_render
+    engine.start()
+    time.sleep(0.15)
+    engine.stop()
+
+    assert backend.late_blocks >= 1
+    assert engine.metrics.underruns >= 1
+
+
+@pytest.mark.parametrize("name", ["out.wav", "out.raw"])
+def test_file_backend_writes_the_engine_output(tmp_path, name):
+    path = str(tmp_path / name)
+    engine = make_engine(FileBackend(path, SAMPLE_RATE, BLOCKSIZE))
+    reference = make_engine(None)
+    for each in (engine, reference):
+        each.note_on("A4", np.linspace(-1, 1, 10), 440.0)
+    engine.start()
+    time.sleep(0.05)
+    engine.stop()
+
+    if name.endswith(".wav"):
+        with wave.open(path) as file:
+            assert file.getframerate() == SAMPLE_RATE
+            written = np.frombuffer(file.readframes(file.getnframes()), dtype="<i2")
+    else:
+        written = np.fromfile(path, dtype="<i2")
+    blocks = len(written) // BLOCKSIZE
+    assert blocks > 0 and len(written) == blocks * BLOCKSIZE
+
+    expected = np.empty((blocks * BLOCKSIZE, 1), dtype=np.int16)
+    for block in range(blocks):
+        start = block * BLOCKSIZE
+        reference.callback(expected[start : start + BLOCKSIZE], BLOCKSIZE, None, None)
+    assert np.array_equal(written, expected[:, 0])
+
+
+def test_create_backend():
+    for name, backend in [
+        ("sounddevice", SoundDeviceBackend),
+        ("null", NullBackend),
+        ("take.wav", FileBackend),
+    ]:
+        assert isinstance(create_backend(name, SAMPLE_RATE, BLOCKSIZE), backend)
+    with pytest.raises(ValueError):
+        create_backend("jack", SAMPLE_RATE, BLOCKSIZE)
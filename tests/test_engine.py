@@ -0,0 +1,86 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+# imported by bare name, like engine.py imports adsr, so State is the same enum
+from engine import AudioEngine
+from adsr import ADSREnvelope, State
+from volume import Volume
+from master import MasterBus
+from oscillator import WavetableOscillator
+import numpy as np
+import pytest
+
+
+@pytest.fixture
+def engine():
+    envelope = ADSREnvelope(1, 1, 10, 1, sample_rate=1000)
+    return AudioEngine(envelope, Volume(ramp_samples=0), sample_rate=1000, blocksize=32)
+
+
+def test_silent_until_note_on(engine):
+    assert np.all(engine.render(32) == 0)
+
+
+def test_plays_note_table_through_envelope(engine):
+    table = np.arange(1, 11, dtype=np.float64) / 10
+    engine.note_on("A4", table, 37.0)
+    rendered = np.concatenate([engine.render(32).copy() for _ in range(10)])
+
+    oscillator = WavetableOscillator(table, 37.0, 1000, 1.0)
+    reference = ADSREnvelope(1, 1, 10, 1, sample_rate=1000)
+    reference.update_state(State.ATTACK)
+    expected = reference.process_block(oscillator.generate_block(320))
+    # the attack peaks at full scale, so the master bus limits the loudest samples
+    assert np.allclose(rendered, MasterBus().process(expected))
+
+
+def test_rejects_tables_larger_than_the_voices_hold(engine):
+    with pytest.raises(ValueError):
+        engine.note_on("A4", np.zeros(engine.voices.table_size + 1), 440.0)
+
+
+def test_note_off_only_releases_its_note(engine):
+    engine.note_on("A4", np.ones(10), 440.0)
+    engine.note_on("C4", np.ones(10), 440.0)
+    engine.render(32)
+    engine.note_off("C4")
+    engine.note_off("B4")
+    for _ in range(5):
+        engine.render(32)
+    assert engine.voices.active_count == 1
+
+    engine.note_off("A4")
+    for _ in range(4):
+        engine.render(32)
+    assert engine.voices.active_count == 0
+    assert np.all(engine.render(32) == 0)
+
+
+def test_events_wait_for_block_boundary(engine):
+    engine.note_on("A4", np.ones(10), 440.0)
+    assert engine.voices.active_count == 0
+    engine.render(32)
+    assert engine.voices.active_count == 1
+
+
+def test_overlapping_notes_are_mixed(engine):
+    engine.note_on("A4", np.full(10, 0.25), 440.0)
+    engine.note_on("C4", np.full(10, 0.5), 440.0)
+    for _ in range(5):
+        block = engine.render(32)  # reach sustain (0.5)
+
+    assert np.allclose(block, 0.75 * 0.5)
+
+
+def test_callback_fills_int16_output(engine):
+    engine.note_on("A4", np.ones(10), 440.0)
+    for _ in range(5):
+        engine.render(32)  # reach sustain (0.5)
+    outdata = np.empty((32, 1), dtype=np.int16)
+    engine.callback(outdata, 32, None, None)
+
+    assert np.all(outdata == round(0.5 * 32767))
+    assert engine.latency == pytest.approx(0.032)
+    assert not engine.running
@@ -0,0 +1,81 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from master import MasterBus, decibels
+from engine import AudioEngine
+from adsr import ADSREnvelope
+from volume import Volume
+import numpy as np
+import pytest
+
+
+def test_quiet_signal_passes_unchanged():
+    bus = MasterBus()
+    samples = np.linspace(-0.8, 0.8, 101, dtype=np.float32)
+    assert np.array_equal(bus.process(samples), samples)
+    assert bus.peak == pytest.approx(0.8)
+    assert bus.gain_reduction == 0.0
+
+
+def test_loud_signal_stays_below_ceiling():
+    bus = MasterBus()
+    samples = np.linspace(-20, 20, 1001, dtype=np.float32)
+    out = bus.process(samples)
+
+    assert np.all(np.abs(out) <= 1.0)
+    assert np.all(np.diff(out) >= 0)  # still rising: bent, not folded over
+    assert np.array_equal(np.sign(out), np.sign(samples))
+    assert bus.input_peak == pytest.approx(20)
+    assert bus.peak == pytest.approx(np.abs(out).max())
+    assert bus.gain_reduction == pytest.approx(decibels(20) - decibels(bus.peak))
+
+
+def test_curve_is_smooth_at_threshold():
+    bus = MasterBus(threshold=0.5)
+    samples = np.array([0.5, 0.5001, 0.7, 2.0], dtype=np.float32)
+    out = bus.process(samples)
+    assert out[1] - out[0] == pytest.approx(0.0001, rel=1e-2)
+    assert out[2] == pytest.approx(0.5 + 0.5 * np.tanh(0.4), rel=1e-6)
+
+
+def test_blocks_are_independent():
+    samples = np.sin(np.linspace(0, 40, 1000, dtype=np.float32)) * 3
+    whole = MasterBus().process(samples)
+    bus = MasterBus()
+    parts = np.concatenate([bus.process(part) for part in np.split(samples, 8)])
+    assert np.array_equal(whole, parts)
+
+
+def test_in_place_and_held_reduction():
+    bus = MasterBus()
+    samples = np.full(64, 1.5, dtype=np.float32)
+    assert bus.process(samples, out=samples) is samples
+    assert np.all(samples < 1.0)
+    loudest = bus.gain_reduction
+
+    bus.process(np.zeros(64, dtype=np.float32))
+    assert bus.gain_reduction == 0.0
+    assert bus.max_gain_reduction == loudest
+    assert "dBFS" in bus.summary()
+    bus.reset_meters()
+    assert bus.max_gain_reduction == 0.0
+
+
+def test_rejects_threshold_above_ceiling():
+    with pytest.raises(ValueError):
+        MasterBus(threshold=1.0)
+
+
+def test_engine_output_never_wraps():
+    engine = AudioEngine(
+        ADSREnvelope(sample_rate=1000), Volume(ramp_samples=0), 1000, 32
+    )
+    for note in ("A4", "B4", "C4", "D4"):
+        engine.note_on(note, np.ones(10), 440.0)
+    outdata = np.empty((32, 1), dtype=np.int16)
+    for _ in range(10):
+        engine.callback(outdata, 32, None, None)
+        assert np.all(outdata >= 0)  # no sample wrapped round to negative
+    assert engine.master.max_gain_reduction > 0
@@ -0,0 +1,53 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from metrics import AudioMetrics, BIN_WIDTH, HISTOGRAM_BINS
+from engine import AudioEngine
+from adsr import ADSREnvelope
+from volume import Volume
+from types import SimpleNamespace
+import numpy as np
+import pytest
+
+UNDERFLOW = SimpleNamespace(output_underflow=True, output_overflow=False)
+
+
+def test_counts_blocks_and_status_flags():
+    metrics = AudioMetrics(48000, 480, enabled=True)  # 10 ms deadline
+    metrics.record_block(0.001, 480, None, 2)
+    metrics.record_block(0.0055, 480, UNDERFLOW, 5)
+    metrics.record_block(0.050, 480, None, 1)
+
+    assert metrics.deadline == pytest.approx(0.01)
+    assert metrics.blocks == 3
+    assert metrics.underruns == 1 and metrics.overruns == 0
+    assert metrics.late_blocks == 1
+    assert metrics.max_load == pytest.approx(5.0)
+    assert (metrics.voices, metrics.peak_voices) == (1, 5)
+
+    histogram = metrics.histogram()
+    assert histogram.sum() == 3
+    assert histogram[1] == 1 and histogram[5] == 1 and histogram[-1] == 1
+    assert metrics.load_percentile(50) == pytest.approx(6 * BIN_WIDTH)
+    assert "underruns 1" in metrics.summary()
+
+    metrics.reset()
+    assert metrics.blocks == 0 and metrics.histogram().sum() == 0
+    assert len(metrics.histogram()) == HISTOGRAM_BINS
+
+
+def test_engine_records_only_when_enabled():
+    engine = AudioEngine(ADSREnvelope(sample_rate=1000), Volume(), 1000, 32)
+    outdata = np.empty((32, 1), dtype=np.int16)
+    engine.note_on("A4", np.ones(10), 440.0)
+    engine.callback(outdata, 32, None, None)
+    assert engine.metrics.blocks == 0
+    assert engine.metrics.summary() == "audio metrics off"
+
+    engine.metrics.enabled = True
+    engine.callback(outdata, 32, None, UNDERFLOW)
+    assert engine.metrics.blocks == 1
+    assert engine.metrics.underruns == 1
+    assert engine.metrics.voices == 1
@@ -0,0 +1,93 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from midi_input import MidiReader, READ_SIZE
+import threading
+import time
+import pytest
+
+
+class FakeDevice:
+    """a MIDI input with queued [data, timestamp] events, like pygame.midi.Input"""
+
+    def __init__(self, events=()):
+        self.events = list(events)
+        self.lock = threading.Lock()
+
+    def poll(self):
+        with self.lock:
+            return bool(self.events)
+
+    def read(self, count):
+        with self.lock:
+            events, self.events = self.events[:count], self.events[count:]
+        return events
+
+
+def test_yields_messages_in_order_until_stopped():
+    events = [[[0x90, 60 + i, 100, 0], 10.0 * i] for i in range(READ_SIZE + 3)]
+    reader = MidiReader(FakeDevice(events), clock=lambda: 200.0)
+    messages = []
+    for message in reader:
+        messages.append(message)
+        if len(messages) == len(events):
+            reader.stop()
+
+    assert [message["note"] for message in messages] == list(range(60, 73))
+    assert messages[0] == {"status": 0x90, "note": 60, "velocity": 100}
+    assert reader.messages == len(events)
+    assert reader.latency == pytest.approx(80.0)
+    assert reader.max_latency == pytest.approx(200.0)
+    assert reader.mean_latency == pytest.approx(140.0)
+
+
+def test_idle_reader_sleeps_between_polls():
+    reader = MidiReader(FakeDevice(), min_interval=0.001, max_interval=0.005)
+    thread = threading.Thread(target=lambda: list(reader))
+    thread.start()
+    time.sleep(0.1)
+    reader.stop()
+    thread.join(timeout=1)
+
+    assert not thread.is_alive()
+    assert reader.stopped
+    assert reader.polls <= 0.1 / 0.005 + 10  # backed off to the idle interval
+    assert reader.cpu_load < 0.5
+    assert "MIDI cpu" in reader.summary()
+
+
+def test_message_is_read_within_the_jitter_bound():
+    device = FakeDevice()
+    reader = MidiReader(device, max_interval=0.005)
+    received = []
+
+    def read():
+        for message in reader:
+            received.append(time.perf_counter())
+            reader.stop()
+
+    thread = threading.Thread(target=read)
+    thread.start()
+    time.sleep(0.05)  # idle long enough to reach the longest wait
+    with device.lock:
+        sent = time.perf_counter()
+        device.events.append([[0x90, 60, 100, 0], 0])
+    thread.join(timeout=1)
+
+    assert len(received) == 1
+    assert received[0] - sent < 0.005 + 0.05  # the bound plus scheduler slack
+
+
+def test_stop_before_reading_yields_nothing():
+    reader = MidiReader(FakeDevice([[[0x90, 60, 100, 0], 0]]))
+    reader.stop()
+    assert list(reader) == []
+
+
+def test_rejects_bad_intervals():
+    with pytest.raises(ValueError):
+        MidiReader(FakeDevice(), min_interval=0.01, max_interval=0.001)
+    with pytest.raises(ValueError):
+        MidiReader(FakeDevice(), min_interval=0)
@@ -3,8 +3,24 @@ import sys
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
-from src.oscillator import SineOscillator
+from src.oscillator import (
+    SineOscillator,
+    SquareOscillator,
+    TriangleOscillator,
+    SawtoothOscillator,
+    PolyBLEPSawtoothOscillator,
+    PolyBLEPSquareOscillator,
+    WavetableOscillator,
+    OscillatorBank,
+    UnisonOscillator,
+    WAVETABLE_SIZE,
+)
+from src.notefreq import NOTE_FREQS
 import numpy as np
+import pytest
+
+# generate_wave truncates to int16, so the float stream may differ by one step
+LSB_TOLERANCE = 1 + 1e-6
 
 
 def test_sine_oscillator():
@@ -23,3 +39,345 @@ def test_sine_oscillator():
     expected_length = sample_rate * duration - remainder
     
     assert len(wave) == expected_length
+
+
+# Per-sample reference implementations of the original generate_wave loops,
+# used to check that the vectorized versions produce identical output.
+def reference_square_wave(oscillator):
+    samples = np.sin(oscillator._step_size * oscillator._time)
+    for x in oscillator._time:
+        if samples[x] >= 0:
+            samples[x] = oscillator._amplitude
+        else:
+            samples[x] = -oscillator._amplitude
+    return oscillator.crop_samples(samples).astype(np.int16)
+
+
+def reference_triangle_wave(oscillator):
+    samples = np.empty(
+        int(oscillator._sample_rate * oscillator._duration), dtype=float
+    )
+    half_period = (1 / oscillator._frequency) / 2
+    double_amplitude = oscillator._amplitude * 2
+    for x in oscillator._time:
+        samples[x] = (
+            double_amplitude
+            / half_period
+            * (
+                half_period
+                - np.abs(
+                    np.mod(
+                        x / oscillator._sample_rate + half_period / 2,
+                        (2 * half_period),
+                    )
+                    - half_period
+                )
+            )
+            - oscillator._amplitude
+        )
+    return oscillator.crop_samples(samples).astype(np.int16)
+
+
+def reference_sawtooth_wave(oscillator):
+    samples = np.arange(oscillator._sample_rate * oscillator._duration)
+    for x in oscillator._time:
+        samples[x] = (
+            2
+            * np.fmod(
+                (
+                    (x * oscillator._frequency * oscillator._amplitude)
+                    / oscillator._sample_rate
+                )
+                + oscillator._amplitude / 2,
+                oscillator._amplitude,
+            )
+            - oscillator._amplitude
+        )
+    return oscillator.crop_samples(samples).astype(np.int16)
+
+
+@pytest.mark.parametrize(
+    "oscillator_class, reference",
+    [
+        (SquareOscillator, reference_square_wave),
+        (TriangleOscillator, reference_triangle_wave),
+        (SawtoothOscillator, reference_sawtooth_wave),
+    ],
+)
+@pytest.mark.parametrize("note", ["C0", "A2", "F#4", "A4", "C#6", "B7"])
+def test_vectorized_wave_matches_reference(oscillator_class, reference, note):
+    oscillator = oscillator_class(NOTE_FREQS[note], 48000, 8192, 0.2)
+    wave = oscillator.generate_wave()
+    expected = reference(oscillator)
+
+    assert wave.dtype == np.int16
+    assert np.array_equal(wave, expected)
+
+
+def near_phases(length, frequency, phases, width, sample_rate=48000):
+    """which samples lie within width cycles of any of phases, e.g. a wave's edges"""
+    cycle = np.arange(length) * frequency / sample_rate % 1.0
+    near = np.zeros(length, dtype=bool)
+    for phase in phases:
+        near |= np.abs((cycle - phase + 0.5) % 1.0 - 0.5) < width
+    return near
+
+
+@pytest.mark.parametrize(
+    "oscillator_class, edges",
+    [
+        (SineOscillator, []),
+        (SquareOscillator, [0.0, 0.5]),
+        (TriangleOscillator, []),
+        (SawtoothOscillator, []),
+    ],
+)
+def test_generate_block_matches_generate_wave(oscillator_class, edges):
+    oscillator = oscillator_class(440.0, 48000, 8192, 0.2)
+    wave = oscillator.generate_wave()
+    block = oscillator.generate_block(len(wave))
+
+    # a sample landing exactly on a square edge may round to either side
+    edge = near_phases(len(wave), 440.0, edges, 1e-9)
+    assert np.allclose(block[~edge], wave[~edge], rtol=0, atol=LSB_TOLERANCE)
+    assert np.allclose(np.abs(block[edge]), 8192)
+
+
+@pytest.mark.parametrize(
+    "oscillator_class",
+    [SineOscillator, SquareOscillator, TriangleOscillator, SawtoothOscillator],
+)
+def test_generate_block_is_phase_continuous(oscillator_class):
+    # 441.7 Hz does not divide 48 kHz, so blocks never line up with a cycle
+    whole = oscillator_class(441.7, 48000, 8192).generate_block(4800)
+
+    oscillator = oscillator_class(441.7, 48000, 8192)
+    blocks = [oscillator.generate_block(n) for n in [1, 63, 256, 480, 1000, 3000]]
+
+    assert np.allclose(np.concatenate(blocks), whole, atol=1e-6)
+
+
+def test_generate_block_writes_into_out_buffer():
+    oscillator = SineOscillator(440.0, 48000, 8192)
+    buffer = np.zeros(512, dtype=np.float32)
+
+    first = oscillator.generate_block(256, out=buffer)
+    ramp = oscillator._ramp
+    second = oscillator.generate_block(256, out=buffer)
+
+    assert np.shares_memory(first, buffer)
+    assert np.shares_memory(second, buffer)
+    assert second.dtype == np.float32
+    assert oscillator._ramp is ramp  # no new ramp for a block of the same size
+
+
+def test_reset_phase_restarts_stream():
+    oscillator = SawtoothOscillator(440.0, 48000, 8192)
+    first = oscillator.generate_block(100).copy()
+    oscillator.reset_phase()
+
+    assert np.array_equal(oscillator.generate_block(100), first)
+
+
+@pytest.mark.parametrize(
+    "oscillator_class, edges",
+    [(SineOscillator, []), (TriangleOscillator, []), (SawtoothOscillator, [0.5])],
+)
+def test_wavetable_matches_oscillator(oscillator_class, edges):
+    table = WavetableOscillator.create_table(oscillator_class)
+    for note in ["C0", "A4", "B7"]:
+        frequency = NOTE_FREQS[note]
+        expected = oscillator_class(frequency, 48000, 8192, 0.2).generate_wave()
+        wave = WavetableOscillator(table, frequency, 48000, 8192, 0.2).generate_wave()
+
+        assert wave.dtype == np.int16
+        assert len(wave) == len(expected)
+        # the interpolation error is below one step, except within one table
+        # entry of the sawtooth reset, which interpolation smooths over
+        edge = near_phases(len(wave), frequency, edges, 1 / WAVETABLE_SIZE)
+        assert np.allclose(wave[~edge], expected[~edge], rtol=0, atol=LSB_TOLERANCE)
+        assert np.all(np.abs(wave[edge]) <= 8192)
+
+
+def test_wavetable_interpolates_between_entries():
+    oscillator = WavetableOscillator(np.array([0.0, 1.0, 0.0, -1.0]), amplitude=1.0)
+    phase = np.array([0.0, 0.125, 0.25, 0.375, 0.875])
+    oscillator.waveshape(phase)
+
+    assert np.allclose(phase, [0.0, 0.5, 1.0, 0.5, -0.5])
+
+
+def test_wavetable_load_custom_table(tmp_path):
+    path = tmp_path / "cycle.npy"
+    np.save(path, np.array([0, 4, 0, -2], dtype=np.int16))
+    table = WavetableOscillator.load_table(path)
+
+    assert np.allclose(table, [0.0, 1.0, 0.0, -0.5])
+    block = WavetableOscillator(table, 12000.0, 48000, 1.0).generate_block(8)
+    assert np.allclose(block, [0.0, 1.0, 0.0, -0.5] * 2)
+
+
+def test_wavetable_rejects_bad_table():
+    with pytest.raises(ValueError):
+        WavetableOscillator(np.zeros((2, 2)))
+
+
+def aliased_energy(oscillator, frequency):
+    """fraction of spectral energy that is not near a harmonic of frequency"""
+    block = oscillator.generate_block(48000)
+    spectrum = np.abs(np.fft.rfft(block * np.hanning(block.size))) ** 2
+    harmonic = np.zeros(spectrum.size, dtype=bool)
+    for k in range(1, int(24000 / frequency) + 1):
+        centre = int(round(k * frequency))
+        harmonic[max(centre - 3, 0) : centre + 4] = True
+    return spectrum[~harmonic].sum() / spectrum.sum()
+
+
+@pytest.mark.parametrize(
+    "naive_class, blep_class",
+    [
+        (SawtoothOscillator, PolyBLEPSawtoothOscillator),
+        (SquareOscillator, PolyBLEPSquareOscillator),
+    ],
+)
+def test_poly_blep_reduces_aliasing(naive_class, blep_class):
+    frequency = NOTE_FREQS["B7"]
+    naive = aliased_energy(naive_class(frequency, 48000, 1.0), frequency)
+    band_limited = aliased_energy(blep_class(frequency, 48000, 1.0), frequency)
+
+    assert band_limited < naive / 10
+
+
+@pytest.mark.parametrize(
+    "naive_class, blep_class",
+    [
+        (SawtoothOscillator, PolyBLEPSawtoothOscillator),
+        (SquareOscillator, PolyBLEPSquareOscillator),
+    ],
+)
+def test_poly_blep_only_corrects_near_edges(naive_class, blep_class):
+    naive = naive_class(440.0, 48000, 8192, 0.2)
+    band_limited = blep_class(440.0, 48000, 8192, 0.2)
+    naive_wave = naive.generate_block(9600)
+    blep_wave = band_limited.generate_block(9600)
+    corrected = np.count_nonzero(~np.isclose(naive_wave, blep_wave))
+
+    # two samples around each discontinuity, one or two discontinuities per cycle
+    edges = 2 if naive_class is SquareOscillator else 1
+    assert corrected <= 2 * edges * (round(0.2 * 440) + 1)
+    assert len(band_limited.generate_wave()) == len(naive.generate_wave())
+
+
+@pytest.mark.parametrize(
+    "oscillator_class",
+    [SineOscillator, SquareOscillator, TriangleOscillator, PolyBLEPSawtoothOscillator],
+)
+def test_oscillator_bank_matches_single_oscillators(oscillator_class):
+    frequencies = list(NOTE_FREQS.values())
+    bank = OscillatorBank(oscillator_class, frequencies, 48000, 8192, 0.2)
+    waves = bank.generate_waves()
+
+    assert waves.shape == (len(frequencies), 9600)
+    assert waves.dtype == np.int16
+    for frequency, wave, length in zip(frequencies, waves, bank.crop_lengths):
+        oscillator = oscillator_class(frequency, 48000, 8192, 0.2)
+        expected = oscillator.generate_block(9600)
+        assert length == len(oscillator.generate_wave())
+        assert np.abs(wave - expected).max() <= 1
+
+
+def test_oscillator_bank_with_wavetable():
+    table = WavetableOscillator.create_table(SawtoothOscillator)
+    bank = OscillatorBank(WavetableOscillator, [110.0, 220.0], 48000, 8192, 0.2, table=table)
+    cropped = bank.cropped_waves()
+
+    for frequency, wave in zip([110.0, 220.0], cropped):
+        expected = WavetableOscillator(table, frequency, 48000, 8192, 0.2).generate_wave()
+        assert np.array_equal(wave, expected)
+
+
+def test_oscillator_bank_chord():
+    frequencies = [NOTE_FREQS["C4"], NOTE_FREQS["E4"], NOTE_FREQS["G4"]]
+    chord = OscillatorBank(SineOscillator, frequencies, 48000, 8192, 0.2).generate_chord()
+    expected = sum(
+        SineOscillator(frequency, 48000, 8192).generate_block(9600)
+        for frequency in frequencies
+    )
+
+    assert chord.dtype == np.int16
+    assert np.abs(chord - expected).max() <= 1
+
+    loud = OscillatorBank(SquareOscillator, frequencies, 48000, 30000, 0.2)
+    assert np.abs(loud.generate_chord().astype(int)).max() <= np.iinfo(np.int16).max
+
+
+def test_generate_wave_float32():
+    wave = TriangleOscillator(440.0, 48000, 0.25, 0.2).generate_wave(np.float32)
+    reference = TriangleOscillator(440.0, 48000, 8192, 0.2).generate_wave()
+
+    assert wave.dtype == np.float32
+    assert np.abs(wave).max() <= 0.25
+    assert np.allclose(wave * 32768, reference, atol=1)
+
+
+def test_unison_single_voice_matches_oscillator():
+    unison = UnisonOscillator(
+        SawtoothOscillator, 1, 0.0, 440.0, 48000, 8192, 0.2, random_phase=False
+    )
+    expected = SawtoothOscillator(440.0, 48000, 8192, 0.2)
+
+    assert np.allclose(unison.generate_block(1000), expected.generate_block(1000))
+    assert len(unison.generate_wave()) == len(expected.generate_wave())
+
+
+def test_unison_sums_detuned_voices():
+    unison = UnisonOscillator(SineOscillator, 3, 20.0, 440.0, 48000, 1.0, seed=1)
+    block = unison.generate_block(2000)
+
+    expected = np.zeros(2000)
+    for cents, phase in zip([-10.0, 0.0, 10.0], unison._start_phase[:, 0]):
+        voice = SineOscillator(440.0 * 2 ** (cents / 1200), 48000, 1.0)
+        voice.reset_phase(phase)
+        expected += voice.generate_block(2000)
+
+    assert np.allclose(block, expected / np.sqrt(3))
+
+
+def test_unison_in_phase_voices_do_not_wrap_int16():
+    unison = UnisonOscillator(
+        SawtoothOscillator, voices=25, spread=10, random_phase=False
+    )
+    wave = unison.generate_wave()
+    mixed = unison.generate_block(len(wave))  # the float mix, past the int16 range
+
+    assert np.abs(mixed).max() > 32767
+    loud = np.abs(mixed) > 32767
+    assert np.all(np.abs(wave[loud]) == 32767)
+    assert np.all(np.sign(wave[loud]) == np.sign(mixed[loud]))
+
+
+def test_unison_is_phase_continuous_and_resets():
+    unison = UnisonOscillator(PolyBLEPSawtoothOscillator, 5, 30.0, 441.7, seed=3)
+    whole = unison.generate_block(3000).copy()
+    unison.reset_phase()
+    blocks = [unison.generate_block(n).copy() for n in [100, 900, 2000]]
+
+    assert np.allclose(np.concatenate(blocks), whole)
+
+
+def test_unison_wraps_wavetable():
+    table = WavetableOscillator.create_table(SawtoothOscillator)
+    unison = UnisonOscillator(
+        WavetableOscillator, 4, 15.0, 220.0, amplitude=0.25, seed=2, table=table
+    )
+    out = np.empty(256, dtype=np.float32)
+    block = unison.generate_block(256, out=out)
+
+    expected = np.zeros(256)
+    for cents, phase in zip(np.linspace(-7.5, 7.5, 4), unison._start_phase[:, 0]):
+        voice = WavetableOscillator(table, 220.0 * 2 ** (cents / 1200), 48000, 1.0)
+        voice.reset_phase(phase)
+        expected += voice.generate_block(256)
+
+    assert np.shares_memory(block, out)
+    assert np.allclose(out, expected * 0.25 / np.sqrt(4), atol=1e-6)
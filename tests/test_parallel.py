@@ -0,0 +1,65 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from parallel import render_parallel, render_batch
+from render import Note, render
+from adsr import ADSREnvelope
+from volume import Volume
+import numpy as np
+import pytest
+
+SAMPLE_RATE = 8000
+NOTES = [Note(name, i * 0.07, 0.2) for i, name in enumerate(["C4", "E4", "G4"] * 4)]
+
+
+def test_segments_join_into_the_serial_render():
+    serial = render(NOTES, "sawtooth", SAMPLE_RATE, voices=4)
+    parallel = render_parallel(
+        NOTES, workers=2, segments=5, waveform="sawtooth", sample_rate=SAMPLE_RATE, voices=4
+    )
+
+    assert parallel.dtype == np.float32
+    assert np.array_equal(parallel, serial)
+
+
+def test_segments_join_with_pending_glides():
+    def settings():
+        """a volume and sustain change gliding through the whole render"""
+        envelope = ADSREnvelope(2, 7, 8, 3, SAMPLE_RATE, ramp_samples=20000)
+        envelope.update_sustain(3)
+        volume = Volume(ramp_samples=20000)
+        volume.config(4)
+        return {"envelope": envelope, "volume": volume}
+
+    serial = render(NOTES, "sawtooth", SAMPLE_RATE, voices=4, **settings())
+    parallel = render_parallel(
+        NOTES,
+        workers=2,
+        segments=5,
+        waveform="sawtooth",
+        sample_rate=SAMPLE_RATE,
+        voices=4,
+        **settings(),
+    )
+
+    assert len(serial) / 5 < 20000  # the second segment starts part way into them
+    assert np.array_equal(parallel, serial)
+
+
+def test_batch_renders_each_job():
+    jobs = [
+        {"notes": NOTES, "waveform": "square", "sample_rate": SAMPLE_RATE},
+        {"notes": NOTES[:2], "waveform": "sine", "sample_rate": SAMPLE_RATE},
+    ]
+    results = render_batch(jobs, workers=2)
+
+    assert len(results) == 2
+    for job, result in zip(jobs, results):
+        assert np.array_equal(result, render(**job))
+
+
+def test_worker_errors_are_raised():
+    with pytest.raises(ValueError):
+        render_batch([{"notes": NOTES, "waveform": "noise"}], workers=1)
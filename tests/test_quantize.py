@@ -0,0 +1,57 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.quantize import to_int16
+import numpy as np
+
+
+def test_to_int16_scales_and_rounds():
+    samples = np.array([0.0, 0.5, -0.5, 1.0, -1.0, 0.6 / 32767], dtype=np.float32)
+    pcm = to_int16(samples)
+
+    assert pcm.dtype == np.int16
+    assert list(pcm) == [0, 16384, -16384, 32767, -32767, 1]
+
+
+def test_to_int16_clips_instead_of_wrapping():
+    samples = np.array([1.5, -3.0, 100.0], dtype=np.float32)
+
+    assert list(to_int16(samples)) == [32767, -32767, 32767]
+
+
+def test_to_int16_writes_into_out_buffer():
+    samples = np.linspace(-1, 1, 64, dtype=np.float32)
+    out = np.zeros(64, dtype=np.int16)
+    pcm = to_int16(samples, out=out)
+
+    assert pcm is out
+    assert np.array_equal(out, to_int16(samples))
+    assert samples[0] == -1  # input is left unchanged
+
+
+def test_to_int16_dither_stays_within_one_step():
+    samples = np.full(10000, 0.25, dtype=np.float32)
+    pcm = to_int16(samples, dither=True).astype(int)
+
+    assert np.abs(pcm - round(0.25 * 32767)).max() <= 1
+    assert abs(pcm.mean() - 0.25 * 32767) < 0.1
+
+
+def test_to_int16_with_scratch_buffers_allocates_nothing():
+    import tracemalloc
+
+    samples = np.linspace(-1, 1, 4096, dtype=np.float32)
+    out = np.zeros(4096, dtype=np.int16)
+    scratch = np.empty(8192, dtype=np.float32)  # longer buffers are fine
+    noise = np.empty(8192, dtype=np.float32)
+    assert np.array_equal(to_int16(samples, out=out, scratch=scratch), to_int16(samples))
+
+    to_int16(samples, True, out, scratch, noise)
+    tracemalloc.start()
+    to_int16(samples, True, out, scratch, noise)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert peak < samples.nbytes // 4
+    assert np.abs(out.astype(int) - to_int16(samples)).max() <= 1
@@ -0,0 +1,151 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from render import (
+    Note,
+    render,
+    render_length,
+    read_midi,
+    read_notes,
+    write_wav,
+    note_name,
+    note_events,
+    main,
+)
+from adsr import ADSREnvelope
+import json
+import wave
+import numpy as np
+import pytest
+
+SAMPLE_RATE = 8000
+
+
+def midi_file(path, tracks, division=480):
+    """writes a MIDI file from raw track bytes"""
+    data = b"MThd" + (6).to_bytes(4, "big")
+    data += (1).to_bytes(2, "big") + len(tracks).to_bytes(2, "big")
+    data += division.to_bytes(2, "big")
+    for track in tracks:
+        data += b"MTrk" + len(track).to_bytes(4, "big") + track
+    path.write_bytes(data)
+    return str(path)
+
+
+def test_note_names():
+    assert note_name(60) == "C4"
+    assert note_name(69) == "A4"
+    assert note_name(13) == "C#0"
+
+
+def test_render_places_notes_on_their_samples():
+    envelope = ADSREnvelope(1, 1, 10, 1, sample_rate=SAMPLE_RATE)  # 400 samples
+    notes = [Note("A4", 0.5, 0.25), Note("E5", 0.6, 0.1)]
+    samples = render(notes, sample_rate=SAMPLE_RATE, blocksize=512, envelope=envelope)
+
+    assert samples.dtype == np.float32
+    assert np.all(samples[:4000] == 0)
+    assert samples[4001] != 0
+    # the A4 release starts at 0.75 s and ends 400 samples later
+    assert len(samples) == render_length(notes, SAMPLE_RATE, envelope) == 6400
+    assert samples[-1] == 0
+    assert np.any(samples[-210:-190] != 0)  # -200 itself is a zero crossing
+
+
+def test_render_is_deterministic_and_block_size_independent():
+    notes = [Note("C4", 0.0, 0.3), Note("G4", 0.1, 0.3), Note("C4", 0.35, 0.1)]
+    first = render(notes, "sawtooth", SAMPLE_RATE, blocksize=4096)
+    second = render(notes, "sawtooth", SAMPLE_RATE, blocksize=4096)
+    small = render(notes, "sawtooth", SAMPLE_RATE, blocksize=64)
+
+    assert np.array_equal(first, second)
+    assert np.array_equal(first, small)
+    with pytest.raises(ValueError):
+        render(notes, "noise")
+
+
+@pytest.mark.parametrize("first, last", [(0, 100), (1234, 3000), (2500, None)])
+def test_render_part_matches_whole(first, last):
+    notes = [Note("C4", 0.0, 0.3), Note("G4", 0.1, 0.2), Note("E4", 0.15, 0.05)]
+    whole = render(notes, "triangle", SAMPLE_RATE, blocksize=256, voices=2)
+    part = render(
+        notes, "triangle", SAMPLE_RATE, blocksize=256, voices=2, first=first, last=last
+    )
+
+    assert np.array_equal(part, whole[first:last])
+
+
+def test_write_wav(tmp_path):
+    path = str(tmp_path / "out.wav")
+    write_wav(path, np.array([0.0, 0.5, -1.0], dtype=np.float32), SAMPLE_RATE)
+
+    with wave.open(path) as file:
+        assert file.getframerate() == SAMPLE_RATE
+        assert file.getsampwidth() == 2
+        frames = np.frombuffer(file.readframes(3), dtype="<i2")
+    assert list(frames) == [0, 16384, -32767]
+
+
+def test_read_midi_with_running_status_and_tempo(tmp_path):
+    tempo_track = bytes.fromhex("00 FF 51 03 0F 42 40 00 FF 2F 00")  # 1 s per quarter
+    notes_track = bytes.fromhex(
+        "00 90 3C 64"  # C4 on
+        "00 40 64"  # E4 on, running status
+        "83 60 3C 00"  # 480 ticks later: C4 off (velocity 0)
+        "00 80 40 40"  # E4 off
+        "00 C0 05"  # program change
+        "00 F0 02 7E F7"  # sysex
+        "81 70 90 45 64"  # 240 ticks later: A4 on, never released
+        "83 60 FF 2F 00"
+    )
+    notes = read_midi(midi_file(tmp_path / "song.mid", [tempo_track, notes_track]))
+
+    assert notes == [
+        Note("C4", 0.0, 1.0),
+        Note("E4", 0.0, 1.0),
+        Note("A4", 1.5, 1.0),
+    ]
+
+
+def test_read_midi_note_on_and_off_on_the_same_tick(tmp_path):
+    notes_track = bytes.fromhex(
+        "00 90 24 64"  # C2 on
+        "00 80 24 40"  # C2 off on the same tick, like a drum trigger
+        "83 60 90 26 64"  # 480 ticks later: D2 on
+        "83 60 80 26 40"  # D2 off
+        "00 90 26 64"  # D2 on again on the tick it was released
+        "83 60 80 26 40"  # D2 off
+        "00 FF 2F 00"
+    )
+    notes = read_midi(midi_file(tmp_path / "drums.mid", [notes_track]))
+
+    assert notes == [
+        Note("C2", 0.0, 0.0),
+        Note("D2", 0.5, 0.5),
+        Note("D2", 1.0, 0.5),
+    ]
+
+
+def test_zero_length_note_is_released_after_it_is_pressed():
+    assert note_events([Note("A4", 0.1, 0.0)], 1000) == [
+        (100, 1, "A4"),
+        (101, 0, "A4"),
+    ]
+    envelope = ADSREnvelope(1, 1, 10, 1, sample_rate=SAMPLE_RATE)
+    short = render([Note("A4", 0.1, 0.0)], sample_rate=SAMPLE_RATE, envelope=envelope)
+    assert len(short) == 801 + 400  # held for one frame, then released
+    assert short[-1] == 0
+
+
+def test_cli_renders_json_notes(tmp_path, capsys):
+    notes = tmp_path / "notes.json"
+    notes.write_text(json.dumps([{"note": "A4", "start": 0.0, "duration": 0.1}]))
+    output = tmp_path / "notes.wav"
+
+    assert main([str(notes), "-o", str(output), "--sample-rate", "8000"]) == 0
+    assert read_notes(str(notes)) == [Note("A4", 0.0, 0.1)]
+    assert "x realtime" in capsys.readouterr().out
+    with wave.open(str(output)) as file:
+        assert file.getnframes() > 800
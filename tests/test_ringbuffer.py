@@ -0,0 +1,96 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.ringbuffer import RingBuffer
+import threading
+import numpy as np
+import pytest
+
+
+def test_write_then_read_across_the_wrap():
+    ring = RingBuffer(8)
+    out = np.empty(5, dtype=np.float32)
+    for start in range(0, 40, 5):
+        assert ring.write(np.arange(start, start + 5, dtype=np.float32)) == 5
+        assert ring.read(out) == 5
+        assert np.array_equal(out, np.arange(start, start + 5))
+    assert ring.occupancy == 0
+    assert ring.underruns == ring.overruns == 0
+
+
+def test_underrun_pads_with_silence():
+    ring = RingBuffer(8)
+    ring.write(np.ones(3, dtype=np.float32))
+    out = np.full(5, 7.0, dtype=np.float32)
+
+    assert ring.read(out) == 3
+    assert np.array_equal(out, [1, 1, 1, 0, 0])
+    assert ring.underruns == 1
+
+
+def test_overrun_writes_what_fits():
+    ring = RingBuffer(8)
+
+    assert ring.write(np.ones(6, dtype=np.float32)) == 6
+    assert ring.write(np.ones(6, dtype=np.float32)) == 2
+    assert ring.overruns == 1
+    assert ring.free == 0
+    assert ring.peak_occupancy == 8
+    with pytest.raises(ValueError):
+        RingBuffer(0)
+
+
+def test_views_are_zero_copy():
+    ring = RingBuffer(8)
+    first, second = ring.writable_views(5)
+    assert np.shares_memory(first, ring._buffer)
+    assert len(first) == 5 and len(second) == 0
+    first[:] = np.arange(5)
+    ring.advance_write(5)
+
+    first, second = ring.readable_views(5)
+    assert np.array_equal(first, np.arange(5))
+    ring.advance_read(5)
+
+    first, second = ring.writable_views(6)  # wraps: 3 at the end, 3 at the start
+    assert (len(first), len(second)) == (3, 3)
+    assert np.shares_memory(second, ring._buffer[:3])
+
+
+def test_concurrent_producer_and_consumer():
+    ring = RingBuffer(1000, dtype=np.int64)
+    total = 100_000
+    received = np.empty(total, dtype=np.int64)
+
+    def produce():
+        rng = np.random.default_rng(1)
+        sent = 0
+        while sent < total:
+            size = min(int(rng.integers(1, 700)), total - sent)
+            block = np.arange(sent, sent + size)
+            written = 0
+            while written < size:
+                written += ring.write(block[written:])
+            sent += size
+
+    def consume():
+        rng = np.random.default_rng(2)
+        count = 0
+        out = np.empty(700, dtype=np.int64)
+        while count < total:
+            size = int(rng.integers(1, 700))
+            got = ring.read(out[:size])
+            received[count : count + got] = out[:got]
+            count += got
+
+    threads = [threading.Thread(target=produce), threading.Thread(target=consume)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=60)
+
+    assert np.array_equal(received, np.arange(total))
+    assert ring.occupancy == 0
+    assert ring.peak_occupancy <= ring.capacity
@@ -0,0 +1,86 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.smoothing import SmoothedValue
+import numpy as np
+import tracemalloc
+
+
+def test_steady_value_is_a_scalar():
+    value = SmoothedValue(0.5, ramp_samples=100)
+
+    assert value.next_block(64) == 0.5
+
+
+def test_ramps_to_new_target_across_blocks():
+    value = SmoothedValue(0.0, ramp_samples=100)
+    value.set_target(1.0)
+    first = value.next_block(64).copy()
+    second = value.next_block(64).copy()
+
+    ramp = np.concatenate((first, second))
+    assert np.allclose(ramp[:100], np.arange(1, 101) / 100)
+    assert np.all(ramp[100:] == 1.0)
+    assert value.next_block(64) == 1.0
+    assert value.current == value.target == 1.0
+
+
+def test_retarget_during_ramp_starts_from_current_value():
+    value = SmoothedValue(0.0, ramp_samples=10)
+    value.set_target(1.0)
+    value.next_block(5)
+    value.set_target(0.0)
+    block = value.next_block(20)
+
+    assert block[0] < 0.5
+    assert np.all(np.diff(block[:10]) < 0)
+    assert block[-1] == 0.0
+
+
+def test_zero_ramp_jumps():
+    value = SmoothedValue(0.0, ramp_samples=0)
+    value.set_target(0.7)
+
+    assert value.next_block(16) == 0.7
+
+
+def test_next_value_follows_next_block():
+    by_block = SmoothedValue(0.0, ramp_samples=100)
+    by_sample = SmoothedValue(0.0, ramp_samples=100)
+    by_block.set_target(1.0)
+    by_sample.set_target(1.0)
+
+    blocks = [np.broadcast_to(by_block.next_block(48), 48).copy() for _ in range(3)]
+    ramp = np.concatenate(blocks)
+    values = [by_sample.next_value() for _ in range(144)]
+    assert np.allclose(values, ramp)
+    assert values[-1] == 1.0 and by_sample.current == 1.0
+
+
+def test_skip_lands_where_next_block_would():
+    rendered = SmoothedValue(0.0, ramp_samples=100)
+    skipped = SmoothedValue(0.0, ramp_samples=100)
+    rendered.set_target(1.0)
+    skipped.set_target(1.0)
+
+    for frames in (7, 30, 11):
+        rendered.next_block(frames)
+    skipped.skip(48)
+    assert np.array_equal(rendered.next_block(20), skipped.next_block(20))
+
+
+def test_ramp_reuses_its_buffer():
+    value = SmoothedValue(0.0, ramp_samples=1000)
+    value.set_target(1.0)
+    value.next_block(256)  # sizes the buffer
+
+    tracemalloc.start()
+    for _ in range(3):
+        block = value.next_block(256)
+    allocated = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    assert allocated < 256 * 8
+    assert block[-1] == value.current
@@ -0,0 +1,175 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../src")))
+
+from voices import VoicePool
+from adsr import ADSRParams, State
+from oscillator import WavetableOscillator, SineOscillator
+import numpy as np
+import pytest
+
+PARAMS = ADSRParams(1, 1, 10, 1, sample_rate=1000)  # 50 samples per segment
+
+
+def wave(value, length=10):
+    return np.full(length, value, dtype=np.float32)
+
+
+def test_unknown_policy_is_rejected():
+    with pytest.raises(ValueError):
+        VoicePool(4, steal="newest")
+
+
+def test_free_voices_are_used_first():
+    pool = VoicePool(3, sample_rate=1000)
+
+    voices = [pool.note_on(note, wave(0.1), 100.0) for note in ["C4", "D4", "E4"]]
+    assert voices == [0, 1, 2]
+    assert pool.active_count == 3
+
+
+def test_same_note_retriggers_its_voice():
+    pool = VoicePool(3, sample_rate=1000)
+    pool.note_on("C4", wave(0.1), 100.0)
+    pool.note_on("D4", wave(0.1), 100.0)
+    pool.render(PARAMS, 30)
+
+    assert pool.note_on("C4", wave(0.1), 100.0) == 0
+    assert pool.envelopes.position[0] == 0
+    assert pool.active_count == 2
+
+
+def test_steals_oldest_voice():
+    pool = VoicePool(2, steal="oldest", sample_rate=1000)
+    pool.note_on("C4", wave(0.1), 100.0)
+    pool.note_on("D4", wave(0.1), 100.0)
+    pool.note_on("C4", wave(0.1), 100.0)  # retrigger does not make it the oldest
+
+    assert pool.note_on("E4", wave(0.1), 100.0) == 1
+    assert pool.notes == ["C4", "E4"]
+
+
+def test_steals_quietest_voice():
+    pool = VoicePool(2, steal="quietest", sample_rate=1000)
+    pool.note_on("C4", wave(0.1), 100.0)
+    pool.render(PARAMS, 40)
+    pool.note_on("D4", wave(0.1), 100.0)
+    pool.render(PARAMS, 5)  # D4 is early in its attack, C4 near the top
+
+    assert pool.note_on("E4", wave(0.1), 100.0) == 1
+
+
+def test_mix_is_sum_of_voices_with_their_envelopes():
+    pool = VoicePool(4, sample_rate=1000)
+    first = np.linspace(-1, 1, 37)
+    second = np.sin(np.arange(23))
+    pool.note_on("C4", first, 31.0, 0.5)
+    pool.render(PARAMS, 20)
+    pool.note_on("G4", second, 57.0)
+    mix = np.concatenate([pool.render(PARAMS, 64).copy() for _ in range(3)])
+
+    gate = PARAMS.gate_table
+    first_gain = gate[np.minimum(np.arange(20, 212), gate.size - 1)]
+    second_gain = gate[np.minimum(np.arange(192), gate.size - 1)]
+    first_wave = WavetableOscillator(first, 31.0, 1000, 0.5).generate_block(212)
+    second_wave = WavetableOscillator(second, 57.0, 1000, 1.0).generate_block(192)
+    expected = first_wave[20:] * first_gain + second_wave * second_gain
+    assert np.allclose(mix, expected, atol=1e-6)
+
+
+def test_held_note_is_one_continuous_wave():
+    # 3 seconds of a held sine: no loop point where the wave jumps
+    pool = VoicePool(1, sample_rate=1000)
+    table = WavetableOscillator.create_table(SineOscillator)
+    pool.note_on("A4", table, 7.3)
+    sustain = ADSRParams(0, 0, 20, 1, sample_rate=1000)  # full level
+    held = np.concatenate([pool.render(sustain, 100).copy() for _ in range(30)])
+
+    expected = WavetableOscillator(table, 7.3, 1000, 1.0).generate_block(3000)
+    assert np.allclose(held, expected, atol=1e-6)
+    assert np.abs(np.diff(held)).max() <= 2 * np.pi * 7.3 / 1000 + 1e-6
+
+
+def test_idle_voices_between_active_ones_are_skipped():
+    pool = VoicePool(3, sample_rate=1000)
+    sustain = ADSRParams(0, 0, 20, 1, sample_rate=1000)  # full level, 50 to release
+    tables = [np.linspace(-1, 1, 16), np.ones(8), np.sin(np.arange(11))]
+    for note, table, frequency in zip(["C4", "D4", "E4"], tables, [13, 17, 19]):
+        pool.note_on(note, table, frequency)
+    pool.note_off("D4")
+    pool.render(sustain, 100)
+    assert pool.envelopes.active().tolist() == [True, False, True]
+
+    block = pool.render(sustain, 64)
+    expected = sum(
+        WavetableOscillator(table, frequency, 1000, 1.0).generate_block(164)[100:]
+        for table, frequency in [(tables[0], 13), (tables[2], 19)]
+    )
+    assert np.allclose(block, expected, atol=1e-6)
+
+
+def test_note_on_reuses_the_voice_rows():
+    pool = VoicePool(2, sample_rate=1000, table_size=64)
+    tables = pool._tables
+    pool.note_on("C4", np.ones(64), 100.0)
+    pool.note_on("D4", np.ones(3), 100.0)
+    assert pool._tables is tables
+
+    with pytest.raises(ValueError):
+        pool.note_on("E4", np.ones(65), 100.0)
+
+
+def test_voice_count_stays_bounded():
+    pool = VoicePool(4, sample_rate=1000)
+    for i in range(100):
+        pool.note_on(str(i), wave(0.1, length=10 + i), 100.0)
+        pool.render(PARAMS, 16)
+
+    assert pool.active_count == 4
+    assert pool.notes == ["96", "97", "98", "99"]
+
+
+def test_note_off_releases_only_that_note():
+    pool = VoicePool(4, sample_rate=1000)
+    pool.note_on("C4", wave(0.1), 100.0)
+    pool.note_on("E4", wave(0.1), 100.0)
+    pool.note_off("C4")
+    pool.render(PARAMS, 60)
+
+    assert pool.active_count == 1
+    assert pool.notes[1] == "E4"
+
+
+def test_held_notes_are_indexed_by_name():
+    pool = VoicePool(3, sample_rate=1000)
+    pool.note_on("C4", wave(0.1), 100.0)
+    pool.note_on("E4", wave(0.1), 100.0)
+    assert (pool.voice_of("C4"), pool.voice_of("E4")) == (0, 1)
+
+    pool.note_off("C4")
+    assert pool.voice_of("C4") is None
+    pool.note_on("C4", wave(0.1), 100.0)  # still sounding in its release: same voice
+    assert pool.voice_of("C4") == 0
+
+
+def test_releasing_a_stolen_note_leaves_the_new_note():
+    pool = VoicePool(2, steal="oldest", sample_rate=1000)
+    pool.note_on("C4", wave(0.1), 100.0)
+    pool.note_on("D4", wave(0.1), 100.0)
+    pool.note_on("E4", wave(0.1), 100.0)  # takes over C4's voice
+    assert pool.voice_of("C4") is None
+
+    pool.note_off("C4")
+    pool.render(PARAMS, 60)
+    assert pool.envelopes.state[0] != State.RELEASE.value
+    assert pool.active_count == 2
+
+
+def test_second_note_off_does_not_restart_release():
+    pool = VoicePool(2, sample_rate=1000)
+    pool.note_on("C4", wave(0.1), 100.0)
+    pool.note_off("C4")
+    pool.render(PARAMS, 20)
+    pool.note_off("C4")
+    assert pool.envelopes.position[0] == 20
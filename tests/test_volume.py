@@ -3,6 +3,7 @@ import sys
 
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
+import numpy as np
 import pytest
 from src.volume import Volume
 
@@ -30,3 +31,27 @@ def test_volume_initialization(volume_instance):
     assert volume_instance._volume_level == 9
     assert volume_instance._offset == 9
     assert volume_instance._gain == pytest.approx(1.0)
+
+
+def test_change_gain_keeps_float32():
+    volume_instance = Volume(ramp_samples=0)
+    samples = np.array([0.5, -0.25, 1.0], dtype=np.float32)
+    volume_instance.config(12)
+    louder = volume_instance.change_gain(samples)
+
+    assert louder.dtype == np.float32
+    assert np.allclose(louder, samples * volume_instance._gain)
+
+    volume_instance.change_gain(samples, out=samples)
+    assert np.array_equal(samples, louder)
+
+
+def test_gain_change_is_ramped():
+    volume = Volume(ramp_samples=100)
+    volume.config(3)  # -18 dB
+    out = volume.change_gain(np.ones(64, dtype=np.float32))
+    out = np.concatenate((out, volume.change_gain(np.ones(64, dtype=np.float32))))
+
+    assert np.all(np.diff(out[:100]) < 0)
+    assert abs(out[0] - 1.0) < 0.01
+    assert np.allclose(out[100:], volume._gain)
@@ -0,0 +1,101 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.wavecache import DiskCache, code_version
+import numpy as np
+
+
+def test_disk_cache_builds_once_and_maps(tmp_path):
+    built = []
+
+    def build():
+        built.append(1)
+        return np.arange(16, dtype=np.int16)
+
+    first = DiskCache(tmp_path, "v1").load_or_build("sine", (440.0, 48000), build)
+    # a new instance, like a restarted process, loads the same file
+    cache = DiskCache(tmp_path, "v1")
+    second = cache.load_or_build("sine", (440.0, 48000), build)
+
+    assert built == [1]
+    assert (cache.hits, cache.misses) == (1, 0)
+    assert isinstance(second, np.memmap)
+    assert not second.flags.writeable
+    assert np.array_equal(first, second)
+
+
+def test_disk_cache_key_includes_params_and_version(tmp_path):
+    cache = DiskCache(tmp_path, "v1")
+    build = lambda: np.zeros(4)
+
+    cache.load_or_build("sine", (440.0,), build)
+    cache.load_or_build("sine", (220.0,), build)
+    cache.load_or_build("square", (440.0,), build)
+    assert cache.misses == 3
+    assert len(list(tmp_path.glob("*/*.npy"))) == 3
+    assert not list(tmp_path.glob("*/*.tmp"))
+
+    new_version = DiskCache(tmp_path, "v2")
+    new_version.load_or_build("sine", (440.0,), build)
+    assert new_version.misses == 1
+
+
+def test_disk_cache_opening_removes_nothing(tmp_path):
+    build = lambda: np.zeros(4)
+    DiskCache(tmp_path, "v1").load_or_build("sine", (440.0,), build)
+    DiskCache(tmp_path, "v2").load_or_build("sine", (440.0,), build)
+    DiskCache(tmp_path, "v1")
+
+    names = sorted(path.parent.name for path in tmp_path.glob("*/*.npy"))
+    assert names == ["version-v1", "version-v2"]
+
+
+def test_disk_cache_prunes_only_the_oldest_versions(tmp_path):
+    build = lambda: np.zeros(4)
+    for age, version in enumerate(["new", "current", "v3", "v2", "v1"]):
+        DiskCache(tmp_path, version).load_or_build("sine", (440.0,), build)
+        os.utime(tmp_path / ("version-" + version), (1000 - age, 1000 - age))
+    (tmp_path / "sine-0123456789abcdef01234567.npy").write_bytes(b"not ours")
+    (tmp_path / "backup").mkdir()
+
+    removed = DiskCache(tmp_path, "current").prune(keep=1)
+
+    assert [path.name for path in removed] == ["version-v2", "version-v1"]
+    names = sorted(path.name for path in tmp_path.iterdir())
+    assert names == [
+        "backup",
+        "sine-0123456789abcdef01234567.npy",
+        "version-current",
+        "version-new",
+        "version-v3",
+    ]
+
+
+def test_disk_cache_removes_temp_file_when_write_fails(tmp_path, monkeypatch):
+    def fail(source, destination):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(os, "replace", fail)
+    cache = DiskCache(tmp_path, "v1")
+    table = cache.load_or_build("sine", (440.0,), lambda: np.ones(4))
+
+    assert np.array_equal(table, np.ones(4))
+    assert not list(tmp_path.glob("*/*.tmp"))
+
+
+def test_disk_cache_rebuilds_corrupt_file(tmp_path):
+    cache = DiskCache(tmp_path, "v1")
+    path = cache.path("sine", (1,))
+    path.parent.mkdir(parents=True)
+    path.write_bytes(b"not a table")
+    table = cache.load_or_build("sine", (1,), lambda: np.ones(3))
+
+    assert cache.misses == 1
+    assert np.array_equal(table, np.ones(3))
+
+
+def test_code_version_changes_with_source():
+    assert code_version(DiskCache) == code_version(code_version)
+    assert code_version(DiskCache) != code_version(np)